@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Amount Parsing
+Shared parser for the amount columns (sanctioned amounts, expenditure,
+progress percentages) of the consolidated works data, used for the SQLite
+store's column types and the shard manifest totals:
+
+  - a value counts as an amount only when the whole text is one, e.g.
+    '₹ 50.05', '1,234', '12,34,567.5' or '45%'
+  - known amount columns also get the cleanup of stray semicolons typed in
+    place of a comma ('1;302.84')
+
+Usage: import only
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Known amount columns in the dashboard, ExcelProcessor and current-year
+# expenditure schemas; only these are parsed from text as amounts, with the
+# loose cleanup of data-entry slips like '1;302.84'
+AMOUNT_COLUMNS = [
+    'sd_amount_lakh', 'expenditure_previous_fy', 'expenditure_current_fy', 'expenditure_total',
+    'expenditure_percent', 'budget_variance', 'monthly_burn_rate',
+    'sanctioned_amount', 'expdr_upto_31mar25', 'expdr_cfy', 'total_expdr', 'percent_expdr',
+    'physical_progress', 'physical_progress_percent',
+    'Allotment Previous Financila year', 'Expdr previous year', 'Liabilities',
+    'Fresh Sanction issued during CFY', 'Effective sanction', 'Allotment CFY', 'Expdr_as_per_elekha',
+    '% Age of expdr as per e-lekha', 'Bill pending with PAD', 'Bill pending with HQrs',
+    'Total Expdr as per contengency register', '% Age of total Expdr', 'Balance fund',
+]
+
+# An amount as typed in the sheets: optional currency symbol and sign, plain or
+# comma-grouped digits (1,234,567 or 12,34,567), optional decimals or percent
+AMOUNT_PATTERN = re.compile(r'^[₹$]?\s*[-+]?(?:\d{1,3}(?:,\d{2,3})+|\d+)?(?:\.\d+)?\s*%?$')
+
+
+def to_amounts(series, loose=False):
+    """
+    Parse amount strings such as '₹ 50.05', '1,234' or '45%' into floats
+    Values that aren't a whole amount (AMOUNT_PATTERN) become NaN; loose=True
+    (known amount columns) first drops stray semicolons, so '1;302.84' is 1302.84
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+    text = series.astype(object).where(series.notna(), '').astype(str).str.strip()
+    if loose:
+        text = text.str.replace(';', '', regex=False)
+    valid = text.str.match(AMOUNT_PATTERN) & text.str.contains(r'\d', regex=True)
+    cleaned = text.where(valid, '').str.replace(r'[₹$,%\s]', '', regex=True)
+    return pd.to_numeric(cleaned.replace('', np.nan), errors='coerce')
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Batch Workbook Conversion
+Converts every workbook matched by a glob or found in a directory in one run,
+sending each one to its converter (same rules as the watch daemon):
+
+  oops.xls / oops.xlsx               -> oops_excel_merge_to_csv   -> oops.csv
+  CURRENT YEAR EXPENDITURE*.xlsx     -> currentyearexpenditure    -> CURRENT_YEAR_EXPENDITURE.csv
+  any other .xls / .xlsx             -> excel_to_csv_converter    -> <name>_consolidated.*
+
+  - workbooks run concurrently on a process pool; the converters are imported
+    once in the parent and the workers are forked from it
+  - jobs are started largest-first (estimated cost), which keeps the longest
+    workbook from starting last and stretching the total run time
+  - workbooks writing the same output (oops.xls and oops.xlsx) run one after
+    the other in the same job
+  - each converter's output is captured and shown only on failure (or with --verbose)
+
+Usage: python batch_convert.py <dir | glob> [...] [--workers N] [--verbose]
+"""
+
+import contextlib
+import glob
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from watch_daemon import CONVERTERS, converter_for, output_for
+
+# Seconds per MB of input, relative: .xlsx is zip-compressed so each byte
+# holds about twice as much sheet data as in .xls
+COST_PER_MB = {'.xls': 1.0, '.xlsx': 2.0}
+
+CONVERTER_MODULES = {
+    'engineering': 'excel_to_csv_converter',
+    'oops': 'oops_excel_merge_to_csv',
+    'current_year': 'currentyearexpenditure',
+}
+
+
+def collect_workbooks(patterns):
+    """
+    Expand directories and globs into (converter, path) pairs; files the
+    converters don't handle (outputs, lock files) are skipped
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in sorted(os.listdir(pattern))]
+        else:
+            candidates = sorted(glob.glob(pattern)) or [pattern]
+        for path in candidates:
+            path = os.path.abspath(path)
+            if os.path.isfile(path) and path not in paths:
+                paths.append(path)
+
+    workbooks = []
+    for path in paths:
+        converter = converter_for(path)
+        if converter is not None:
+            workbooks.append((converter, path))
+    return workbooks
+
+
+def estimated_cost(path):
+    extension = os.path.splitext(path)[1].lower()
+    return os.path.getsize(path) / (1024 * 1024) * COST_PER_MB.get(extension, 1.0)
+
+
+def plan_jobs(workbooks):
+    """
+    Group workbooks by output and order the groups largest-first
+    Returns [(estimated_cost, [(converter, path), ...]), ...]
+    """
+    groups = {}
+    for converter, path in workbooks:
+        groups.setdefault(output_for(converter, path), []).append((converter, path))
+
+    jobs = [(sum(estimated_cost(path) for _, path in group), group) for group in groups.values()]
+    jobs.sort(key=lambda job: -job[0])
+    return jobs
+
+
+def convert_group(group, submitted_at):
+    """
+    Run one job's conversions in a worker; returns a result per workbook
+    """
+    results = []
+    queued = time.time() - submitted_at
+    for converter, path in group:
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        log = io.StringIO()
+        error = None
+        try:
+            with contextlib.redirect_stdout(log):
+                CONVERTERS[converter](path)
+        except Exception:
+            error = traceback.format_exc(limit=3)
+        results.append({
+            'converter': converter,
+            'path': path,
+            'output': output_for(converter, path),
+            'queued': queued,
+            'seconds': time.perf_counter() - started,
+            'cpu': time.process_time() - cpu_started,
+            'error': error,
+            'log': log.getvalue(),
+        })
+        queued = 0.0
+    return results
+
+
+def run_batch(workbooks, workers=None, verbose=False):
+    """
+    Convert the workbooks on a process pool; returns the per-workbook results
+    """
+    jobs = plan_jobs(workbooks)
+    if not jobs:
+        return []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+
+    for converter in sorted({converter for converter, _ in workbooks}):
+        __import__(CONVERTER_MODULES[converter])
+
+    print(f"📊 {len(workbooks)} workbook(s) in {len(jobs)} job(s) on {workers} worker(s), largest first:")
+    for _, group in jobs:
+        for converter, path in group:
+            print(f"   • {os.path.basename(path)} ({converter}, {os.path.getsize(path) / 1024:.0f} KB)")
+
+    results = []
+    started = time.perf_counter()
+    # The pool hands queued jobs to idle workers in submission order, so
+    # submitting largest-first is the longest-processing-time-first schedule
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+        futures = [executor.submit(convert_group, group, time.time()) for _, group in jobs]
+        for future in as_completed(futures):
+            for result in future.result():
+                status = '✅' if result['error'] is None else '❌'
+                print(f"{status} {os.path.basename(result['path'])} in {result['seconds']:.2f}s")
+                if result['error'] is not None or verbose:
+                    print(result['log'].rstrip())
+                if result['error'] is not None:
+                    print(result['error'].rstrip())
+                results.append(result)
+    wall = time.perf_counter() - started
+
+    print_report(results, workers, wall)
+    return results
+
+
+def print_report(results, workers, wall):
+    print("\n" + "=" * 69)
+    print("BATCH TIMING REPORT")
+    print("=" * 69)
+    print(f"{'Workbook':40s} {'Queued':>8s} {'Run':>8s} {'CPU':>8s}")
+    for result in sorted(results, key=lambda result: -result['cpu']):
+        name = os.path.basename(result['path'])
+        print(f"{name[:40]:40s} {result['queued']:7.2f}s {result['seconds']:7.2f}s {result['cpu']:7.2f}s"
+              f"{'' if result['error'] is None else '  FAILED'}")
+
+    # CPU time stands in for each conversion's stand-alone run time, which
+    # wall time overstates when workers share a core
+    busy = sum(result['cpu'] for result in results)
+    job_seconds = {}
+    for result in results:
+        job_seconds[result['output']] = job_seconds.get(result['output'], 0.0) + result['cpu']
+    # No schedule can finish before the longest job or before the work is spread evenly
+    lower_bound = max(max(job_seconds.values()), busy / workers)
+
+    print("-" * 69)
+    print(f"Wall time:          {wall:.2f}s")
+    print(f"Sequential time:    {busy:.2f}s (CPU time of all conversions)")
+    print(f"Speedup:            {busy / wall:.2f}x on {workers} worker(s)")
+    print(f"Lower bound:        {lower_bound:.2f}s (longest job or even split)")
+    failures = sum(1 for result in results if result['error'] is not None)
+    print(f"Converted:          {len(results) - failures}/{len(results)}")
+
+
+def main():
+    args = sys.argv[1:]
+    workers = None
+    if '--workers' in args:
+        workers = int(args.pop(args.index('--workers') + 1))
+        args.remove('--workers')
+    verbose = '--verbose' in args
+    patterns = [arg for arg in args if not arg.startswith('--')]
+
+    if not patterns:
+        print(__doc__)
+        sys.exit(1)
+
+    workbooks = collect_workbooks(patterns)
+    if not workbooks:
+        print(f"❌ Error: No workbooks found in: {', '.join(patterns)}")
+        sys.exit(1)
+
+    results = run_batch(workbooks, workers, verbose)
+    if any(result['error'] is not None for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Data Service Load Benchmark
+Compares data_service.py with staticdashboard/public/server.js under concurrent
+load: each of N keep-alive connections sends a mix of read requests for a fixed
+number of seconds, and the run reports requests/second and p50/p95/max latency
+per server.
+
+A second data_service round republishes a CSV early on, to show that requests
+are still served while the new version is parsed and swapped in.
+
+Both servers run against a temporary copy of the data directory (server.js can
+rewrite CSVs, e.g. when it regenerates row IDs). server.js is skipped when node
+or its node_modules are missing.
+
+Usage: python benchmarks/bench_data_service.py [data_dir] [connections] [seconds]
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+PUBLIC_DIR = os.path.join(ROOT, 'staticdashboard', 'public')
+
+NODE_PORT = 3456  # fixed in server.js
+SERVICE_PORT = 3458
+
+REQUESTS = [
+    '/api/health',
+    '/api/stats/engineering',
+    '/api/csv/engineering/rows?page=1&limit=50',
+    '/api/csv/engineering/rows?page=3&limit=50&sortBy=budget_head&sortOrder=desc',
+    '/api/csv/engineering/rows?search=solar&limit=50',
+    '/api/csv/enggcurrentyear/rows?page=1&limit=100',
+]
+
+
+def wait_for_port(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+        time.sleep(0.2)
+    return False
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    headers = {}
+    for line in head.decode('latin-1').split('\r\n')[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).strip() or b'0', 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', '0')))
+    return int(head.split(b' ', 2)[1])
+
+
+async def client(port, deadline, offset, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        i = offset
+        while time.perf_counter() < deadline:
+            target = REQUESTS[i % len(REQUESTS)]
+            i += 1
+            started = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\nAccept-Encoding: gzip\r\n\r\n".encode())
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def load(port, connections, seconds, during=None):
+    latencies, errors = [], []
+    started = time.perf_counter()
+    side_task = asyncio.create_task(during()) if during is not None else None
+    await asyncio.gather(*[client(port, started + seconds, i, latencies, errors) for i in range(connections)])
+    elapsed = time.perf_counter() - started
+    if side_task is not None:
+        await side_task
+    return elapsed, latencies, errors
+
+
+def report(name, elapsed, latencies, errors):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {name:<28} {len(latencies) / elapsed:>8.0f} req/s   p50 {statistics.median(latencies) * 1000:>7.1f} ms"
+          f"   p95 {p95 * 1000:>7.1f} ms   max {latencies[-1] * 1000:>7.1f} ms"
+          f"{f'   ({len(errors)} non-200)' if errors else ''}")
+
+
+def served_version(port, database='engineering'):
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health') as response:
+        return json.load(response)['databases'].get(database)
+
+
+def republish(data_dir):
+    """
+    Rewrite engineering.csv with one more copy of its last row after a short delay
+    """
+    async def run():
+        await asyncio.sleep(0.2)
+        path = os.path.join(data_dir, 'engineering.csv')
+        with open(path, 'rb') as f:
+            content = f.read()
+        last_row = content.rstrip(b'\r\n').rsplit(b'\n', 1)[-1]
+        with open(path + '.tmp', 'wb') as f:
+            f.write(content.rstrip(b'\r\n') + b'\n' + last_row + b'\n')
+        os.replace(path + '.tmp', path)
+    return run
+
+
+def start_data_service(data_dir):
+    return subprocess.Popen([sys.executable, os.path.join(ROOT, 'data_service.py'), data_dir, str(SERVICE_PORT)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def start_server_js(work_dir, data_dir):
+    node = shutil.which('node')
+    node_modules = os.path.join(PUBLIC_DIR, 'node_modules')
+    if node is None or not os.path.isdir(node_modules):
+        return None
+    shutil.copy(os.path.join(PUBLIC_DIR, 'server.js'), work_dir)
+    os.symlink(node_modules, os.path.join(work_dir, 'node_modules'))
+    shutil.copytree(data_dir, os.path.join(work_dir, 'data'))
+    return subprocess.Popen([node, os.path.join(work_dir, 'server.js')], cwd=work_dir,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_server(name, process, port, connections, seconds, during=None):
+    """
+    Returns the engineering version data_service reported before and after the round
+    """
+    try:
+        if not wait_for_port(port):
+            print(f"  {name:<28} did not start")
+            return None
+        # One warm-up pass so both servers have parsed the CSVs
+        asyncio.run(load(port, 1, 1))
+        before = served_version(port) if port == SERVICE_PORT else None
+        report(name, *asyncio.run(load(port, connections, seconds, during)))
+        return before, served_version(port) if port == SERVICE_PORT else None
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(PUBLIC_DIR, 'data')
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    if not os.path.isdir(data_dir):
+        print(f"❌ Error: Data directory not found: {data_dir}")
+        sys.exit(1)
+
+    print(f"📊 {connections} connections for {seconds:g}s each ({len(REQUESTS)} endpoints, gzip accepted)")
+    with tempfile.TemporaryDirectory() as tmp:
+        service_data = os.path.join(tmp, 'service_data')
+        shutil.copytree(data_dir, service_data)
+        run_server('data_service.py', start_data_service(service_data), SERVICE_PORT, connections, seconds)
+        versions = run_server('data_service.py + reload', start_data_service(service_data), SERVICE_PORT,
+                              connections, seconds, republish(service_data))
+        if versions is not None:
+            print(f"    republished CSV {'swapped in during the round' if versions[0] != versions[1] else 'NOT picked up'}")
+
+        node_dir = os.path.join(tmp, 'node')
+        os.makedirs(node_dir)
+        process = start_server_js(node_dir, data_dir)
+        if process is None:
+            print("  server.js                    skipped (node or node_modules not found)")
+        else:
+            run_server('server.js', process, NODE_PORT, connections, seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+CLI Start-up Benchmark
+Runs convert_cli.py's fast paths (--help, --version, status, --dry-run) and
+checks them against the start-up budget:
+  - median wall time under BUDGET_MS
+  - none of the heavy modules (pandas, numpy, xlrd, ...) imported
+
+Import costs are taken from `python -X importtime` so a regression points at
+the module responsible.
+
+Usage: python benchmarks/bench_import_time.py [repeat]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CLI = os.path.join(REPO_DIR, 'convert_cli.py')
+
+BUDGET_MS = 100
+
+HEAVY_MODULES = ['pandas', 'numpy', 'xlrd', 'openpyxl', 'xlsxwriter', 'pyarrow', 'chardet']
+
+# "import time:       464 |       1481 |     re._compiler"
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def cases(workdir):
+    missing = os.path.join(workdir, 'engineering.xls')
+    output = os.path.join(workdir, 'engineering_consolidated.csv')
+    return [
+        ('--help', ['--help']),
+        ('--version', ['--version']),
+        ('status', ['status', 'excel_to_csv_converter', missing, output]),
+        ('engineering --dry-run', ['engineering', missing, '--dry-run']),
+        ('perfect --dry-run', ['perfect', missing, '--dry-run']),
+    ]
+
+
+def parse_importtime(stderr):
+    """
+    Returns {module: cumulative microseconds} for top-level imports and the set
+    of every module imported
+    """
+    top_level = {}
+    imported = set()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, module = match.groups()
+        imported.add(module)
+        if len(indent) <= 1:
+            top_level[module] = int(cumulative)
+    return top_level, imported
+
+
+def run_case(args, repeat):
+    command = [sys.executable, CLI] + args
+
+    wall = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=REPO_DIR)
+        wall.append((time.perf_counter() - started) * 1000)
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', CLI] + args,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, cwd=REPO_DIR)
+    top_level, imported = parse_importtime(result.stderr)
+    return statistics.median(wall), top_level, imported
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    # Baseline: the interpreter alone
+    baseline = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'])
+        baseline.append((time.perf_counter() - started) * 1000)
+    print(f"Interpreter start-up: {statistics.median(baseline):.1f} ms (median of {repeat})")
+    print(f"Budget: {BUDGET_MS} ms per fast path, no heavy imports\n")
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, args in cases(workdir):
+            wall_ms, top_level, imported = run_case(args, repeat)
+            heavy = [module for module in HEAVY_MODULES if module in imported]
+
+            status = '✅' if wall_ms <= BUDGET_MS and not heavy else '❌'
+            print(f"{status} {name:24s} {wall_ms:7.1f} ms   imports {sum(top_level.values()) / 1000:6.1f} ms")
+            for module, micros in sorted(top_level.items(), key=lambda item: -item[1])[:3]:
+                print(f"     {module:30s} {micros / 1000:6.1f} ms")
+
+            if wall_ms > BUDGET_MS:
+                failures.append(f"{name}: {wall_ms:.1f} ms exceeds {BUDGET_MS} ms")
+            if heavy:
+                failures.append(f"{name}: imports {', '.join(heavy)}")
+
+    if failures:
+        print("\n❌ Start-up regressions:")
+        for failure in failures:
+            print(f"  • {failure}")
+        sys.exit(1)
+    print("\n✅ All fast paths within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Reader Backend Benchmark
+Reads every sheet of each sample workbook with every registered backend for
+its detected format and records the throughput (MB/s of input, cells/s);
+backends that aren't installed are listed as skipped
+
+Usage: python benchmarks/bench_reader_backends.py [file ...] [--repeat N]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from reader_backends import BACKENDS, detect_format
+
+DEFAULT_FILES = [
+    'PROGRESS OF WORKS.xls',
+    'REVISED ELEMENT WISE SUMMARY - Copy.xls',
+    'consolidated_progress_report.xlsx',
+    'oops.xlsx',
+    'CURRENT YEAR EXPENDITURE.xlsx',
+]
+
+
+def read_all_sheets(backend, path):
+    """
+    Open path with backend and parse every sheet; returns the number of cells
+    """
+    workbook = backend.open(path)
+    try:
+        cells = 0
+        for sheet_name in workbook.sheet_names:
+            df = workbook.parse(sheet_name)
+            cells += df.size
+        return cells
+    finally:
+        workbook.close()
+
+
+def measure(backend, path, repeat):
+    """
+    Best of repeat runs: (seconds, cells)
+    """
+    best = None
+    cells = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cells = read_all_sheets(backend, path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, cells
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = 3
+    if '--repeat' in args:
+        repeat = int(args.pop(args.index('--repeat') + 1))
+        args.remove('--repeat')
+
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    files = args or [os.path.join(root, name) for name in DEFAULT_FILES]
+
+    for path in files:
+        if not os.path.exists(path):
+            print(f"❌ Skipping {path}: not found")
+            continue
+
+        start = time.perf_counter()
+        file_format = detect_format(path)
+        detect_ms = (time.perf_counter() - start) * 1000
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        print(f"\n📊 {os.path.basename(path)} ({size_mb:.2f} MB, detected {file_format} in {detect_ms:.2f} ms)")
+        print("=" * 70)
+        for backend in BACKENDS[file_format]:
+            if not backend.available():
+                print(f"  {backend.name:12s}: skipped (needs {', '.join(backend.requires)})")
+                continue
+            try:
+                elapsed, cells = measure(backend, path, repeat)
+            except Exception as e:
+                print(f"  {backend.name:12s}: failed ({e})")
+                continue
+            print(f"  {backend.name:12s}: {elapsed:7.3f}s  {size_mb / elapsed:7.2f} MB/s  "
+                  f"{cells / elapsed:12,.0f} cells/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Excel Writer Benchmark
+Compares pandas' in-memory openpyxl writer with the streaming writers
+on time and peak Python memory (tracemalloc)
+
+Usage: python benchmarks/bench_xlsx_writers.py [input.csv] [repeat]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import streaming_xlsx_writer
+from streaming_xlsx_writer import write_sheets_streaming
+
+DATE_COLUMNS = [
+    'date_ts', 'date_tender', 'date_acceptance', 'date_award',
+    'pdc_agreement', 'revised_pdc', 'actual_completion_date'
+]
+
+
+def write_pandas_openpyxl(path, sheets):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def write_streaming_xlsxwriter(path, sheets):
+    write_sheets_streaming(path, sheets, date_columns=DATE_COLUMNS)
+
+
+def write_streaming_openpyxl(path, sheets):
+    # Temporarily hide xlsxwriter to force the write_only fallback
+    saved = streaming_xlsx_writer.xlsxwriter
+    streaming_xlsx_writer.xlsxwriter = None
+    try:
+        write_sheets_streaming(path, sheets, date_columns=DATE_COLUMNS)
+    finally:
+        streaming_xlsx_writer.xlsxwriter = saved
+
+
+def measure(writer, path, sheets):
+    tracemalloc.start()
+    start = time.perf_counter()
+    writer(path, sheets)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'consolidated_progress_report.csv'
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    df = pd.read_csv(input_file, low_memory=False)
+    if repeat > 1:
+        df = pd.concat([df] * repeat, ignore_index=True)
+
+    summary = pd.DataFrame([('Total Records', len(df))], columns=['Metric', 'Value'])
+    sheets = {'Consolidated_Data': df, 'Summary': summary}
+
+    writers = [('pandas + openpyxl (current)', write_pandas_openpyxl)]
+    if streaming_xlsx_writer.xlsxwriter is not None:
+        writers.append(('xlsxwriter constant_memory', write_streaming_xlsxwriter))
+    writers.append(('openpyxl write_only', write_streaming_openpyxl))
+
+    print(f"Input: {input_file} ({len(df):,} rows × {len(df.columns)} columns)")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for idx, (name, writer) in enumerate(writers):
+            path = os.path.join(tmp_dir, f'bench_{idx}.xlsx')
+            elapsed, peak = measure(writer, path, sheets)
+            size = os.path.getsize(path)
+            print(f"  {name:30s}: {elapsed:7.2f}s  peak {peak / 1024 / 1024:8.1f} MB  "
+                  f"file {size / 1024:8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
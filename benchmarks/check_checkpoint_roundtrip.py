@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Round-Trip Check
+Saves sheets with the column kinds the converters produce to a scratch
+SheetCheckpoints directory and checks that loading them gives back exactly
+the same frame: same dtypes, same values and the same kind of missing value
+(None stays None, NaN stays NaN), and the same CSV bytes
+
+Usage: python benchmarks/check_checkpoint_roundtrip.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sheet_checkpoints import SheetCheckpoints
+
+CASES = {
+    'object ints with None': pd.Series([1, None, 3], dtype=object),
+    'object bools with None': pd.Series([True, None, False], dtype=object),
+    'object Timestamps with None': pd.Series([pd.Timestamp('2024-01-02'), None, pd.Timestamp('2024-03-04')],
+                                             dtype=object),
+    'object datetimes': pd.Series([pd.Timestamp('2024-01-02'), pd.Timestamp('2024-03-04'), pd.NaT], dtype=object),
+    'object strings with None': pd.Series(['a', None, 'c'], dtype=object),
+    'object strings with NaN': pd.Series(['a', np.nan, 'c'], dtype=object),
+    'object strings': pd.Series(['a', 'b', ''], dtype=object),
+    'mixed object': pd.Series([1, 'two', 3.5], dtype=object),
+    'float64 with NaN': pd.Series([1.5, np.nan, 3.0]),
+    'int64': pd.Series([1, 2, 3]),
+    'datetime64 with NaT': pd.Series(pd.to_datetime(['2024-01-02', None, '2024-03-04'])),
+}
+
+
+def same_values(a, b):
+    """
+    Element-wise identical, including the type of each value and of missing values
+    """
+    return all(type(x) is type(y) and (x == y or (pd.isna(x) and pd.isna(y)))
+               for x, y in zip(a.tolist(), b.tolist()))
+
+
+def main():
+    df = pd.DataFrame(CASES)
+    failures = []
+    with tempfile.TemporaryDirectory() as scratch:
+        input_path = os.path.join(scratch, 'input.bin')
+        with open(input_path, 'wb') as f:
+            f.write(b'checkpoint round trip')
+        checkpoints = SheetCheckpoints(os.path.join(scratch, 'ckpt'), input_path, 'round_trip')
+        checkpoints.save(0, 'Sheet1', df)
+        loaded = checkpoints.load('Sheet1')
+
+        for name in CASES:
+            ok = str(df[name].dtype) == str(loaded[name].dtype) and same_values(df[name], loaded[name])
+            print(f"  {'✅' if ok else '❌'} {name}: {df[name].dtype} -> {loaded[name].dtype}")
+            if not ok:
+                failures.append(name)
+        if df.to_csv(index=False) != loaded.to_csv(index=False):
+            failures.append('CSV bytes')
+
+    if failures:
+        print(f"\n❌ Round trip changed: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Checkpoint round trip is exact")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Build Manifest
+Make-style up-to-date check for the converters. For every output, the manifest
+records the input's size, mtime and SHA-256, the converter version (hash of its
+source files: the converter module and every repo module it imports) and the mapping-table version (hash of its column mapping
+tables). A conversion whose input, code and mapping are unchanged and whose
+outputs are intact can be skipped.
+
+Only the standard library is used, so a check costs milliseconds and can run
+before pandas is imported.
+
+  - input size and mtime unchanged        -> up to date without reading the input
+  - mtime changed but content hash equal  -> up to date (the manifest is refreshed)
+
+Usage: python build_manifest.py <converter> <input> <output> [output ...]
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from file_lock import locked, write_json_atomic
+
+MANIFEST_NAME = '.build_manifest.json'
+MANIFEST_VERSION = 1
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Each converter's entry modules (streaming_convert is perfect's --stream mode)
+# and its mapping tables as (file, function, variable) whose literal values are
+# hashed separately (function None for a module-level variable). The converter version covers the entry modules and
+# every repo-local module they import, found by source_files()
+TARGETS = {
+    'excel_to_csv_converter': {
+        'entries': ['excel_to_csv_converter.py'],
+        'mappings': [('excel_to_csv_converter.py', 'standardize_column_names', 'column_mapping')],
+    },
+    'perfect_engineering_sheets_to_csv': {
+        'entries': ['perfect_engineering_sheets_to_csv.py', 'streaming_convert.py'],
+        'mappings': [('perfect_engineering_sheets_to_csv.py', 'standardize_column_names', 'column_mapping'),
+                     ('perfect_engineering_sheets_to_csv.py', None, 'EXPECTED_COLUMNS')],
+    },
+}
+
+# "from x.y import z" -> x, "import x.y as z, w" -> "x.y as z, w"
+IMPORT_PATTERN = re.compile(r'^[ \t]*(?:from[ \t]+([A-Za-z_]\w*)[\w.]*[ \t]+import\b|import[ \t]+([A-Za-z_][\w. \t,]*))',
+                            re.MULTILINE)
+
+_version_cache = {}
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def imported_modules(source):
+    """
+    Top-level names of every module a source imports, including imports inside
+    functions (the converters import lazily). Import lines are matched rather
+    than the file parsed, which keeps --version and the up-to-date check fast;
+    a match inside a string can only add a module, never miss one
+    """
+    names = set()
+    for match in IMPORT_PATTERN.finditer(source):
+        if match.group(1):
+            names.add(match.group(1))
+        else:
+            names.update(part.split()[0].split('.')[0] for part in match.group(2).split(',') if part.strip())
+    return names
+
+
+def source_files(target):
+    """
+    The converter's entry modules plus every module in REPO_DIR they import,
+    directly or transitively, as sorted file names
+    """
+    key = ('sources', target)
+    if key not in _version_cache:
+        found = set()
+        queue = list(TARGETS[target]['entries'])
+        while queue:
+            name = queue.pop()
+            if name in found:
+                continue
+            found.add(name)
+            with open(os.path.join(REPO_DIR, name), 'r', encoding='utf-8') as f:
+                source = f.read()
+            for module in imported_modules(source):
+                if os.path.isfile(os.path.join(REPO_DIR, module + '.py')):
+                    queue.append(module + '.py')
+        _version_cache[key] = sorted(found)
+    return _version_cache[key]
+
+
+def converter_version(target):
+    """
+    Hash of the converter's source files (see source_files)
+    """
+    key = ('converter', target)
+    if key not in _version_cache:
+        digest = hashlib.sha256()
+        for name in source_files(target):
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(REPO_DIR, name), 'rb') as f:
+                digest.update(f.read())
+        _version_cache[key] = digest.hexdigest()[:16]
+    return _version_cache[key]
+
+
+def mapping_version(target):
+    """
+    Hash of the converter's mapping tables (the literal assigned to each
+    variable inside each function of that name, or at module level),
+    independent of formatting
+    """
+    key = ('mapping', target)
+    if key not in _version_cache:
+        digest = hashlib.sha256()
+        trees = {}
+        for file_name, function_name, variable in TARGETS[target]['mappings']:
+            if file_name not in trees:
+                with open(os.path.join(REPO_DIR, file_name), 'r', encoding='utf-8') as f:
+                    trees[file_name] = ast.parse(f.read())
+            if function_name is None:
+                scopes = [trees[file_name].body]
+            else:
+                scopes = [list(ast.walk(node)) for node in ast.walk(trees[file_name])
+                          if isinstance(node, ast.FunctionDef) and node.name == function_name]
+            for scope in scopes:
+                for stmt in scope:
+                    if (isinstance(stmt, ast.Assign)
+                            and any(isinstance(t, ast.Name) and t.id == variable for t in stmt.targets)):
+                        digest.update(ast.dump(stmt.value).encode('utf-8'))
+        _version_cache[key] = digest.hexdigest()[:16]
+    return _version_cache[key]
+
+
+def manifest_path_for(output_path):
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), MANIFEST_NAME)
+
+
+def read_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {'version': MANIFEST_VERSION, 'outputs': {}}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'outputs': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'outputs': {}}
+    return manifest
+
+
+def write_manifest(manifest_path, manifest):
+    write_json_atomic(manifest_path, manifest)
+
+
+def update_manifest(manifest_path, update):
+    """
+    Re-read the manifest under its lock, apply update(outputs) and write it
+    back, so concurrent builds into one directory keep each other's entries
+    """
+    with locked(manifest_path):
+        manifest = read_manifest(manifest_path)
+        update(manifest['outputs'])
+        write_manifest(manifest_path, manifest)
+
+
+def file_state(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def check_up_to_date(target, input_path, output_paths, options=None, exact_outputs=True):
+    """
+    Returns (up_to_date, reason)
+    The first output identifies the build. With exact_outputs=False the other
+    outputs are taken from the manifest, so callers that only know the primary
+    output (e.g. before the converter is imported) can still check. options
+    (e.g. the selected output formats) must match those recorded
+    """
+    output_paths = list(output_paths)
+    if not output_paths:
+        return False, 'no outputs'
+    if not os.path.exists(input_path):
+        return False, 'input missing'
+
+    manifest_path = manifest_path_for(output_paths[0])
+    manifest = read_manifest(manifest_path)
+    entry = manifest['outputs'].get(os.path.abspath(output_paths[0]))
+    if entry is None:
+        return False, 'never built'
+
+    if entry['input']['path'] != os.path.abspath(input_path):
+        return False, 'different input'
+    if entry.get('options', {}) != (options or {}):
+        return False, 'options changed'
+    # The mapping tables live in the converter sources, so they can only have
+    # changed when the converter version did; parsing them is skipped otherwise
+    if entry['converter'] != target or entry['converter_version'] != converter_version(target):
+        if entry['mapping_version'] != mapping_version(target):
+            return False, 'mapping table changed'
+        return False, 'converter changed'
+
+    recorded_outputs = entry['outputs']
+    if exact_outputs and sorted(recorded_outputs) != sorted(os.path.abspath(path) for path in output_paths):
+        return False, 'output set changed'
+    for path, state in recorded_outputs.items():
+        if not os.path.exists(path) or file_state(path) != state:
+            return False, f'output modified: {os.path.basename(path)}'
+
+    current = file_state(input_path)
+    recorded = entry['input']
+    if current['size'] != recorded['size']:
+        return False, 'input changed'
+    if current['mtime_ns'] != recorded['mtime_ns']:
+        # Touched or copied but possibly identical: fall back to the content hash
+        if hash_file(input_path) != recorded['sha256']:
+            return False, 'input changed'
+        def refresh_mtime(outputs):
+            if os.path.abspath(output_paths[0]) in outputs:
+                outputs[os.path.abspath(output_paths[0])]['input']['mtime_ns'] = current['mtime_ns']
+
+        update_manifest(manifest_path, refresh_mtime)
+
+    return True, 'up to date'
+
+
+def record_build(target, input_path, output_paths, options=None):
+    """
+    Record a successful build of output_paths from input_path
+    """
+    output_paths = [os.path.abspath(path) for path in output_paths if os.path.exists(path)]
+    if not output_paths:
+        return
+
+    entry = {
+        'input': {'path': os.path.abspath(input_path), 'sha256': hash_file(input_path),
+                  **file_state(input_path)},
+        'converter': target,
+        'converter_version': converter_version(target),
+        'mapping_version': mapping_version(target),
+        'options': options or {},
+        'outputs': {path: file_state(path) for path in output_paths},
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    def add_entry(outputs):
+        outputs[output_paths[0]] = entry
+
+    update_manifest(manifest_path_for(output_paths[0]), add_entry)
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] not in TARGETS:
+        print(__doc__)
+        print(f"Converters: {', '.join(TARGETS)}")
+        sys.exit(2)
+
+    up_to_date, reason = check_up_to_date(sys.argv[1], sys.argv[2], sys.argv[3:])
+    print(reason)
+    sys.exit(0 if up_to_date else 1)
+
+
+if __name__ == "__main__":
+    main()
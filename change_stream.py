@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Row Change Stream
+Computes row-level inserts, updates and deletes between two versions of a
+published CSV (by row key and row hash) and streams them to dashboard clients
+as Server-Sent Events, so a refresh costs only the changed rows.
+
+Used by data_service.py:
+  GET /api/changes/<database>            Last-Event-ID header or ?since=<event id>
+
+Events:
+  snapshot  {"seq", "version", "columns", "idField", "rows": [{"key", "row"}]}
+  delta     {"seq", "from_seq", "version", "inserted": [{"key", "row"}],
+             "updated": [{"key", "row"}], "deleted": [key, ...]}
+
+Event ids are "<seq>-<version>". Clients that reconnect with an id that is no
+longer in the history (or from an earlier server run) get a fresh snapshot.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections import deque
+
+# Number of published versions kept for resuming clients
+HISTORY_SIZE = 50
+
+# Send a snapshot instead of a delta when more than this fraction of rows changed
+SNAPSHOT_RATIO = 0.5
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+
+def row_hash(row):
+    return hashlib.sha1('\x1f'.join(row.values()).encode('utf-8')).hexdigest()
+
+
+def index_rows(rows, id_field):
+    """
+    Map each row to a stable key -> (hash, row)
+    Rows are keyed by id_field when every row has a unique non-empty id,
+    otherwise by their content hash (an edit then shows up as delete + insert)
+    """
+    hashes = [row_hash(row) for row in rows]
+    ids = [row.get(id_field, '') for row in rows]
+
+    if all(ids) and len(set(ids)) == len(ids):
+        keys = ids
+    else:
+        keys = []
+        seen = {}
+        for h in hashes:
+            # Identical rows get a counter so none of them is lost
+            count = seen.get(h, 0)
+            seen[h] = count + 1
+            keys.append(f"#{h[:16]}" if count == 0 else f"#{h[:16]}.{count}")
+
+    return {key: (h, row) for key, h, row in zip(keys, hashes, rows)}
+
+
+def diff_rows(old_index, new_index):
+    """
+    Compare two row indexes; returns {'inserted', 'updated', 'deleted'}
+    """
+    inserted = []
+    updated = []
+    for key, (h, row) in new_index.items():
+        previous = old_index.get(key)
+        if previous is None:
+            inserted.append({'key': key, 'row': row})
+        elif previous[0] != h:
+            updated.append({'key': key, 'row': row})
+
+    deleted = [key for key in old_index if key not in new_index]
+    return {'inserted': inserted, 'updated': updated, 'deleted': deleted}
+
+
+def merge_deltas(deltas):
+    """
+    Coalesce consecutive deltas into one, keeping only the latest state per key
+    """
+    if len(deltas) == 1:
+        return deltas[0]
+
+    state = {}
+    for delta in deltas:
+        for item in delta['inserted']:
+            # Deleted then re-inserted within the window is an update
+            was_deleted = state.get(item['key'], (None,))[0] == 'deleted'
+            state[item['key']] = ('updated' if was_deleted else 'inserted', item)
+        for item in delta['updated']:
+            kind = state.get(item['key'], ('updated',))[0]
+            state[item['key']] = ('inserted' if kind == 'inserted' else 'updated', item)
+        for key in delta['deleted']:
+            kind = state.get(key, ('deleted',))[0]
+            if kind == 'inserted':
+                # Inserted and deleted within the window: nothing to send
+                del state[key]
+            else:
+                state[key] = ('deleted', key)
+
+    merged = {'inserted': [], 'updated': [], 'deleted': []}
+    for kind, item in state.values():
+        merged[kind].append(item)
+    return merged
+
+
+def format_event(event, data, event_id=None):
+    """
+    Encode one Server-Sent Event
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+def parse_event_id(event_id):
+    """
+    Split '<seq>-<version>' into (seq, version); None if malformed
+    """
+    seq, _, version = (event_id or '').partition('-')
+    if not seq.isdigit() or not version:
+        return None
+    return int(seq), version
+
+
+class ChangeFeed:
+    """Sequence-numbered history of row deltas for one database"""
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.seq = 0
+        self.version = None
+        self.history = deque(maxlen=history_size)
+        self.published = asyncio.Event()
+
+    def reset(self, version):
+        """
+        Start the feed at a version without publishing a delta
+        """
+        self.version = version
+        self.history.append((self.seq, version, None))
+
+    def publish(self, version, delta):
+        """
+        Record a new version and wake every subscriber
+        delta=None means the change cannot be expressed as row deltas (e.g. the
+        columns changed); subscribers get a snapshot instead
+        """
+        self.seq += 1
+        self.version = version
+        self.history.append((self.seq, version, delta))
+
+        # Wake current waiters and arm a fresh event for the next change
+        published, self.published = self.published, asyncio.Event()
+        published.set()
+
+    def event_id(self):
+        return f"{self.seq}-{self.version}"
+
+    def deltas_since(self, seq, version):
+        """
+        Deltas published after (seq, version), oldest first
+        Returns None when the client must resync from a snapshot
+        """
+        if seq == self.seq:
+            return [] if version == self.version else None
+        if seq > self.seq:
+            return None
+
+        # The history must still hold the client's version and everything after it;
+        # each entry's delta leads from the previous entry to its version
+        entries = [entry for entry in self.history if entry[0] >= seq]
+        if not entries or entries[0][0] != seq or entries[0][1] != version:
+            return None
+
+        deltas = [delta for _, _, delta in entries[1:]]
+        if any(delta is None for delta in deltas):
+            return None
+        return deltas
+
+    def stats(self):
+        return {
+            'seq': self.seq,
+            'version': self.version,
+            'history': len(self.history),
+        }
+
+
+def snapshot_payload(feed, dataset):
+    return {
+        'seq': feed.seq,
+        'version': dataset.version,
+        'columns': dataset.columns,
+        'idField': dataset.config['idField'],
+        'rows': [{'key': key, 'row': row} for key, (_, row) in dataset.row_index.items()],
+    }
+
+
+def delta_payload(feed, from_seq, delta):
+    return {
+        'seq': feed.seq,
+        'from_seq': from_seq,
+        'version': feed.version,
+        **delta,
+    }
+
+
+async def stream_changes(feed, get_dataset, writer, last_event_id=None):
+    """
+    Serve one SSE subscriber until the connection closes
+    get_dataset() returns the current Dataset for the feed's database
+    """
+    writer.write((
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: text/event-stream; charset=utf-8\r\n"
+        "Cache-Control: no-cache\r\n"
+        "Connection: keep-alive\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "X-Accel-Buffering: no\r\n"
+        "\r\n"
+    ).encode('latin-1'))
+    writer.write(f"retry: {RETRY_MILLISECONDS}\n\n".encode('latin-1'))
+
+    position = parse_event_id(last_event_id)
+    deltas = feed.deltas_since(*position) if position else None
+    dataset = get_dataset()
+
+    if deltas is None:
+        writer.write(format_event('snapshot', snapshot_payload(feed, dataset), feed.event_id()))
+    elif deltas:
+        writer.write(format_event('delta', delta_payload(feed, position[0], merge_deltas(deltas)),
+                                  feed.event_id()))
+    seq, version = feed.seq, feed.version
+    await writer.drain()
+
+    while True:
+        published = feed.published
+        try:
+            await asyncio.wait_for(published.wait(), timeout=HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            writer.write(b": keep-alive\n\n")
+            await writer.drain()
+            continue
+
+        # Everything published since the last send goes out as one event
+        deltas = feed.deltas_since(seq, version)
+        dataset = get_dataset()
+        changed = sum(len(d['inserted']) + len(d['updated']) + len(d['deleted']) for d in deltas or [])
+
+        if deltas is None or changed > SNAPSHOT_RATIO * max(len(dataset.rows), 1):
+            writer.write(format_event('snapshot', snapshot_payload(feed, dataset), feed.event_id()))
+        elif deltas:
+            writer.write(format_event('delta', delta_payload(feed, seq, merge_deltas(deltas)),
+                                      feed.event_id()))
+        seq, version = feed.seq, feed.version
+        await writer.drain()
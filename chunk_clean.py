@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Chunk-Parallel Column Cleaning
+Cleans one large sheet on a process pool by splitting its rows into chunks:
+
+  - the sheet's raw columns are published to the workers before the pool is
+    forked, so every worker reads them from shared (copy-on-write) pages and
+    only (start, stop) row ranges are sent with each task
+  - numeric results are written straight into a shared-memory float64 buffer
+    (plus a missing-value mask), so they are never pickled
+  - date and text results are Python objects and come back per chunk
+  - chunks are stitched back in row order and pandas' usual dtype inference is
+    applied to the whole column, so the result is identical to cleaning the
+    column with Series.apply
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 10000
+
+# (frame, [(column, cleaner, is_numeric)], {column: (values, missing)}), set
+# in the parent right before the pool forks
+_job = None
+
+
+def can_fork_pool():
+    """
+    Chunking relies on fork; forking from a non-main thread (e.g. a pipelined
+    cleaning worker) could deadlock, so those callers clean serially
+    """
+    return ('fork' in multiprocessing.get_all_start_methods()
+            and threading.current_thread() is threading.main_thread())
+
+
+def _clean_chunk(start, stop):
+    """
+    Worker: clean rows [start, stop) of every column; returns the object
+    results of the non-numeric columns
+    """
+    df, cleaners, numeric = _job
+    results = {}
+    for col, cleaner, is_numeric in cleaners:
+        chunk = df[col].iloc[start:stop].astype(object)
+        if is_numeric:
+            values, missing = numeric[col]
+            other = {}
+            for offset, value in enumerate(chunk):
+                cleaned = cleaner(value)
+                if cleaned is None:
+                    missing[start + offset] = 1
+                elif isinstance(cleaned, float):
+                    values[start + offset] = cleaned
+                else:
+                    other[start + offset] = cleaned
+            if other:
+                results[col] = other
+        else:
+            results[col] = [cleaner(value) for value in chunk]
+    return start, results
+
+
+def _infer(values, index):
+    """
+    Same dtype inference Series.apply performs on its mapped values
+    """
+    return pd.Series(values, index=index, dtype=object).apply(lambda value: value)
+
+
+def clean_columns_chunked(df, cleaners, workers, chunk_rows=DEFAULT_CHUNK_ROWS, numeric_cleaners=()):
+    """
+    Apply cleaners ([(column, function)]) to df's columns, chunk by chunk on a
+    process pool; functions listed in numeric_cleaners must return float or None
+    """
+    global _job
+
+    n = len(df)
+    plan = [(col, cleaner, cleaner in numeric_cleaners) for col, cleaner in cleaners]
+    numeric_cols = [col for col, _, is_numeric in plan if is_numeric]
+
+    # One block holds a float64 values array and a uint8 missing mask per numeric column
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(numeric_cols) * n * 9))
+    numeric = values = missing = None
+    try:
+        numeric = {}
+        for i, col in enumerate(numeric_cols):
+            offset = i * n * 9
+            values = np.ndarray((n,), dtype=np.float64, buffer=block.buf, offset=offset)
+            missing = np.ndarray((n,), dtype=np.uint8, buffer=block.buf, offset=offset + n * 8)
+            missing[:] = 0
+            numeric[col] = (values, missing)
+
+        _job = (df, plan, numeric)
+        ranges = [(start, min(start + chunk_rows, n)) for start in range(0, n, chunk_rows)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            chunks = dict(executor.map(_clean_chunk, *zip(*ranges)))
+
+        for col, _, is_numeric in plan:
+            if is_numeric:
+                values, missing = numeric[col]
+                column = values.astype(object)
+                column[missing.astype(bool)] = None
+                for chunk in chunks.values():
+                    for row, value in chunk.get(col, {}).items():
+                        column[row] = value
+            else:
+                column = np.empty(n, dtype=object)
+                for start, _ in ranges:
+                    part = chunks[start][col]
+                    column[start:start + len(part)] = part
+            df[col] = _infer(column, df.index)
+        return df
+    finally:
+        # Views into the block must be gone before it can be closed
+        _job = numeric = values = missing = None
+        block.close()
+        block.unlink()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Columnar Payload Export
+Turns the consolidated DataFrame into browser-ready column-major payloads:
+  - an Arrow IPC file (dictionary-encoded strings, date32 dates, float64 numbers)
+  - a column-major JSON file with the same encoding, for clients without Arrow
+
+JSON column encodings:
+  number      {"values": [...]}                     missing values are null
+  date        {"values": [...]}                     days since 1970-01-01, missing are null
+  dictionary  {"dictionary": [...], "codes": [...]} missing values have code -1
+  string      {"values": [...]}                     missing values are ""
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_AVAILABLE = pa is not None
+
+PAYLOAD_VERSION = 1
+
+DEFAULT_DATE_COLUMNS = [
+    'date_ts', 'date_tender', 'date_acceptance', 'date_award',
+    'pdc_agreement', 'revised_pdc', 'actual_completion_date'
+]
+
+# Columns with few distinct values that always get dictionary encoding
+DEFAULT_CATEGORICAL_COLUMNS = [
+    'source_sheet', 'budget_head', 'ftr_hq', 'shq', 'executive_agency',
+    'progress_status', 'aa_es_pending_with'
+]
+
+
+def classify_columns(df, date_columns=None, categorical_columns=None, max_dictionary_ratio=0.5):
+    """
+    Decide the encoding (date, number, dictionary or string) for each column
+    Text columns whose distinct-value ratio is below max_dictionary_ratio are
+    dictionary-encoded even when not listed in categorical_columns
+    """
+    date_columns = DEFAULT_DATE_COLUMNS if date_columns is None else date_columns
+    categorical_columns = DEFAULT_CATEGORICAL_COLUMNS if categorical_columns is None else categorical_columns
+
+    kinds = {}
+    for col in df.columns:
+        series = df[col]
+        non_null = series.dropna()
+        non_null = non_null[non_null != '']
+
+        if col in date_columns:
+            kinds[col] = 'date'
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            kinds[col] = 'number'
+        elif len(non_null) > 0 and pd.to_numeric(non_null, errors='coerce').notna().all():
+            kinds[col] = 'number'
+        elif col in categorical_columns:
+            kinds[col] = 'dictionary'
+        elif len(non_null) > 0 and non_null.astype(str).nunique() / len(non_null) <= max_dictionary_ratio:
+            kinds[col] = 'dictionary'
+        else:
+            kinds[col] = 'string'
+    return kinds
+
+
+def to_epoch_days(series):
+    """
+    Convert a column of dates to days since 1970-01-01 (float, NaN for missing)
+    """
+    dates = pd.to_datetime(series, errors='coerce')
+    days = dates.values.astype('datetime64[D]').astype('int64').astype('float64')
+    days[dates.isna().values] = np.nan
+    return days
+
+
+def to_numbers(series):
+    return pd.to_numeric(series.replace('', np.nan), errors='coerce').astype('float64').values
+
+
+def to_strings(series):
+    return series.where(series.notna(), '').astype(str).values
+
+
+def dictionary_encode(series):
+    """
+    Return (codes, dictionary) with code -1 for missing or empty values
+    """
+    present = (series.notna() & (series.astype(str) != '')).values
+    codes = np.full(len(series), -1, dtype='int32')
+    present_codes, uniques = pd.factorize(series[present].astype(str))
+    codes[present] = present_codes
+    return codes, [str(value) for value in uniques]
+
+
+def _nullable_list(values):
+    return [None if np.isnan(value) else (int(value) if value.is_integer() else float(value))
+            for value in values]
+
+
+def build_columnar_json(df, kinds):
+    """
+    Build the column-major JSON payload as a dict
+    """
+    columns = []
+    for col in df.columns:
+        kind = kinds[col]
+        entry = {'name': str(col), 'type': kind}
+
+        if kind == 'date':
+            entry['values'] = _nullable_list(to_epoch_days(df[col]))
+        elif kind == 'number':
+            entry['values'] = _nullable_list(to_numbers(df[col]))
+        elif kind == 'dictionary':
+            codes, dictionary = dictionary_encode(df[col])
+            entry['dictionary'] = dictionary
+            entry['codes'] = codes.tolist()
+        else:
+            entry['values'] = to_strings(df[col]).tolist()
+
+        columns.append(entry)
+
+    return {
+        'version': PAYLOAD_VERSION,
+        'row_count': len(df),
+        'date_epoch': '1970-01-01',
+        'columns': columns,
+    }
+
+
+def build_arrow_table(df, kinds):
+    """
+    Build a pyarrow Table with dictionary-encoded strings and date32 dates
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for the Arrow IPC payload")
+
+    arrays = []
+    for col in df.columns:
+        kind = kinds[col]
+
+        if kind == 'date':
+            days = to_epoch_days(df[col])
+            mask = np.isnan(days)
+            arrays.append(pa.array(np.where(mask, 0, days).astype('int32'), type=pa.date32(), mask=mask))
+        elif kind == 'number':
+            numbers = to_numbers(df[col])
+            arrays.append(pa.array(numbers, type=pa.float64(), mask=np.isnan(numbers)))
+        elif kind == 'dictionary':
+            codes, dictionary = dictionary_encode(df[col])
+            indices = pa.array(codes, type=pa.int32(), mask=codes < 0)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(dictionary, type=pa.string())))
+        else:
+            arrays.append(pa.array(to_strings(df[col]).tolist(), type=pa.string()))
+
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+
+
+def write_columnar_json(df, path, date_columns=None, categorical_columns=None):
+    """
+    Write the column-major JSON payload for df
+    """
+    kinds = classify_columns(df, date_columns, categorical_columns)
+    payload = build_columnar_json(df, kinds)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+def write_arrow_ipc(df, path, date_columns=None, categorical_columns=None):
+    """
+    Write df as an Arrow IPC file
+    """
+    kinds = classify_columns(df, date_columns, categorical_columns)
+    table = build_arrow_table(df, kinds)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Converter CLI
+Single entry point for every converter script. pandas, numpy, xlrd and the
+converter modules are imported only once a subcommand actually runs, so
+--help, --version, up-to-date checks (build manifest) and --dry-run start in
+well under 100 ms.
+
+Usage:
+  python convert_cli.py <command> [input] [options]
+  python convert_cli.py --help | --version
+  python convert_cli.py perfect - -o - [--format ndjson] < workbook.xlsx > rows.csv
+
+Pipe mode ('-' as the perfect input or output) always streams and skips the
+build manifest: there is no up-to-date check and no build is recorded, so every
+run converts and a later file-based run cannot be skipped on its account.
+
+Commands:
+  engineering     multi-sheet workbook -> consolidated CSV/XLSX/... (excel_to_csv_converter)
+  perfect         workbook -> CSV with the fixed dashboard columns (perfect_engineering_sheets_to_csv)
+  mergesheets     workbook -> consolidated XLSX + CSV (engineering_mergesheets)
+  merge-columns   workbook -> CSV with the dashboard column mapping (new_columns_csv_convert)
+  oops            operations workbook -> oops.csv (oops_excel_merge_to_csv)
+  current-year    CURRENT YEAR EXPENDITURE workbook -> CSV (currentyearexpenditure)
+  fix-csv         repair a mis-encoded or HTML current-year CSV (staticdashboard/fix_csv)
+  profiles        run several of the converters above on one workbook, parsed once (workbook_session)
+  batch           convert every workbook in a directory or glob in parallel (batch_convert)
+  status          show whether a converter's outputs are up to date (no conversion)
+"""
+
+import argparse
+import os
+import sys
+
+CLI_VERSION = '1.0.0'
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# reader_backends names, kept here so --help doesn't import pandas
+BACKEND_HELP = ('workbook reader (xlrd, openpyxl, calamine, lxml, html.parser, pandas-csv); '
+                'default: xlrd for .xls, openpyxl for .xlsx. calamine is only used when named')
+
+
+def manifest_check(target, input_file, primary_output, options, force):
+    """
+    Return True when the outputs are up to date (and the conversion can be skipped)
+    """
+    from build_manifest import check_up_to_date
+
+    if force:
+        return False
+    up_to_date, reason = check_up_to_date(target, input_file, [primary_output], options, exact_outputs=False)
+    if up_to_date:
+        print(f"✅ Outputs are up to date with {input_file} (use --force to rebuild)")
+    else:
+        print(f"   Rebuilding: {reason}")
+    return up_to_date
+
+
+def run_engineering(args):
+    root = os.path.splitext(args.input)[0]
+    output_csv = args.output or f"{root}_consolidated.csv"
+    output_excel = args.excel or f"{os.path.splitext(output_csv)[0]}.xlsx"
+    formats = [fmt.strip().lower() for fmt in args.formats.split(',')] if args.formats else None
+    options = {'formats': formats or 'default'}
+    if args.backend:
+        options['backend'] = args.backend
+
+    if args.dry_run:
+        return plan('excel_to_csv_converter', args.input, [output_csv, output_excel], options)
+    if manifest_check('excel_to_csv_converter', args.input, output_csv, options, args.force):
+        return 0
+
+    from excel_to_csv_converter import ExcelProcessor, SUPPORTED_FORMATS
+    from build_manifest import record_build
+
+    unknown = [fmt for fmt in formats or [] if fmt not in SUPPORTED_FORMATS]
+    if unknown:
+        print(f"❌ Error: Unsupported output format(s): {', '.join(unknown)}")
+        return 1
+
+    processor = ExcelProcessor(args.input, output_csv, output_excel, formats,
+                               precompress=args.precompress, cache_dir=args.cache,
+                               checkpoints=args.checkpoints, resume=args.resume,
+                               pipelined=args.pipelined, clean_workers=args.clean_workers,
+                               chunk_workers=args.chunk_workers, backend=args.backend)
+    if not processor.process():
+        return 1
+    record_build('excel_to_csv_converter', args.input, list(processor.get_output_paths().values()), options)
+    return 0
+
+
+def run_perfect(args):
+    output_csv = args.output or 'engineering_consolidated.csv'
+    # Pipe mode ('-' for stdin/stdout) always streams and skips the build manifest:
+    # stdin has no path, size or mtime to record and stdout no output to check
+    pipe = '-' in (args.input, output_csv)
+    options = {'stream': True} if args.stream else {}
+    if args.dry_run:
+        return plan(None if pipe else 'perfect_engineering_sheets_to_csv', args.input, [output_csv], options)
+    if not pipe and manifest_check('perfect_engineering_sheets_to_csv', args.input, output_csv, options, args.force):
+        return 0
+
+    if args.stream or pipe:
+        from streaming_convert import stream_convert, print_stats, exit_on_broken_pipe
+        from build_manifest import record_build
+
+        try:
+            stats = stream_convert(args.input, output_csv, args.format, args.batch_rows)
+        except BrokenPipeError:
+            exit_on_broken_pipe()
+        print_stats(stats, output_csv)
+        if not stats['rows']:
+            return 1
+        if args.precompress and not pipe:
+            from precompress import publish_precompressed
+            publish_precompressed([output_csv])
+        if not pipe:
+            record_build('perfect_engineering_sheets_to_csv', args.input, [output_csv], options)
+        return 0
+
+    # The module's later (CSV) definitions of these functions are the ones bound on import
+    from perfect_engineering_sheets_to_csv import process_excel_file, analyze_consolidated_data
+    from build_manifest import record_build
+
+    consolidated_data = process_excel_file(args.input, output_csv, resume=args.resume,
+                                           precompress=args.precompress)
+    if consolidated_data is None:
+        return 1
+    analyze_consolidated_data(consolidated_data)
+    record_build('perfect_engineering_sheets_to_csv', args.input, [output_csv])
+    return 0
+
+
+def run_mergesheets(args):
+    output_excel = args.output or 'engineering.xlsx'
+    output_csv = f"{os.path.splitext(output_excel)[0]}.csv"
+    if args.dry_run:
+        return plan(None, args.input, [output_excel, output_csv], {})
+
+    from engineering_mergesheets import process_excel_file, analyze_consolidated_data
+
+    consolidated_data = process_excel_file(args.input, output_excel, backend=args.backend)
+    if consolidated_data is None:
+        return 1
+    analyze_consolidated_data(consolidated_data)
+    consolidated_data.to_csv(output_csv, index=False)
+    print(f"\nAlso saved as CSV: {output_csv}")
+    if args.precompress:
+        from precompress import publish_precompressed
+        publish_precompressed([output_csv])
+    return 0
+
+
+def run_merge_columns(args):
+    output_csv = args.output or 'engineering_merged.csv'
+    if args.dry_run:
+        return plan(None, args.input, [output_csv], {})
+
+    from new_columns_csv_convert import merge_excel_to_csv, simple_merge
+
+    merged_data = (simple_merge if args.simple else merge_excel_to_csv)(args.input, output_csv)
+    return 0 if merged_data is not None else 1
+
+
+def run_oops(args):
+    input_file = args.input
+    if input_file is None:
+        input_file = 'oops.xlsx' if os.path.exists('oops.xlsx') else 'oops.xls'
+    output_csv = args.output or 'oops.csv'
+    if args.dry_run:
+        return plan(None, input_file, [output_csv], {})
+
+    from oops_excel_merge_to_csv import process_excel_to_csv
+
+    process_excel_to_csv(input_file, output_csv)
+    return 0
+
+
+def run_current_year(args):
+    input_file = args.input or 'CURRENT YEAR EXPENDITURE.xlsx'
+    output_csv = args.output or 'CURRENT_YEAR_EXPENDITURE.csv'
+    if args.dry_run:
+        return plan(None, input_file, [output_csv], {})
+
+    from currentyearexpenditure import convert_current_year_expenditure
+
+    convert_current_year_expenditure(input_file, output_csv)
+    return 0
+
+
+def run_fix_csv(args):
+    input_file = args.input or 'public/enggcurrentyear.csv'
+    output_csv = args.output or 'public/enggcurrentyear_fixed.csv'
+    if args.dry_run:
+        return plan(None, input_file, [output_csv], {})
+
+    sys.path.insert(0, os.path.join(REPO_DIR, 'staticdashboard'))
+    from fix_csv import fix_engineering_csv
+
+    return 0 if fix_engineering_csv(input_file, output_csv) else 1
+
+
+def run_profiles(args):
+    from workbook_session import PROFILES, DEFAULT_PROFILES
+
+    profiles = [name.strip() for name in args.profiles.split(',')] if args.profiles else DEFAULT_PROFILES
+    unknown = [name for name in profiles if name not in PROFILES]
+    if unknown:
+        print(f"❌ Error: Unknown profile(s): {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+        return 2
+    if args.dry_run:
+        print(f"Input:    {args.input} ({'found' if os.path.exists(args.input) else 'missing'})")
+        print(f"Profiles: {', '.join(profiles)} -> {args.output_dir}")
+        return 0
+
+    from workbook_session import run_profiles as run_session_profiles
+
+    timings = run_session_profiles(args.input, profiles, args.output_dir)
+    return 1 if None in timings.values() else 0
+
+
+def run_batch(args):
+    from batch_convert import collect_workbooks
+
+    workbooks = collect_workbooks(args.inputs)
+    if not workbooks:
+        print(f"❌ Error: No workbooks found in: {', '.join(args.inputs)}")
+        return 1
+    if args.dry_run:
+        from batch_convert import plan_jobs
+        for _, group in plan_jobs(workbooks):
+            for converter, path in group:
+                print(f"{converter:12s} {path}")
+        return 0
+
+    from batch_convert import run_batch as convert_batch
+
+    results = convert_batch(workbooks, args.workers, args.verbose)
+    return 1 if any(result['error'] is not None for result in results) else 0
+
+
+def run_status(args):
+    from build_manifest import TARGETS, check_up_to_date
+
+    target = args.converter
+    if target not in TARGETS:
+        print(f"❌ Error: No build manifest support for '{target}' (choose from {', '.join(TARGETS)})")
+        return 2
+    formats = [fmt.strip().lower() for fmt in args.formats.split(',')] if args.formats else None
+    options = {'formats': formats or 'default'} if target == 'excel_to_csv_converter' else {}
+
+    up_to_date, reason = check_up_to_date(target, args.input, [args.output], options, exact_outputs=False)
+    print(reason)
+    return 0 if up_to_date else 1
+
+
+def plan(target, input_file, outputs, options):
+    """
+    --dry-run: report what would be done without importing any converter
+    """
+    if input_file == '-':
+        print("Input:   - (stdin)")
+    else:
+        print(f"Input:   {input_file} ({'found' if input_file and os.path.exists(input_file) else 'missing'})")
+    for output in outputs:
+        print(f"Output:  {output}")
+    if target is not None:
+        from build_manifest import check_up_to_date
+        up_to_date, reason = check_up_to_date(target, input_file, outputs[:1], options, exact_outputs=False)
+        print(f"Status:  {'up to date - would skip' if up_to_date else 'would rebuild (' + reason + ')'}")
+    else:
+        print("Status:  would convert (no build manifest for this converter)")
+    return 0
+
+
+def print_version():
+    from build_manifest import TARGETS, converter_version
+
+    print(f"convert_cli {CLI_VERSION}")
+    for target in TARGETS:
+        print(f"  {target}: {converter_version(target)}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='convert_cli.py',
+        description='Excel workbook converters for the BSF engineering dashboard.',
+    )
+    parser.add_argument('--version', action='store_true', help='show the CLI and converter versions')
+    commands = parser.add_subparsers(dest='command', metavar='<command>')
+
+    def add(name, handler, help_text, input_required=False):
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument('input', nargs=None if input_required else '?', help='input file')
+        command.add_argument('-o', '--output', help='output file')
+        command.add_argument('--dry-run', action='store_true', help='show what would be done and exit')
+        command.set_defaults(handler=handler)
+        return command
+
+    command = add('engineering', run_engineering, 'multi-sheet workbook -> consolidated outputs',
+                  input_required=True)
+    command.add_argument('--excel', help='consolidated XLSX path')
+    command.add_argument('--formats',
+                         help='comma-separated output formats (default: csv,xlsx; also columnar_json, arrow, '
+                              'sqlite, parquet, json, ...)')
+    command.add_argument('--force', action='store_true', help='rebuild even if outputs are up to date')
+    command.add_argument('--precompress', action='store_true',
+                         help='also write .gz/.br copies and etags.json for static serving')
+    command.add_argument('--checkpoints', action='store_true',
+                         help='checkpoint finished sheets so an interrupted run can --resume')
+    command.add_argument('--pipelined', action='store_true', help='decode sheets on a reader thread while cleaning')
+    command.add_argument('--clean-workers', type=int, default=1, help='cleaning threads in --pipelined mode')
+    command.add_argument('--chunk-workers', type=int, default=1,
+                         help='clean very large sheets in row chunks on N processes')
+    command.add_argument('--cache', metavar='DIR', help='run the staged pipeline, memoizing stage outputs in DIR')
+    command.add_argument('--resume', action='store_true', help='continue an interrupted run from its sheet checkpoints')
+    command.add_argument('--backend', metavar='NAME', help=BACKEND_HELP)
+
+    command = add('perfect', run_perfect, 'workbook -> CSV with the fixed dashboard columns',
+                  input_required=True)
+    command.add_argument('--force', action='store_true',
+                         help="rebuild even if outputs are up to date (pipe mode, '-', never checks)")
+    command.add_argument('--resume', action='store_true', help='continue an interrupted run from its sheet checkpoints')
+    command.add_argument('--stream', action='store_true',
+                         help="convert in row batches with bounded memory (implied when input or output is '-'; "
+                              "pipe mode skips the build manifest)")
+    command.add_argument('--format', choices=['csv', 'ndjson'],
+                         help='--stream output format (default: from the output extension, else csv)')
+    command.add_argument('--batch-rows', type=int, default=500, help='rows per batch in --stream mode')
+    command.add_argument('--precompress', action='store_true',
+                         help='also write .gz/.br copies and etags.json for the CSV (not with -o -)')
+
+    command = add('mergesheets', run_mergesheets, 'workbook -> consolidated XLSX + CSV', input_required=True)
+    command.add_argument('--precompress', action='store_true',
+                         help='also write .gz/.br copies and etags.json for the CSV')
+    command.add_argument('--backend', metavar='NAME', help=BACKEND_HELP)
+
+    command = add('merge-columns', run_merge_columns, 'workbook -> CSV with the dashboard column mapping',
+                  input_required=True)
+    command.add_argument('--simple', action='store_true', help='keep the original Excel column names')
+
+    add('oops', run_oops, 'operations workbook -> oops.csv')
+    add('current-year', run_current_year, 'CURRENT YEAR EXPENDITURE workbook -> CSV')
+    add('fix-csv', run_fix_csv, 'repair a mis-encoded or HTML current-year CSV')
+
+    command = commands.add_parser('profiles', help='run several converters on one workbook, parsed once',
+                                  description='run several converters on one workbook, parsed once')
+    command.add_argument('input', help='input workbook')
+    command.add_argument('--profiles',
+                         help='comma-separated converters: perfect, merge-columns, simple-merge, mergesheets, '
+                              'oops, engineering (default: merge-columns,simple-merge)')
+    command.add_argument('--output-dir', default='.', help='directory for every profile\'s outputs')
+    command.add_argument('--dry-run', action='store_true', help='show what would be done and exit')
+    command.set_defaults(handler=run_profiles)
+
+    command = commands.add_parser('batch', help='convert every workbook in a directory or glob in parallel',
+                                  description='convert every workbook in a directory or glob in parallel')
+    command.add_argument('inputs', nargs='+', help='directories or glob patterns')
+    command.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    command.add_argument('--verbose', action='store_true', help="show each converter's output")
+    command.add_argument('--dry-run', action='store_true', help='list the workbooks in schedule order and exit')
+    command.set_defaults(handler=run_batch)
+
+    command = commands.add_parser('status', help='check whether outputs are up to date',
+                                  description='check whether outputs are up to date')
+    command.add_argument('converter', help='excel_to_csv_converter or perfect_engineering_sheets_to_csv')
+    command.add_argument('input', help='input workbook')
+    command.add_argument('output', help='primary output file')
+    command.add_argument('--formats', help='formats the output was built with (engineering only)')
+    command.set_defaults(handler=run_status)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.version:
+        print_version()
+        return 0
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    input_file = getattr(args, 'input', None)
+    if input_file == '-' and args.command != 'perfect':
+        print(f"❌ Error: Reading from stdin is only supported by: perfect")
+        return 1
+    if (input_file and input_file != '-' and not getattr(args, 'dry_run', False)
+            and not os.path.exists(input_file)):
+        print(f"❌ Error: Input file not found: {input_file}")
+        return 1
+
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,16 @@
 import pandas as pd
 
-# Read the Excel file
-df = pd.read_excel('CURRENT YEAR EXPENDITURE.xlsx')
 
-# Save as CSV
-df.to_csv('CURRENT_YEAR_EXPENDITURE.csv', index=False)
+def convert_current_year_expenditure(input_file='CURRENT YEAR EXPENDITURE.xlsx',
+                                     output_file='CURRENT_YEAR_EXPENDITURE.csv'):
+    # Read the Excel file
+    df = pd.read_excel(input_file)
 
-print("Conversion complete!")
\ No newline at end of file
+    # Save as CSV
+    df.to_csv(output_file, index=False)
+
+    print("Conversion complete!")
+
+
+if __name__ == "__main__":
+    convert_current_year_expenditure()
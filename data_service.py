@@ -0,0 +1,708 @@
+#!/usr/bin/env python3
+"""
+Asyncio Data Service
+Read-only HTTP service for the dashboard CSV databases that can run in place of
+staticdashboard/public/server.js for read traffic.
+
+  - each database CSV is parsed once and kept in memory
+  - stats are pre-aggregated at load time; grouped totals are computed once per column
+  - malformed requests (bad Content-Length, truncated body) get a 400
+  - responses carry ETags (If-None-Match -> 304), are gzip-compressed when accepted,
+    and connections are kept alive
+  - query results are memoized in an LRU cache, bounded by the total size of the
+    cached bodies, that is dropped whenever a newly published CSV is detected
+    (file size/mtime change)
+  - CSVs are parsed and diffed in a worker thread and swapped in when ready, so
+    requests keep being served from the previous version during a reload
+
+Endpoints (same paths and response shapes as server.js):
+  GET /api/health
+  GET /api/csv/<database>/rows?page=&limit=&search=&sortBy=&sortOrder=&all=
+  GET /api/csv/<database>/rows/<index>
+  GET /api/csv/<database>/row/<id>
+  GET /api/stats/<database>
+  GET /api/stats/<database>/by/<column>
+  GET /api/changes/<database>           Server-Sent Events of row deltas (see change_stream.py)
+
+Usage: python data_service.py [data_dir] [port]
+"""
+
+import asyncio
+import csv
+import gzip
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from change_stream import ChangeFeed, diff_rows, index_rows, stream_changes
+
+DEFAULT_DATA_DIR = os.path.join('staticdashboard', 'public', 'data')
+DEFAULT_PORT = 3457
+
+# Total JSON body bytes kept in the response cache (?all=true bodies are the
+# whole database); gzip variants are smaller and come on top
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+MAX_REQUEST_BODY = 1024 * 1024
+GZIP_MIN_BYTES = 1024
+RELOAD_CHECK_SECONDS = 1.0
+KEEP_ALIVE_SECONDS = 15
+
+# Mirrors databaseConfigs in server.js (read-side fields only)
+DATABASE_CONFIGS = {
+    'engineering': {
+        'displayName': 'Engineering Database',
+        'fileName': 'engineering.csv',
+        'idField': 's_no',
+        'financial': [
+            ('totalSanctioned', 'sd_amount_lakh', 'sum'),
+            ('totalExpenditure', 'expenditure_total', 'sum'),
+            ('avgProgress', 'physical_progress_percent', 'avg'),
+        ],
+    },
+    'operations': {
+        'displayName': 'Operations Database',
+        'fileName': 'operations.csv',
+        'idField': 'S_No',
+        'financial': [
+            ('totalLength', 'LENGTH_KM', 'sum'),
+            ('totalAmount', 'SANCTIONED_AMOUNT_CR', 'sum'),
+            ('avgCompletion', 'COMPLETED_PERCENTAGE', 'avg'),
+        ],
+    },
+    'enggcurrentyear': {
+        'displayName': 'Engineering Current Year',
+        'fileName': 'enggcurrentyear.csv',
+        'idField': 'S/No.',
+        'financial': [
+            ('totalAllotment', 'Allotment', 'sum'),
+            ('totalExpenditure', 'Total Expdr', 'sum'),
+            ('balanceFund', 'Balance fund', 'sum'),
+        ],
+    },
+}
+
+_JS_FLOAT_RE = re.compile(r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)')
+
+
+def parse_float_js(value):
+    """
+    Behave like JavaScript's parseFloat(value) || 0
+    """
+    match = _JS_FLOAT_RE.match(str(value or ''))
+    return float(match.group(1)) if match else 0.0
+
+
+def needs_id_regeneration(row_id):
+    """
+    Same rule as needsIdRegeneration in server.js
+    """
+    if not row_id:
+        return True
+    row_id = str(row_id)
+    if row_id.isdigit():
+        return True
+    try:
+        number = float(row_id)
+        return number.is_integer() and number < 10000
+    except ValueError:
+        return False
+
+
+def get_config(database):
+    config = DATABASE_CONFIGS.get(database)
+    if config is not None:
+        return config
+    return {
+        'displayName': 'Custom Database',
+        'fileName': f'{database}.csv',
+        'idField': 'id',
+        'financial': [],
+    }
+
+
+class Dataset:
+    """One CSV database held in memory with its pre-aggregated stats"""
+
+    def __init__(self, database, path):
+        self.database = database
+        self.path = path
+        self.config = get_config(database)
+        self.signature = None
+        self.version = None
+        self.rows = []
+        self.columns = []
+        self.search_text = []
+        self.id_index = {}
+        self.stats = None
+        self.group_totals = {}
+        self.row_index = {}
+        self.last_check = 0.0
+        self.pending_signature = None
+
+    @classmethod
+    def loaded(cls, database, path):
+        dataset = cls(database, path)
+        dataset.load()
+        return dataset
+
+    def file_signature(self):
+        stat = os.stat(self.path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def load(self):
+        """
+        Parse the CSV once and precompute everything requests need
+        """
+        with open(self.path, 'rb') as f:
+            content = f.read()
+
+        text = content.decode('utf-8-sig', errors='replace')
+        reader = csv.reader(io.StringIO(text, newline=''))
+        header = next(reader, [])
+        self.columns = [col.strip() for col in header]
+
+        rows = []
+        for record in reader:
+            if not any(cell.strip() for cell in record):
+                continue
+            record = record + [''] * (len(self.columns) - len(record))
+            rows.append({col: cell.strip() for col, cell in zip(self.columns, record)})
+        self.rows = rows
+
+        # Lower-cased row text for the substring search used by the dashboard
+        self.search_text = ['\x1f'.join(row.values()).lower() for row in rows]
+
+        id_field = self.config['idField']
+        self.id_index = {}
+        for idx, row in enumerate(rows):
+            self.id_index.setdefault(str(row.get(id_field, '')), idx)
+
+        # Row keys and hashes for the change stream
+        self.row_index = index_rows(rows, id_field)
+
+        self.stats = self.build_stats()
+        self.group_totals = {}
+        self.version = hashlib.sha256(content).hexdigest()[:16]
+        self.signature = self.file_signature()
+        self.last_check = time.monotonic()
+
+    def build_stats(self):
+        id_field = self.config['idField']
+        stats = {
+            'totalRecords': len(self.rows),
+            'columns': self.columns,
+            'idField': id_field,
+            'config': public_config(self.config),
+            'idsNeedingRegeneration': sum(
+                1 for row in self.rows if needs_id_regeneration(row.get(id_field))
+            ),
+            'comparisonColumns': [],
+        }
+
+        if self.config['financial']:
+            financial = {}
+            for name, column, how in self.config['financial']:
+                total = sum(parse_float_js(row.get(column)) for row in self.rows)
+                if how == 'avg':
+                    total = total / len(self.rows) if self.rows else 0
+                financial[name] = total
+            stats['financial'] = financial
+
+        return stats
+
+    def grouped_totals(self, column):
+        """
+        Row counts and financial sums grouped by column (computed once per column)
+        """
+        if column not in self.group_totals:
+            sum_columns = [col for _, col, how in self.config['financial'] if how == 'sum']
+            groups = OrderedDict()
+            for row in self.rows:
+                key = row.get(column, '')
+                group = groups.setdefault(key, {column: key, 'rows': 0, **{col: 0.0 for col in sum_columns}})
+                group['rows'] += 1
+                for col in sum_columns:
+                    group[col] += parse_float_js(row.get(col))
+            for group in groups.values():
+                for col in sum_columns:
+                    group[col] = round(group[col], 2)
+            self.group_totals[column] = sorted(groups.values(), key=lambda g: g[column])
+        return self.group_totals[column]
+
+    def has_new_version(self):
+        """
+        True once a new version of the CSV has been published (and is complete)
+        """
+        now = time.monotonic()
+        if self.signature is not None and now - self.last_check < RELOAD_CHECK_SECONDS:
+            return False
+        self.last_check = now
+
+        try:
+            signature = self.file_signature()
+        except OSError:
+            return False
+        if signature == self.signature:
+            self.pending_signature = None
+            return False
+
+        # Wait until the file has stopped changing for one check interval so a
+        # CSV that is still being written is never loaded half-way
+        if signature != self.pending_signature:
+            self.pending_signature = signature
+            return False
+
+        self.pending_signature = None
+        return True
+
+
+def public_config(config):
+    return {key: value for key, value in config.items() if key != 'financial'}
+
+
+class LRUCache:
+    """LRU cache for encoded responses, bounded by total body bytes"""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, value):
+        # A body larger than the whole cache would only evict everything else
+        if len(value.body) > self.max_bytes:
+            return
+        self.remove(key)
+        self.entries[key] = value
+        self.bytes += len(value.body)
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted.body)
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(entry.body)
+
+    def invalidate(self, database):
+        for key in [key for key in self.entries if key[0] == database]:
+            self.remove(key)
+
+
+class CachedResponse:
+    """Encoded JSON body with its ETag and a lazily built gzip variant"""
+
+    def __init__(self, status, payload, etag):
+        self.status = status
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.etag = etag
+        self._gzipped = None
+
+    @property
+    def gzip_etag(self):
+        # The gzip bytes differ from the identity body, so they get their own strong ETag
+        return self.etag[:-1] + '-gzip"' if self.etag else None
+
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=6)
+        return self._gzipped
+
+
+class DataService:
+    """Routes requests to the in-memory datasets"""
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, cache_bytes=CACHE_MAX_BYTES):
+        self.data_dir = data_dir
+        self.datasets = {}
+        self.cache = LRUCache(cache_bytes)
+        self.feeds = {}
+        self.loading = {}      # database -> Future of its first load
+        self.reloading = set()
+        self.started = time.time()
+        self.requests = 0
+
+    async def get_dataset(self, database):
+        """
+        The loaded dataset, parsing its CSV in a worker thread on first use
+        Newer versions of a loaded CSV are picked up by watch()
+        """
+        if not re.match(r'^[\w-]+$', database):
+            return None
+
+        dataset = self.datasets.get(database)
+        if dataset is not None:
+            return dataset
+
+        path = os.path.join(self.data_dir, get_config(database)['fileName'])
+        if not os.path.exists(path):
+            return None
+
+        # Concurrent first requests share one load
+        loading = self.loading.get(database)
+        if loading is None:
+            loading = asyncio.get_running_loop().run_in_executor(None, Dataset.loaded, database, path)
+            self.loading[database] = loading
+            try:
+                dataset = await loading
+            finally:
+                del self.loading[database]
+            self.datasets[database] = dataset
+            self.feeds[database] = ChangeFeed()
+            self.feeds[database].reset(dataset.version)
+            return dataset
+        return await asyncio.shield(loading)
+
+    @staticmethod
+    def reload(dataset):
+        """
+        Parse the new CSV into a fresh Dataset and diff its rows against the
+        current one (runs in a worker thread; dataset is only read)
+        """
+        fresh = Dataset.loaded(dataset.database, dataset.path)
+        # A column change cannot be expressed as row deltas
+        delta = diff_rows(dataset.row_index, fresh.row_index) if fresh.columns == dataset.columns else None
+        return fresh, delta
+
+    async def refresh_dataset(self, dataset):
+        """
+        Reload a dataset whose CSV changed off the event loop, then swap it
+        in, drop its cached responses and publish the row deltas to
+        change-stream subscribers
+        """
+        database = dataset.database
+        if database in self.reloading or not dataset.has_new_version():
+            return False
+
+        self.reloading.add(database)
+        try:
+            fresh, delta = await asyncio.get_running_loop().run_in_executor(None, self.reload, dataset)
+        finally:
+            self.reloading.discard(database)
+
+        self.datasets[database] = fresh
+        self.cache.invalidate(database)
+        if fresh.version != dataset.version:
+            self.feeds[database].publish(fresh.version, delta)
+        return True
+
+    async def watch(self):
+        """
+        Check loaded datasets for newly published files so change-stream
+        subscribers are notified without waiting for a request
+        """
+        while True:
+            await asyncio.sleep(RELOAD_CHECK_SECONDS)
+            for dataset in list(self.datasets.values()):
+                try:
+                    await self.refresh_dataset(dataset)
+                except Exception as e:
+                    print(f"❌ Error reloading {dataset.path}: {e}")
+
+    async def handle(self, path, query):
+        """
+        Return a CachedResponse for a GET request
+        """
+        self.requests += 1
+        parts = [unquote(part) for part in path.strip('/').split('/')]
+
+        if parts == ['api', 'health']:
+            return CachedResponse(200, {
+                'status': 'healthy',
+                'uptime': time.time() - self.started,
+                'requests': self.requests,
+                'cache': {'entries': len(self.cache.entries), 'bytes': self.cache.bytes,
+                          'hits': self.cache.hits, 'misses': self.cache.misses},
+                'databases': {name: ds.version for name, ds in self.datasets.items()},
+                'changeFeeds': {name: feed.stats() for name, feed in self.feeds.items()},
+            }, None)
+
+        if len(parts) < 3 or parts[0] != 'api' or parts[1] not in ('csv', 'stats'):
+            return CachedResponse(404, {'error': 'Not found'}, None)
+
+        database = parts[2]
+        dataset = await self.get_dataset(database)
+        if dataset is None:
+            return CachedResponse(404, {'error': f"Database '{database}' not found"}, None)
+
+        query_key = tuple(sorted((key, tuple(values)) for key, values in query.items()))
+        cache_key = (database, tuple(parts), query_key)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        status, payload = self.route(dataset, parts, query)
+        digest = hashlib.sha1(repr((parts, query_key)).encode('utf-8')).hexdigest()[:12]
+        response = CachedResponse(status, payload, f'"{dataset.version}-{digest}"')
+        self.cache.put(cache_key, response)
+        return response
+
+    def route(self, dataset, parts, query):
+        if parts[1] == 'stats':
+            if len(parts) == 3:
+                return 200, dataset.stats
+            if len(parts) == 5 and parts[3] == 'by':
+                column = parts[4]
+                if column not in dataset.columns:
+                    return 404, {'error': f"Column '{column}' not found"}
+                return 200, {'groupBy': column, 'groups': dataset.grouped_totals(column)}
+            return 404, {'error': 'Not found'}
+
+        if len(parts) == 4 and parts[3] == 'rows':
+            return 200, self.rows_page(dataset, query)
+
+        if len(parts) == 5 and parts[3] == 'rows':
+            try:
+                index = int(parts[4])
+            except ValueError:
+                return 404, {'error': 'Row not found'}
+            if 0 <= index < len(dataset.rows):
+                return 200, {'row': dataset.rows[index]}
+            return 404, {'error': 'Row not found'}
+
+        if len(parts) == 5 and parts[3] == 'row':
+            index = dataset.id_index.get(parts[4])
+            if index is None:
+                return 404, {'error': f"Row with ID '{parts[4]}' not found"}
+            return 200, {'row': dataset.rows[index]}
+
+        return 404, {'error': 'Not found'}
+
+    def rows_page(self, dataset, query):
+        """
+        Same filtering, sorting and paging rules as GET /api/csv/:database/rows
+        """
+        def param(name, default=''):
+            values = query.get(name)
+            return values[0] if values else default
+
+        search = param('search').lower()
+        sort_by = param('sortBy')
+        sort_order = param('sortOrder', 'asc')
+        show_all = param('all', 'false') == 'true'
+        limit = param('limit')
+
+        if search:
+            indices = [idx for idx, text in enumerate(dataset.search_text) if search in text]
+        else:
+            indices = list(range(len(dataset.rows)))
+
+        if sort_by and sort_by in dataset.columns:
+            indices.sort(key=lambda idx: dataset.rows[idx].get(sort_by, ''),
+                         reverse=(sort_order != 'asc'))
+
+        try:
+            page = max(int(param('page', '1')), 1)
+        except ValueError:
+            page = 1
+        try:
+            page_limit = int(limit) if limit else len(indices)
+        except ValueError:
+            page_limit = len(indices)
+
+        # Total is the count of all matches, not just this page
+        matched = len(indices)
+        all_rows = show_all or not limit
+        if not all_rows:
+            start = (page - 1) * page_limit
+            indices = indices[start:start + page_limit] if page_limit > 0 else []
+        rows = [dataset.rows[idx] for idx in indices]
+
+        return {
+            'rows': rows,
+            'total': matched,
+            'count': matched,
+            'page': page,
+            'limit': page_limit,
+            'totalPages': math.ceil(matched / page_limit) if page_limit else 0,
+            'columns': dataset.columns,
+            'idField': dataset.config['idField'],
+            'config': public_config(dataset.config),
+            'idsUpdated': False,
+            'allRows': all_rows,
+        }
+
+
+class BadRequest(Exception):
+    """Request that cannot be read; answered with a 400 and the connection closed"""
+
+
+async def read_request(reader):
+    """
+    Read one HTTP/1.1 request head; returns (method, target, version, headers) or None
+    when the client went away. Raises BadRequest for a malformed request
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=KEEP_ALIVE_SECONDS)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError,
+            ConnectionError):
+        return None
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ', 2)
+    except ValueError:
+        return None
+
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    # Discard any request body (read-only service)
+    try:
+        length = int(headers.get('content-length', '0') or 0)
+    except ValueError:
+        raise BadRequest('Invalid Content-Length')
+    if length < 0 or length > MAX_REQUEST_BODY:
+        raise BadRequest('Invalid Content-Length')
+    if length:
+        try:
+            await asyncio.wait_for(reader.readexactly(length), timeout=KEEP_ALIVE_SECONDS)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            raise BadRequest('Incomplete request body')
+
+    return method.upper(), target, version, headers
+
+
+def build_response(status, body, headers, keep_alive):
+    reasons = {200: 'OK', 204: 'No Content', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error'}
+    head = [f"HTTP/1.1 {status} {reasons.get(status, 'OK')}"]
+    headers = dict(headers)
+    headers['Content-Length'] = str(len(body))
+    headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+    if keep_alive:
+        headers['Keep-Alive'] = f'timeout={KEEP_ALIVE_SECONDS}'
+    headers['Access-Control-Allow-Origin'] = '*'
+    head.extend(f"{name}: {value}" for name, value in headers.items())
+    return ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except BadRequest as e:
+                body = json.dumps({'error': str(e)}).encode('utf-8')
+                writer.write(build_response(400, body, {'Content-Type': 'application/json'}, False))
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, target, version, headers = request
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            if method == 'OPTIONS':
+                writer.write(build_response(204, b'', {
+                    'Access-Control-Allow-Methods': 'GET, HEAD, OPTIONS',
+                    'Access-Control-Allow-Headers': headers.get('access-control-request-headers', '*'),
+                }, keep_alive))
+            elif method not in ('GET', 'HEAD'):
+                body = json.dumps({'error': 'This service is read-only'}).encode('utf-8')
+                writer.write(build_response(405, body, {'Content-Type': 'application/json',
+                                                        'Allow': 'GET, HEAD, OPTIONS'}, keep_alive))
+            elif method == 'GET' and target.startswith('/api/changes/'):
+                url = urlsplit(target)
+                database = unquote(url.path.strip('/').split('/')[2])
+                dataset = await service.get_dataset(database)
+                if dataset is None:
+                    body = json.dumps({'error': f"Database '{database}' not found"}).encode('utf-8')
+                    writer.write(build_response(404, body, {'Content-Type': 'application/json'}, keep_alive))
+                else:
+                    since = parse_qs(url.query).get('since', [None])[0]
+                    await stream_changes(service.feeds[database], lambda: service.datasets[database],
+                                         writer, headers.get('last-event-id') or since)
+                    break
+            else:
+                url = urlsplit(target)
+                try:
+                    response = await service.handle(url.path, parse_qs(url.query))
+                except Exception as e:
+                    response = CachedResponse(500, {'error': 'Internal server error', 'message': str(e)}, None)
+
+                response_headers = {'Content-Type': 'application/json; charset=utf-8', 'Vary': 'Accept-Encoding'}
+                use_gzip = 'gzip' in headers.get('accept-encoding', '') and len(response.body) >= GZIP_MIN_BYTES
+                etag = response.gzip_etag if use_gzip else response.etag
+                if etag:
+                    response_headers['ETag'] = etag
+                    response_headers['Cache-Control'] = 'no-cache'
+
+                if etag and headers.get('if-none-match') == etag:
+                    writer.write(build_response(304, b'', response_headers, keep_alive))
+                else:
+                    body = response.body
+                    if use_gzip:
+                        body = response.gzipped()
+                        response_headers['Content-Encoding'] = 'gzip'
+                    response_bytes = build_response(response.status, body, response_headers, keep_alive)
+                    if method == 'HEAD':
+                        # Same headers (including Content-Length), no body
+                        response_bytes = response_bytes[:len(response_bytes) - len(body)]
+                    writer.write(response_bytes)
+
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(data_dir=DEFAULT_DATA_DIR, port=DEFAULT_PORT, host='0.0.0.0'):
+    service = DataService(data_dir)
+
+    # Warm the known databases so the first request does not pay for parsing
+    for database in DATABASE_CONFIGS:
+        await service.get_dataset(database)
+
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), host, port
+    )
+    print(f"Data service running on http://localhost:{port}")
+    print(f"Data directory: {data_dir}")
+    print(f"Loaded databases: {', '.join(service.datasets) or 'none'}")
+
+    watcher = asyncio.create_task(service.watch())
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main():
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_DIR
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+
+    try:
+        asyncio.run(serve(data_dir, port))
+    except KeyboardInterrupt:
+        print("\nData service stopped")
+
+
+if __name__ == "__main__":
+    main()
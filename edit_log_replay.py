@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Edit Log Replay & Compaction
+Treats a base CSV snapshot plus the dashboard's edit log (public/edit_logs.json)
+as an event-sourced store.
+
+  base     record a CSV as the snapshot the log's edits apply to: every edit
+           already logged counts as part of it (and is archived)
+  replay   rebuild the current table from the snapshot and the logged edits
+  compact  fold the logged edits into a new snapshot once the log passes a threshold
+           (the folded entries are archived to <log>.archive.jsonl)
+  reapply  re-apply the edits (archived and pending) to a freshly converted CSV,
+           matching rows by key column instead of position
+
+Edits are resolved to rows with an order-statistics tree, so positional deletes
+cost O(log n), and the last write per (row, column) is picked in one vectorized
+pass - a full rebuild is linear in the number of edits.
+
+Usage:
+  python edit_log_replay.py base <base.csv> <edit_logs.json>
+  python edit_log_replay.py replay <base.csv> <edit_logs.json> <output.csv>
+  python edit_log_replay.py compact <base.csv> <edit_logs.json> [--threshold N] [--force]
+  python edit_log_replay.py reapply <converted.csv> <edit_logs.json> <output.csv> [--key s_no[,col...]]
+
+Edits are matched to CSV files by name; pass --file engineering.csv when the
+CSV being processed has a different name than the one the dashboard edited.
+
+Replay and compact only run on the recorded base snapshot, checked by its
+SHA-256. The dashboard applies each edit to its live CSV as well as logging
+it, so replaying the log onto public/<file>.csv would apply every edit twice;
+instead, copy the live CSV once, record the copy with `base`, and replay or
+compact the copy. reapply matches rows by key and runs on any fresh conversion.
+
+Compaction is crash-safe: <base>.compaction.json records the snapshot's hash
+and how many of the file's logged edits it already holds (with their hash).
+While those edits are still in the log (the process died before truncating
+it), replay skips them and the next compact finishes archiving and truncating
+instead of applying them twice.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+MUTATING_ACTIONS = ('ADD_ROW', 'UPDATE_ROW', 'DELETE_ROW')
+
+DEFAULT_COMPACT_THRESHOLD = 500
+DEFAULT_KEY_COLUMN = 's_no'
+
+ARCHIVE_SUFFIX = '.archive.jsonl'
+COMPACTION_SUFFIX = '.compaction.json'
+
+
+def to_cell(value):
+    """
+    Normalise a logged value to the string the CSV would hold
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def changed_values(details):
+    """
+    Columns an UPDATE_ROW actually changed
+    The log stores the whole row in newValues, so unchanged columns are dropped
+    here; otherwise a replay onto a fresh conversion would overwrite them
+    """
+    old_values = details.get('oldValues') or {}
+    new_values = details.get('newValues') or details.get('changes') or {}
+    return {
+        col: to_cell(value) for col, value in new_values.items()
+        if col not in old_values or to_cell(old_values[col]) != to_cell(value)
+    }
+
+
+def load_edit_log(log_path, filename=None, include_archive=False):
+    """
+    Load edit log entries in order, optionally only those for one CSV file
+    With include_archive=True, entries folded into earlier snapshots come first
+    """
+    entries = []
+    archive_path = log_path + ARCHIVE_SUFFIX
+    if include_archive and os.path.exists(archive_path):
+        with open(archive_path, 'r', encoding='utf-8') as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+
+    if os.path.exists(log_path):
+        with open(log_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        if content:
+            entries.extend(json.loads(content))
+
+    if filename is not None:
+        entries = [entry for entry in entries if entry.get('filename') == filename]
+    return entries
+
+
+class RowPositions:
+    """
+    Order-statistics (Fenwick) tree over row slots
+    Maps a row's current position to its stable slot in O(log n), so deleting
+    a row does not shift every later row
+    """
+
+    def __init__(self, size, capacity):
+        self.capacity = capacity
+        self.size = size
+        self.tree = [0] * (capacity + 1)
+        for slot in range(size):
+            self._add(slot, 1)
+        self.alive = size
+
+    def _add(self, slot, delta):
+        i = slot + 1
+        while i <= self.capacity:
+            self.tree[i] += delta
+            i += i & (-i)
+
+    def slot_at(self, position):
+        """
+        Slot of the row currently at 0-based position (None if out of range)
+        """
+        if position < 0 or position >= self.alive:
+            return None
+        remaining = position + 1
+        i = 0
+        step = 1 << self.capacity.bit_length()
+        while step:
+            nxt = i + step
+            if nxt <= self.capacity and self.tree[nxt] < remaining:
+                i = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return i
+
+    def remove(self, slot):
+        self._add(slot, -1)
+        self.alive -= 1
+
+    def append(self):
+        slot = self.size
+        self.size += 1
+        self._add(slot, 1)
+        self.alive += 1
+        return slot
+
+
+def resolve_positional(entries, row_count):
+    """
+    Resolve logged edits (positional rowIndex) to stable row slots
+    Returns (writes, deleted_slots, slot_count, skipped) where writes is a list
+    of (slot, column, value) in log order
+    """
+    adds = sum(1 for entry in entries if entry.get('action') == 'ADD_ROW')
+    positions = RowPositions(row_count, row_count + adds)
+
+    writes = []
+    deleted = []
+    skipped = 0
+    for entry in entries:
+        action = entry.get('action')
+        details = entry.get('details') or {}
+
+        if action == 'ADD_ROW':
+            slot = positions.append()
+            writes.extend((slot, col, to_cell(value)) for col, value in (details.get('rowData') or {}).items())
+        elif action in ('UPDATE_ROW', 'DELETE_ROW'):
+            slot = positions.slot_at(int(details.get('rowIndex', -1)))
+            if slot is None:
+                skipped += 1
+                continue
+            if action == 'UPDATE_ROW':
+                writes.extend((slot, col, value) for col, value in changed_values(details).items())
+            else:
+                positions.remove(slot)
+                deleted.append(slot)
+
+    return writes, deleted, positions.size, skipped
+
+
+def apply_writes(df, writes, row_labels):
+    """
+    Apply the last write per (row, column) to df in one pass per column
+    writes is a DataFrame with columns row, column, value; row_labels maps
+    write rows to df index labels
+    """
+    if writes.empty:
+        return df
+
+    last = writes.drop_duplicates(['row', 'column'], keep='last')
+    for col, group in last.groupby('column', sort=False):
+        if col not in df.columns:
+            df[col] = ''
+        labels = group['row'].map(row_labels)
+        present = labels.notna()
+        df.loc[labels[present].values, col] = group['value'][present].values
+    return df
+
+
+def replay(base_df, entries):
+    """
+    Rebuild the current table from a snapshot and its edit log entries
+    Returns (DataFrame, stats)
+    """
+    entries = [entry for entry in entries if entry.get('action') in MUTATING_ACTIONS]
+    writes, deleted, slot_count, skipped = resolve_positional(entries, len(base_df))
+
+    df = base_df.reset_index(drop=True).astype(object)
+    if slot_count > len(df):
+        df = df.reindex(range(slot_count))
+
+    writes_df = pd.DataFrame(writes, columns=['row', 'column', 'value'])
+    df = apply_writes(df, writes_df, pd.Series(df.index, index=df.index))
+    df = df.drop(index=deleted).fillna('').reset_index(drop=True)
+
+    return df, {
+        'edits': len(entries),
+        'writes': len(writes_df),
+        'cells_written': int(writes_df.drop_duplicates(['row', 'column']).shape[0]) if len(writes_df) else 0,
+        'deleted': len(deleted),
+        'added': slot_count - len(base_df),
+        'skipped': skipped,
+    }
+
+
+def row_key(row, key_columns):
+    """
+    Key of a logged row; '' when any key column is empty
+    """
+    values = [to_cell((row or {}).get(col)) for col in key_columns]
+    return '\x1f'.join(values) if all(values) else ''
+
+
+def reapply(converted_df, entries, key_columns=(DEFAULT_KEY_COLUMN,)):
+    """
+    Re-apply logged edits to a freshly converted table, matching rows by key
+    (one or more columns). An edit that changed the key itself is followed, so
+    later edits to the renamed row still reach the original row. Edits whose
+    key matches several converted rows are skipped rather than applied to all
+    Returns (DataFrame, stats)
+    """
+    key_columns = list(key_columns)
+    entries = [entry for entry in entries if entry.get('action') in MUTATING_ACTIONS]
+
+    aliases = {}      # current key -> key in the converted data
+    added = {}        # key -> row data for rows added from the dashboard
+    deleted = set()
+    writes = []
+    unkeyed = 0
+
+    for entry in entries:
+        action = entry.get('action')
+        details = entry.get('details') or {}
+
+        if action == 'ADD_ROW':
+            row = {col: to_cell(value) for col, value in (details.get('rowData') or {}).items()}
+            key = row_key(row, key_columns)
+            if not key:
+                unkeyed += 1
+                continue
+            aliases[key] = key
+            added[key] = row
+            deleted.discard(key)
+            continue
+
+        row = details.get('oldValues') if action == 'UPDATE_ROW' else details.get('deletedData')
+        key = row_key(row, key_columns)
+        if not key:
+            unkeyed += 1
+            continue
+        origin = aliases.get(key, key)
+
+        if action == 'DELETE_ROW':
+            deleted.add(origin)
+            added.pop(origin, None)
+            continue
+
+        changes = changed_values(details)
+        writes.extend((origin, col, value) for col, value in changes.items())
+        if any(col in changes for col in key_columns):
+            aliases.pop(key, None)
+            aliases[row_key({**row, **changes}, key_columns)] = origin
+
+    df = converted_df.reset_index(drop=True).astype(object)
+    for col in key_columns:
+        if col not in df.columns:
+            df[col] = ''
+
+    def frame_keys(frame):
+        values = frame[key_columns].fillna('').astype(str)
+        keys = values[key_columns[0]]
+        for col in key_columns[1:]:
+            keys = keys + '\x1f' + values[col]
+        return keys.where(values.ne('').all(axis=1), '')
+
+    # Rows added from the dashboard that the new conversion does not contain
+    keys = frame_keys(df)
+    existing = set(keys)
+    new_rows = [row for key, row in added.items() if key not in existing]
+    if new_rows:
+        df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True).astype(object)
+        keys = frame_keys(df)
+
+    counts = keys[keys != ''].value_counts()
+    unique_keys = set(counts.index[counts == 1])
+    ambiguous_keys = set(counts.index[counts > 1])
+
+    writes_df = pd.DataFrame(writes, columns=['row', 'column', 'value'])
+    matched = writes_df['row'].isin(unique_keys)
+    ambiguous = writes_df['row'].isin(ambiguous_keys)
+
+    label_of = pd.Series(df.index, index=keys.values)
+    label_of = label_of[label_of.index.isin(unique_keys)]
+    df = apply_writes(df, writes_df[matched], label_of)
+
+    drop = keys.isin(deleted & unique_keys)
+    df = df[~drop.values].fillna('').reset_index(drop=True)
+
+    return df, {
+        'edits': len(entries),
+        'cells_written': int(writes_df[matched].drop_duplicates(['row', 'column']).shape[0]),
+        'unmatched_writes': int((~matched & ~ambiguous).sum()),
+        'ambiguous_writes': int(ambiguous.sum()),
+        'ambiguous_deletes': len(deleted & ambiguous_keys),
+        'added': len(new_rows),
+        'deleted': int(drop.sum()),
+        'unkeyed': unkeyed,
+    }
+
+
+def entries_hash(entries):
+    return hashlib.sha256(json.dumps(entries, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def snapshot_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_compaction(base_csv):
+    """
+    The snapshot's compaction record, or None when there is none or it belongs
+    to another version of the snapshot (a compaction that died before
+    replacing it)
+    """
+    path = base_csv + COMPACTION_SUFFIX
+    if not os.path.exists(path) or not os.path.exists(base_csv):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if record.get('snapshot_sha256') != snapshot_hash(base_csv):
+        return None
+    return record
+
+
+def base_error(base_csv):
+    """
+    Why the log cannot be replayed onto base_csv, or None when base_csv is the
+    recorded base snapshot (by hash)
+    """
+    if not os.path.exists(base_csv + COMPACTION_SUFFIX):
+        return (f"{base_csv} is not a recorded base snapshot; record it with "
+                f"'edit_log_replay.py base' (never the live dashboard CSV, which already holds the edits)")
+    if read_compaction(base_csv) is None:
+        return (f"{base_csv} does not match the recorded base snapshot (SHA-256 differs); "
+                f"it was changed outside replay/compact, e.g. by the dashboard, and replaying would apply edits twice")
+    return None
+
+
+def mark_base(base_csv, log_path):
+    """
+    Record base_csv as the log's base snapshot. The edits for it that are
+    already logged are taken to be in it and archived, as if compacted
+    Returns how many edits that was
+    """
+    filename = os.path.basename(base_csv)
+    mutating = [entry for entry in load_edit_log(log_path, filename) if entry.get('action') in MUTATING_ACTIONS]
+    _write_json_atomic({
+        'snapshot_sha256': snapshot_hash(base_csv),
+        'folded': len(mutating),
+        'entries_sha256': entries_hash(mutating) if mutating else None,
+        'compacted_at': datetime.now().isoformat(timespec='seconds'),
+    }, base_csv + COMPACTION_SUFFIX)
+    finish_compaction(base_csv, log_path)
+    return len(mutating)
+
+
+def folded_count(base_csv, mutating):
+    """
+    How many of the leading mutating entries are already in the snapshot:
+    those folded by a compaction that didn't get to truncate the log
+    """
+    record = read_compaction(base_csv)
+    if record is None or not record.get('folded'):
+        return 0
+    count = record['folded']
+    if len(mutating) < count or entries_hash(mutating[:count]) != record['entries_sha256']:
+        return 0
+    return count
+
+
+def pending_entries(base_csv, entries):
+    """
+    The mutating entries not yet folded into base_csv's snapshot
+    """
+    mutating = [entry for entry in entries if entry.get('action') in MUTATING_ACTIONS]
+    return mutating[folded_count(base_csv, mutating):]
+
+
+def _write_csv_atomic(df, path):
+    tmp_path = path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _write_json_atomic(data, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def compact(base_csv, log_path, threshold=DEFAULT_COMPACT_THRESHOLD, force=False):
+    """
+    Fold the edits for base_csv into a new snapshot once there are at least
+    threshold of them. Folded entries move to the archive (so reapply can still
+    see them); entries for other files stay in the log
+    Returns the replay stats, or None when below the threshold. Raises
+    ValueError when base_csv is not the recorded base snapshot
+    """
+    error = base_error(base_csv)
+    if error:
+        raise ValueError(error)
+
+    # Finish a compaction that was interrupted after replacing the snapshot
+    finish_compaction(base_csv, log_path)
+
+    filename = os.path.basename(base_csv)
+    mutating = pending_entries(base_csv, load_edit_log(log_path, filename))
+
+    if not mutating or (len(mutating) < threshold and not force):
+        return None
+
+    base_df = pd.read_csv(base_csv, dtype=str, keep_default_na=False)
+    df, stats = replay(base_df, mutating)
+
+    # The record naming the folded entries is written before the snapshot is
+    # swapped in, and only counts for the snapshot whose hash it holds: until
+    # the log is truncated, replay and compact skip exactly those entries
+    tmp_path = base_csv + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    _write_json_atomic({
+        'snapshot_sha256': snapshot_hash(tmp_path),
+        'folded': len(mutating),
+        'entries_sha256': entries_hash(mutating),
+        'compacted_at': datetime.now().isoformat(timespec='seconds'),
+    }, base_csv + COMPACTION_SUFFIX)
+    os.replace(tmp_path, base_csv)
+
+    finish_compaction(base_csv, log_path)
+    return stats
+
+
+def finish_compaction(base_csv, log_path):
+    """
+    Archive the log entries already folded into the snapshot and drop them
+    (and read-only entries, which carry no state) from the log. Safe to repeat:
+    entries already in the archive aren't appended again
+    """
+    record = read_compaction(base_csv)
+    filename = os.path.basename(base_csv)
+    all_entries = load_edit_log(log_path)
+    own = [entry for entry in all_entries if entry.get('filename') == filename]
+    mutating = [entry for entry in own if entry.get('action') in MUTATING_ACTIONS]
+    count = folded_count(base_csv, mutating)
+    if count == 0:
+        return
+
+    compaction_id = record['entries_sha256']
+    archive_path = log_path + ARCHIVE_SUFFIX
+    archived = _drop_torn_line(archive_path)
+    done = sum(1 for line in archived if json.loads(line).get('compaction') == compaction_id)
+    with open(archive_path, 'a', encoding='utf-8') as f:
+        for entry in mutating[done:count]:
+            f.write(json.dumps({**entry, 'compacted_at': record['compacted_at'], 'compaction': compaction_id},
+                               ensure_ascii=False) + '\n')
+
+    folded = {id(entry) for entry in mutating[:count]}
+    remaining = [entry for entry in all_entries if entry.get('filename') != filename
+                 or (entry.get('action') in MUTATING_ACTIONS and id(entry) not in folded)]
+    _write_json_atomic(remaining, log_path)
+    _write_json_atomic({**record, 'folded': 0, 'entries_sha256': None}, base_csv + COMPACTION_SUFFIX)
+
+
+def _drop_torn_line(path):
+    """
+    Lines of an append-only JSONL file, cutting off a last line left
+    incomplete by a crash mid-append
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if content and not content.endswith('\n'):
+        content = content[:content.rfind('\n') + 1]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return [line for line in content.splitlines() if line.strip()]
+
+
+def print_stats(title, stats):
+    print(f"\n📊 {title}")
+    for key, value in stats.items():
+        print(f"  • {key.replace('_', ' ').capitalize()}: {value:,}")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = sys.argv[1:]
+
+    def option(name, default):
+        if name in flags and flags.index(name) + 1 < len(flags):
+            value = flags[flags.index(name) + 1]
+            if value in args:
+                args.remove(value)
+            return value
+        return default
+
+    threshold = int(option('--threshold', DEFAULT_COMPACT_THRESHOLD))
+    key_column = option('--key', DEFAULT_KEY_COLUMN)
+    filename = option('--file', None)
+
+    if len(args) < 3 or args[0] not in ('base', 'replay', 'compact', 'reapply'):
+        print(__doc__)
+        sys.exit(1)
+
+    command, csv_path, log_path = args[0], args[1], args[2]
+    if not os.path.exists(csv_path):
+        print(f"❌ Error: Input file not found: {csv_path}")
+        sys.exit(1)
+
+    if command == 'base':
+        count = mark_base(csv_path, log_path)
+        print(f"✅ Recorded {csv_path} as the base snapshot ({count:,} logged edits taken as already in it)")
+        return
+
+    if command in ('replay', 'compact'):
+        error = base_error(csv_path)
+        if error:
+            print(f"❌ Error: {error}")
+            sys.exit(1)
+
+    if command == 'compact':
+        stats = compact(csv_path, log_path, threshold=threshold, force='--force' in flags)
+        if stats is None:
+            print(f"Log is below the compaction threshold ({threshold} edits) - nothing to do")
+        else:
+            print_stats(f"Compacted edits into {csv_path}", stats)
+        return
+
+    if len(args) < 4:
+        print(__doc__)
+        sys.exit(1)
+    output_csv = args[3]
+
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    filename = filename or os.path.basename(csv_path)
+
+    if command == 'replay':
+        # Edits a compaction already folded into the snapshot are not replayed again
+        result, stats = replay(df, pending_entries(csv_path, load_edit_log(log_path, filename)))
+        print_stats(f"Replayed edits onto {csv_path}", stats)
+    else:
+        # A fresh conversion carries none of the dashboard edits, archived or pending
+        entries = load_edit_log(log_path, filename, include_archive=True)
+        result, stats = reapply(df, entries, key_columns=key_column.split(','))
+        print_stats(f"Re-applied edits onto {csv_path} by '{key_column}'", stats)
+
+    _write_csv_atomic(result, output_csv)
+    print(f"✅ Written: {output_csv} ({len(result):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
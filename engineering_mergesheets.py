@@ -2,9 +2,14 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import re
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+from streaming_xlsx_writer import write_sheets_streaming
+from reader_backends import open_workbook
+from precompress import publish_precompressed
+
 def parse_date(date_value):
     """
     Parse various date formats into a standard format
@@ -209,21 +214,20 @@ def standardize_column_names(df):
     df.columns = new_columns
     return df
 
-def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
+def process_excel_file(file_path, output_path='consolidated_data.xlsx', session=None, backend=None):
     """
     Main function to process all sheets from Excel file
+    Sheets are read from session (a shared WorkbookSession) when given, else
+    with the reader_backends backend named by backend (None for the default)
     """
     print(f"Reading Excel file: {file_path}")
     
-    # Read all sheets
+    # Read all sheets (with the backend for the file's real format)
     try:
-        excel_file = pd.ExcelFile(file_path, engine='openpyxl')
-    except:
-        try:
-            excel_file = pd.ExcelFile(file_path, engine='xlrd')
-        except Exception as e:
-            print(f"Error reading Excel file: {e}")
-            return None
+        excel_file = session or open_workbook(file_path, backend)[0]
+    except Exception as e:
+        print(f"Error reading Excel file: {e}")
+        return None
     
     all_data = []
     
@@ -234,7 +238,7 @@ def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
         
         try:
             # Read the sheet
-            df = pd.read_excel(excel_file, sheet_name=sheet_name, header=0)
+            df = excel_file.parse(sheet_name, header=0)
             
             # Skip if empty or too small
             if df.shape[0] < 2 or df.shape[1] < 5:
@@ -361,17 +365,13 @@ def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
     print(f"\nSaving consolidated data...")
     
     try:
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # Main consolidated sheet
-            consolidated_df.to_excel(writer, sheet_name='Consolidated_Data', index=False)
-            
-            # Summary statistics sheet
-            summary_stats = create_summary_stats(consolidated_df)
-            summary_stats.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Sheet-wise summary
-            sheet_summary = create_sheet_summary(consolidated_df)
-            sheet_summary.to_excel(writer, sheet_name='Sheet_Summary')
+        # Stream the workbook row by row with real date cells instead of
+        # building the whole workbook in memory
+        write_sheets_streaming(output_path, {
+            'Consolidated_Data': consolidated_df,
+            'Summary': create_summary_stats(consolidated_df),
+            'Sheet_Summary': create_sheet_summary(consolidated_df).reset_index(),
+        }, date_columns=date_columns, date_format='%Y-%m-%d')
         
         print(f"Data successfully consolidated and saved to {output_path}")
         print(f"Total records: {len(consolidated_df)}")
@@ -504,5 +504,8 @@ if __name__ == "__main__":
         try:
             consolidated_data.to_csv("engineering.csv", index=False)
             print(f"\nAlso saved as CSV: engineering.csv")
+            # --precompress publishes .gz/.br copies and an ETag for the dashboard's CSV
+            if '--precompress' in sys.argv:
+                publish_precompressed(["engineering.csv"])
         except Exception as e:
             print(f"Could not save CSV: {e}")
\ No newline at end of file
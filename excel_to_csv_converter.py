@@ -12,20 +12,71 @@ import re
 import warnings
 import os
 import sys
+import threading
 import xlrd
 from pathlib import Path
 
+from multi_format_writer import MultiFormatWriter, SUPPORTED_FORMATS, FORMAT_EXTENSIONS
+from precompress import publish_precompressed
+from build_manifest import check_up_to_date, record_build, hash_file, file_state
+from pipeline_dag import Pipeline
+from sheet_checkpoints import SheetCheckpoints, default_checkpoint_dir
+from sheet_pipeline import run_pipelined
+from chunk_clean import DEFAULT_CHUNK_ROWS, can_fork_pool, clean_columns_chunked
+from lazy_xls import LazyWorkbook
+from junk_rows import drop_junk_rows, describe_counts
+from reader_backends import detect_format, open_workbook
+
+# Outputs written by default: the CSV/Excel pair. The columnar payloads and the
+# SQLite store are opt-in (output format list / convert_cli --formats)
+DEFAULT_OUTPUT_FORMATS = ['csv', 'xlsx']
+
+# Summary tab columns holding amounts / percentages (numeric cells shown as #,##0.00)
+SUMMARY_NUMBER_COLUMNS = {
+    'Summary': ['Value'],
+    'Sheet_Summary': ['Total Sanctioned Amount', 'Avg Physical Progress'],
+}
+
+
+def summary_number(value):
+    """
+    A summary amount as a plain float cell; None (a blank cell) for NaN
+    """
+    return None if pd.isna(value) else float(value)
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
 class ExcelProcessor:
     """Main class for processing Excel files"""
     
-    def __init__(self, input_file, output_csv=None, output_excel=None):
+    def __init__(self, input_file, output_csv=None, output_excel=None, output_formats=None,
+                 precompress=False, cache_dir=None, checkpoints=False, resume=False,
+                 pipelined=False, clean_workers=1, max_queued=2,
+                 chunk_workers=1, chunk_rows=DEFAULT_CHUNK_ROWS, session=None, backend=None):
         self.input_file = input_file
         self.output_csv = output_csv or input_file.replace('.xls', '_consolidated.csv').replace('.xlsx', '_consolidated.csv')
         self.output_excel = output_excel or input_file.replace('.xls', '_consolidated.xlsx').replace('.xlsx', '_consolidated.xlsx')
+        self.output_formats = output_formats or list(DEFAULT_OUTPUT_FORMATS)
+        self.precompress = precompress
+        self.cache_dir = cache_dir
+        # Resuming needs the checkpoints of the interrupted run (and keeps writing them)
+        self.use_checkpoints = checkpoints or resume
+        self.resume = resume
+        self.checkpoints = None
+        self.checkpoint_lock = threading.Lock()
+        self.pipelined = pipelined
+        self.clean_workers = clean_workers
+        self.max_queued = max_queued
+        self.chunk_workers = chunk_workers
+        self.chunk_rows = chunk_rows
+        # Shared workbook_session.WorkbookSession to read sheets from (parsed
+        # once for every converter using it); None opens the file here
+        self.session = session
+        # reader_backends backend to read the workbook with; None for the default
+        self.backend = backend
         self.all_data = []
+        self.junk_counts = {}
         self.consolidated_df = None
         
     def parse_date(self, date_value, workbook_datemode=0):
@@ -461,37 +512,23 @@ class ExcelProcessor:
         df.columns = new_columns
         return df
     
-    def process_sheet_data(self, sheet_data, sheet_name, headers=None):
+    def detect_header(self, sheet_data):
         """
-        Process raw sheet data into a cleaned DataFrame
+        Find the header row (usually first row with meaningful text)
+        Returns (header_idx, headers)
         """
-        if not sheet_data or len(sheet_data) < 2:
-            return None
-        
-        # Find header row (usually first row with meaningful text)
         header_idx = 0
-        if headers is None:
-            for idx, row in enumerate(sheet_data[:5]):
-                row_str = ' '.join(str(cell).lower() for cell in row if cell)
-                if any(keyword in row_str for keyword in ['name', 'date', 'amount', 'scheme', 'budget']):
-                    header_idx = idx
-                    break
-            headers = sheet_data[header_idx]
-        
-        # Create DataFrame
-        data_rows = sheet_data[header_idx + 1:]
-        if not data_rows:
-            return None
-        
-        df = pd.DataFrame(data_rows, columns=headers)
-        
-        # Add source sheet
-        df['source_sheet'] = sheet_name
-        
-        # Standardize column names
-        df = self.standardize_column_names(df)
-        
-        # Process each column based on its type
+        for idx, row in enumerate(sheet_data[:5]):
+            row_str = ' '.join(str(cell).lower() for cell in row if cell)
+            if any(keyword in row_str for keyword in ['name', 'date', 'amount', 'scheme', 'budget']):
+                header_idx = idx
+                break
+        return header_idx, sheet_data[header_idx]
+    
+    def clean_columns(self, df):
+        """
+        Parse date, numeric and text columns in place
+        """
         date_columns = [
             'date_ts', 'date_tender', 'date_acceptance', 'date_award',
             'pdc_agreement', 'revised_pdc', 'actual_completion_date'
@@ -508,37 +545,132 @@ class ExcelProcessor:
             'progress_status', 'remarks', 'aa_es_pending_with'
         ]
         
-        # Process date columns
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(self.parse_date)
+        cleaners = ([(col, self.parse_date) for col in date_columns if col in df.columns]
+                    + [(col, self.clean_numeric) for col in numeric_columns if col in df.columns]
+                    + [(col, self.clean_text) for col in text_columns if col in df.columns])
         
-        # Process numeric columns
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(self.clean_numeric)
+        # A very large sheet is cleaned in row chunks on a process pool
+        if self.chunk_workers > 1 and len(df) >= 2 * self.chunk_rows and can_fork_pool():
+            return clean_columns_chunked(df, cleaners, self.chunk_workers, self.chunk_rows,
+                                         numeric_cleaners=[self.clean_numeric])
         
-        # Process text columns
-        for col in text_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(self.clean_text)
+        # Process date, numeric and text columns
+        for col, cleaner in cleaners:
+            df[col] = df[col].apply(cleaner)
         
-        # Remove completely empty rows
-        important_cols = ['scheme_name', 'work_site', 'sanctioned_amount', 'budget_head']
+        return df
+    
+    def filter_valid_rows(self, df, important_cols):
+        """
+        Keep rows where at least one important column has data
+        """
         existing_cols = [col for col in important_cols if col in df.columns]
         
         if existing_cols:
-            # Keep rows where at least one important column has data
             mask = pd.Series([False] * len(df))
             for col in existing_cols:
-                if col in ['sanctioned_amount']:
+                if col == 'sanctioned_amount':
                     mask = mask | df[col].notna()
                 else:
                     mask = mask | ((df[col] != '') & df[col].notna())
             df = df[mask]
         
+        return df
+    
+    def filter_junk_rows(self, rows, header, sheet_name):
+        """
+        Drop blank, repeated-header and totals rows straight after extraction,
+        so column mapping and the cleaners never see them; rows is a list of
+        cell rows or a DataFrame
+        """
+        rows, counts = drop_junk_rows(rows, header)
+        self.junk_counts[sheet_name] = counts
+        dropped = describe_counts(counts)
+        if dropped:
+            print(f"  Dropped junk rows ({sheet_name}): {dropped}")
+        return rows
+    
+    def process_sheet_data(self, sheet_data, sheet_name, headers=None):
+        """
+        Process raw sheet data into a cleaned DataFrame
+        """
+        if not sheet_data or len(sheet_data) < 2:
+            return None
+        
+        header_idx = 0
+        if headers is None:
+            header_idx, headers = self.detect_header(sheet_data)
+        
+        # Create DataFrame
+        data_rows = self.filter_junk_rows(sheet_data[header_idx + 1:], headers, sheet_name)
+        if not data_rows:
+            return None
+        
+        df = pd.DataFrame(data_rows, columns=headers)
+        
+        # Add source sheet
+        df['source_sheet'] = sheet_name
+        
+        # Standardize column names
+        df = self.standardize_column_names(df)
+        
+        return self.clean_sheet_frame(df)
+    
+    def clean_sheet_frame(self, df):
+        """
+        Clean a sheet read cell by cell (xlrd) once its columns are standardized
+        """
+        # Process each column based on its type
+        df = self.clean_columns(df)
+        
+        # Remove completely empty rows
+        df = self.filter_valid_rows(df, ['scheme_name', 'work_site', 'sanctioned_amount', 'budget_head'])
+        
         return df if len(df) > 0 else None
     
+    def extract_sheet_rows(self, sheet, datemode):
+        """
+        Read an xlrd sheet into a list of rows, converting date cells
+        """
+        sheet_data = []
+        for row_idx in range(sheet.nrows):
+            row_data = []
+            for col_idx in range(sheet.ncols):
+                cell = sheet.cell(row_idx, col_idx)
+                value = cell.value
+                
+                # Handle dates
+                if cell.ctype == xlrd.XL_CELL_DATE:
+                    date_tuple = xlrd.xldate_as_tuple(value, datemode)
+                    value = datetime(*date_tuple)
+                
+                row_data.append(value)
+            sheet_data.append(row_data)
+        return sheet_data
+    
+    def open_xls(self):
+        """
+        The input as a LazyWorkbook (or the shared session's view of it), or
+        None when it isn't an .xls file
+        """
+        if self.session is not None:
+            return self.session.xls_view()
+        if self.backend not in (None, 'xlrd'):
+            return None
+        if detect_format(self.input_file) == 'xls':
+            return LazyWorkbook(self.input_file)
+        return None
+    
+    def open_sheet_reader(self):
+        """
+        (workbook, backend name) reading sheets as DataFrames: the shared
+        session, else the backend for the detected format (or the chosen one)
+        """
+        if self.session is not None:
+            return self.session, 'workbook session'
+        excel_file, backend = open_workbook(self.input_file, self.backend)
+        return excel_file, backend.name
+    
     def read_excel_file(self):
         """
         Read Excel file using multiple methods for compatibility
@@ -546,97 +678,228 @@ class ExcelProcessor:
         print(f"Reading: {self.input_file}")
         print("=" * 70)
         
-        # Try xlrd for .xls files
-        if self.input_file.lower().endswith('.xls'):
-            try:
-                workbook = xlrd.open_workbook(self.input_file, formatting_info=False)
-                print(f"Successfully opened with xlrd: {workbook.nsheets} sheets")
-                
-                for sheet_idx in range(workbook.nsheets):
-                    sheet = workbook.sheet_by_index(sheet_idx)
-                    sheet_name = sheet.name
-                    print(f"\nProcessing sheet: {sheet_name}")
-                    print(f"  Dimensions: {sheet.nrows} rows × {sheet.ncols} columns")
-                    
-                    if sheet.nrows < 2 or sheet.ncols < 3:
-                        print(f"  Skipping - insufficient data")
-                        continue
-                    
-                    # Extract data
-                    sheet_data = []
-                    for row_idx in range(sheet.nrows):
-                        row_data = []
-                        for col_idx in range(sheet.ncols):
-                            cell = sheet.cell(row_idx, col_idx)
-                            value = cell.value
-                            
-                            # Handle dates
-                            if cell.ctype == xlrd.XL_CELL_DATE:
-                                date_tuple = xlrd.xldate_as_tuple(value, workbook.datemode)
-                                value = datetime(*date_tuple)
-                            
-                            row_data.append(value)
-                        sheet_data.append(row_data)
-                    
-                    # Process sheet
-                    df = self.process_sheet_data(sheet_data, sheet_name)
-                    if df is not None:
-                        self.all_data.append(df)
-                        print(f"  Extracted {len(df)} valid rows")
-                    else:
-                        print(f"  No valid data found")
-                        
-                return True
-                
-            except Exception as e:
-                print(f"xlrd failed: {e}")
-        
-        # Try pandas with different engines
-        engines = ['openpyxl', 'xlrd', None]
-        for engine in engines:
+        # Real .xls files (OLE2, whatever their extension) go through xlrd:
+        # memory-mapped, one sheet parsed at a time
+        try:
+            workbook = self.open_xls()
+        except Exception as e:
+            print(f"xlrd failed: {e}")
+            workbook = None
+        if workbook is not None:
             try:
-                engine_str = engine or 'default'
-                print(f"\nTrying pandas with {engine_str} engine...")
-                
-                excel_file = pd.ExcelFile(self.input_file, engine=engine)
-                print(f"Successfully opened: {len(excel_file.sheet_names)} sheets")
-                
-                for sheet_name in excel_file.sheet_names:
-                    print(f"\nProcessing sheet: {sheet_name}")
+                with workbook:
+                    print(f"Successfully opened with xlrd: {workbook.nsheets} sheets")
                     
-                    try:
-                        df = pd.read_excel(excel_file, sheet_name=sheet_name, header=0)
+                    for sheet_idx, sheet_name in enumerate(workbook.sheet_names()):
+                        print(f"\nProcessing sheet: {sheet_name}")
                         
-                        if df.shape[0] < 1 or df.shape[1] < 3:
+                        # Sheets too small to hold data are skipped before being parsed
+                        if workbook.too_small(sheet_idx, 2, 3):
                             print(f"  Skipping - insufficient data")
                             continue
                         
-                        # Add source sheet
-                        df['source_sheet'] = sheet_name
+                        if self.checkpoints is not None and self.checkpoints.completed(sheet_name):
+                            print(f"  Already converted - resuming from checkpoint")
+                            continue
                         
-                        # Standardize columns
-                        df = self.standardize_column_names(df)
+                        sheet = workbook.sheet(sheet_idx)
+                        print(f"  Dimensions: {sheet.nrows} rows × {sheet.ncols} columns")
                         
-                        # Process columns
-                        processed_df = self.process_dataframe(df)
+                        if sheet.nrows < 2 or sheet.ncols < 3:
+                            print(f"  Skipping - insufficient data")
+                            workbook.unload(sheet_idx)
+                            continue
                         
-                        if processed_df is not None and len(processed_df) > 0:
-                            self.all_data.append(processed_df)
-                            print(f"  Extracted {len(processed_df)} valid rows")
+                        # Extract data
+                        sheet_data = self.extract_sheet_rows(sheet, workbook.datemode)
+                        workbook.unload(sheet_idx)
+                        
+                        # Process sheet
+                        df = self.process_sheet_data(sheet_data, sheet_name)
+                        if df is not None:
+                            self.keep_sheet(sheet_idx, sheet_name, df)
+                            print(f"  Extracted {len(df)} valid rows")
                         else:
                             print(f"  No valid data found")
-                            
-                    except Exception as e:
-                        print(f"  Error processing sheet: {e}")
-                        continue
                 
+                self.load_checkpointed_sheets()
                 return True
                 
             except Exception as e:
-                print(f"Engine {engine} failed: {e}")
+                print(f"xlrd failed: {e}")
+        
+        # Anything else: the backend for the detected format (or the chosen one)
+        try:
+            excel_file, backend_name = self.open_sheet_reader()
+        except Exception as e:
+            print(f"Could not open workbook: {e}")
+            return False
+        print(f"\nSuccessfully opened with {backend_name}: {len(excel_file.sheet_names)} sheets")
+        
+        for sheet_idx, sheet_name in enumerate(excel_file.sheet_names):
+            print(f"\nProcessing sheet: {sheet_name}")
+            
+            if self.checkpoints is not None and self.checkpoints.completed(sheet_name):
+                print(f"  Already converted - resuming from checkpoint")
+                continue
+            
+            try:
+                df = excel_file.parse(sheet_name, header=0)
+                
+                if df.shape[0] < 1 or df.shape[1] < 3:
+                    print(f"  Skipping - insufficient data")
+                    continue
+                
+                df = self.filter_junk_rows(df, df.columns, sheet_name)
+                
+                # Add source sheet
+                df['source_sheet'] = sheet_name
+                
+                # Standardize columns
+                df = self.standardize_column_names(df)
+                
+                # Process columns
+                processed_df = self.process_dataframe(df)
+                
+                if processed_df is not None and len(processed_df) > 0:
+                    self.keep_sheet(sheet_idx, sheet_name, processed_df)
+                    print(f"  Extracted {len(processed_df)} valid rows")
+                else:
+                    print(f"  No valid data found")
+                    
+            except Exception as e:
+                print(f"  Error processing sheet: {e}")
+                continue
+        
+        self.load_checkpointed_sheets()
+        return True
+    
+    def keep_sheet(self, sheet_idx, sheet_name, df):
+        """
+        Hold on to a processed sheet: checkpointed to disk when checkpoints are
+        enabled (and read back at consolidation), otherwise kept in memory
+        """
+        if self.checkpoints is not None:
+            self.checkpoints.save(sheet_idx, sheet_name, df)
+        else:
+            self.all_data.append(df)
+    
+    def load_checkpointed_sheets(self):
+        """
+        Read every finished sheet (resumed or just converted) back from its
+        memory-mapped checkpoint for consolidation
+        """
+        if self.checkpoints is not None:
+            self.all_data = self.checkpoints.load_all()
+    
+    def iter_sheets(self):
+        """
+        Yield (sheet_idx, sheet_name, kind, data) for every usable sheet, decoding
+        one sheet at a time; kind is 'rows' (xlrd cell values) or 'frame'
+        (DataFrame read by pandas with the first row as header)
+        Sheets that are already checkpointed are skipped without being decoded
+        """
+        try:
+            # Memory-mapped and on_demand: a sheet is only parsed when it is
+            # reached (and not at all when it is too small), and unloaded after
+            # (kept when it comes from a shared session)
+            workbook = self.open_xls()
+        except Exception as e:
+            print(f"xlrd failed: {e}")
+            workbook = None
+        
+        if workbook is not None:
+            with workbook:
+                for sheet_idx, sheet_name in enumerate(workbook.sheet_names()):
+                    if workbook.too_small(sheet_idx, 2, 3):
+                        print(f"  Skipping {sheet_name} - insufficient data")
+                        continue
+                    if self.checkpoints is not None and self.checkpoints.completed(sheet_name):
+                        print(f"  {sheet_name}: already converted - resuming from checkpoint")
+                        continue
+                    sheet = workbook.sheet(sheet_idx)
+                    if sheet.nrows < 2 or sheet.ncols < 3:
+                        print(f"  Skipping {sheet_name} - insufficient data")
+                        rows = None
+                    else:
+                        rows = self.extract_sheet_rows(sheet, workbook.datemode)
+                    workbook.unload(sheet_idx)
+                    if rows is not None:
+                        yield sheet_idx, sheet_name, 'rows', rows
+            return
+        
+        excel_file, backend_name = self.open_sheet_reader()
+        print(f"  Opened with {backend_name}")
+        for sheet_idx, sheet_name in enumerate(excel_file.sheet_names):
+            if self.checkpoints is not None and self.checkpoints.completed(sheet_name):
+                print(f"  {sheet_name}: already converted - resuming from checkpoint")
+                continue
+            try:
+                df = excel_file.parse(sheet_name, header=0)
+            except Exception as e:
+                print(f"  Error reading sheet {sheet_name}: {e}")
+                continue
+            if df.shape[0] < 1 or df.shape[1] < 3:
+                print(f"  Skipping {sheet_name} - insufficient data")
                 continue
+            yield sheet_idx, sheet_name, 'frame', df
+    
+    def read_sheets(self):
+        """
+        Read every usable sheet without processing it (the pipeline's read stage)
+        Returns [(sheet_name, kind, data)], or None if the workbook can't be read
+        """
+        print(f"Reading: {self.input_file}")
+        try:
+            return [(sheet_name, kind, data) for _, sheet_name, kind, data in self.iter_sheets()]
+        except Exception as e:
+            print(f"Could not read workbook: {e}")
+            return None
+    
+    def clean_sheet(self, sheet):
+        """
+        Clean one sheet produced by iter_sheets (runs on a cleaning worker in
+        pipelined mode); returns (sheet_name, DataFrame or None)
+        """
+        sheet_idx, sheet_name, kind, data = sheet
+        if kind == 'rows':
+            df = self.process_sheet_data(data, sheet_name)
+        else:
+            data = self.filter_junk_rows(data, data.columns, sheet_name)
+            data['source_sheet'] = sheet_name
+            df = self.process_dataframe(self.standardize_column_names(data))
+        
+        if df is not None and len(df) > 0 and self.checkpoints is not None:
+            with self.checkpoint_lock:
+                self.checkpoints.save(sheet_idx, sheet_name, df)
+        return sheet_name, df
+    
+    def read_excel_file_pipelined(self):
+        """
+        Read and clean with overlapped I/O and CPU: a reader thread decodes one
+        sheet at a time into a bounded queue that the cleaning workers consume
+        """
+        print(f"Reading: {self.input_file} (pipelined, {self.clean_workers} cleaning worker(s))")
+        print("=" * 70)
         
-        return False
+        try:
+            results, stats = run_pipelined(self.iter_sheets(), self.clean_sheet,
+                                           workers=self.clean_workers, max_queued=self.max_queued)
+        except Exception as e:
+            print(f"Pipelined read failed: {e}")
+            return False
+        
+        for sheet_name, df in results:
+            if df is not None and len(df) > 0:
+                print(f"  {sheet_name}: {len(df)} valid rows")
+                if self.checkpoints is None:
+                    self.all_data.append(df)
+            else:
+                print(f"  {sheet_name}: no valid data found")
+        
+        self.load_checkpointed_sheets()
+        stats.print_report()
+        return True
     
     def process_dataframe(self, df):
         """
@@ -645,49 +908,10 @@ class ExcelProcessor:
         # Remove empty rows
         df = df.dropna(how='all')
         
-        # Process date columns
-        date_columns = [
-            'date_ts', 'date_tender', 'date_acceptance', 'date_award',
-            'pdc_agreement', 'revised_pdc', 'actual_completion_date'
-        ]
-        
-        for col in date_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(self.parse_date)
-        
-        # Process numeric columns
-        numeric_columns = [
-            'sanctioned_amount', 'time_allowed_days', 'physical_progress',
-            'expdr_upto_31mar25', 'expdr_cfy', 'total_expdr', 'percent_expdr'
-        ]
-        
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(self.clean_numeric)
-        
-        # Process text columns
-        text_columns = [
-            'serial_no', 'budget_head', 'scheme_name', 'ftr_hq', 'shq',
-            'work_site', 'executive_agency', 'aa_es_ref', 'firm_name',
-            'progress_status', 'remarks', 'aa_es_pending_with'
-        ]
-        
-        for col in text_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(self.clean_text)
+        df = self.clean_columns(df)
         
         # Filter valid rows
-        important_cols = ['scheme_name', 'work_site', 'sanctioned_amount']
-        existing_cols = [col for col in important_cols if col in df.columns]
-        
-        if existing_cols:
-            mask = pd.Series([False] * len(df))
-            for col in existing_cols:
-                if col == 'sanctioned_amount':
-                    mask = mask | df[col].notna()
-                else:
-                    mask = mask | ((df[col] != '') & df[col].notna())
-            df = df[mask]
+        df = self.filter_valid_rows(df, ['scheme_name', 'work_site', 'sanctioned_amount'])
         
         return df if len(df) > 0 else None
     
@@ -702,20 +926,29 @@ class ExcelProcessor:
         print(f"\n{'=' * 70}")
         print(f"Consolidating {len(self.all_data)} sheets...")
         
+        self.consolidated_df = self.consolidate_frames(self.all_data)
+        
+        print(f"Consolidation complete: {len(self.consolidated_df)} total records")
+        return True
+    
+    def consolidate_frames(self, frames):
+        """
+        Concatenate the sheets' DataFrames with a common, ordered set of columns
+        """
         # Get all unique columns
         all_columns = set()
-        for df in self.all_data:
+        for df in frames:
             all_columns.update(df.columns)
         
         # Ensure all DataFrames have the same columns
-        for i, df in enumerate(self.all_data):
+        for i, df in enumerate(frames):
             for col in all_columns:
                 if col not in df.columns:
                     df[col] = np.nan
-            self.all_data[i] = df
+            frames[i] = df
         
         # Concatenate all data
-        self.consolidated_df = pd.concat(self.all_data, ignore_index=True, sort=False)
+        consolidated_df = pd.concat(frames, ignore_index=True, sort=False)
         
         # Define column order
         primary_columns = [
@@ -730,16 +963,15 @@ class ExcelProcessor:
         ]
         
         # Reorder columns
-        ordered_columns = [col for col in primary_columns if col in self.consolidated_df.columns]
-        remaining_columns = [col for col in self.consolidated_df.columns if col not in ordered_columns]
-        self.consolidated_df = self.consolidated_df[ordered_columns + remaining_columns]
-        
-        print(f"Consolidation complete: {len(self.consolidated_df)} total records")
-        return True
+        ordered_columns = [col for col in primary_columns if col in consolidated_df.columns]
+        remaining_columns = [col for col in consolidated_df.columns if col not in ordered_columns]
+        return consolidated_df[ordered_columns + remaining_columns]
     
     def save_output(self):
         """
-        Save consolidated data to CSV and Excel formats
+        Save consolidated data to the selected output formats
+        (CSV, Excel, the columnar dashboard payload and SQLite by default,
+        optionally Parquet and row-oriented JSON)
         """
         if self.consolidated_df is None or len(self.consolidated_df) == 0:
             print("No data to save!")
@@ -750,43 +982,48 @@ class ExcelProcessor:
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
         
-        # Format dates for output
-        date_columns = [
-            'date_ts', 'date_tender', 'date_acceptance', 'date_award',
-            'pdc_agreement', 'revised_pdc', 'actual_completion_date'
-        ]
-        
-        for col in date_columns:
-            if col in self.consolidated_df.columns:
-                self.consolidated_df[col] = pd.to_datetime(self.consolidated_df[col], errors='coerce')
-                self.consolidated_df[col] = self.consolidated_df[col].apply(
-                    lambda x: x.strftime('%d-%m-%Y') if pd.notna(x) else ''
-                )
-        
-        # Save to CSV
-        print(f"\nSaving CSV to: {self.output_csv}")
-        self.consolidated_df.to_csv(self.output_csv, index=False, encoding='utf-8-sig')
+        # Build summaries up front so the Excel writer only has to write them
+        extra_sheets = {}
+        if 'xlsx' in self.output_formats:
+            extra_sheets['Summary'] = self.create_summary()
+            extra_sheets['Sheet_Summary'] = self.create_sheet_summary()
         
-        # Save to Excel with formatting
-        try:
-            print(f"Saving Excel to: {self.output_excel}")
-            with pd.ExcelWriter(self.output_excel, engine='openpyxl') as writer:
-                # Main data sheet
-                self.consolidated_df.to_excel(writer, sheet_name='Consolidated_Data', index=False)
-                
-                # Create summary sheet
-                summary_df = self.create_summary()
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Create sheet-wise summary
-                sheet_summary = self.create_sheet_summary()
-                sheet_summary.to_excel(writer, sheet_name='Sheet_Summary', index=False)
-                
-            print("Excel file saved successfully")
-        except Exception as e:
-            print(f"Could not save Excel file: {e}")
-        
-        return True
+        return self.write_outputs(extra_sheets)
+    
+    def write_outputs(self, extra_sheets):
+        """
+        Write the consolidated data (and any extra Excel sheets) to every selected format
+        """
+        # Write all selected formats concurrently; dates are formatted once for
+        # the text outputs while the Excel output keeps real date cells
+        print(f"\nSaving outputs: {', '.join(fmt.upper() for fmt in self.output_formats)}")
+        writer = MultiFormatWriter(self.get_output_paths(), date_format='%d-%m-%Y',
+                                   number_columns=SUMMARY_NUMBER_COLUMNS)
+        success = writer.write(self.consolidated_df, extra_sheets)
+        writer.print_report()
+        
+        return success
+    
+    def get_output_paths(self):
+        """
+        Map each selected output format to its file path
+        """
+        csv_root = os.path.splitext(self.output_csv)[0]
+        paths = {}
+        for fmt in self.output_formats:
+            if fmt == 'csv':
+                paths[fmt] = self.output_csv
+            elif fmt == 'xlsx':
+                paths[fmt] = self.output_excel
+            else:
+                paths[fmt] = f"{csv_root}.{FORMAT_EXTENSIONS[fmt]}"
+        return paths
+    
+    def publish_outputs(self):
+        """
+        Write precompressed .gz/.br siblings and ETags for the text outputs
+        """
+        return publish_precompressed(self.get_output_paths().values())
     
     def create_summary(self):
         """
@@ -809,22 +1046,22 @@ class ExcelProcessor:
             amounts = pd.to_numeric(df['sanctioned_amount'], errors='coerce')
             amounts = amounts[amounts > 0]
             if len(amounts) > 0:
-                summary_data.append(['Total Sanctioned Amount (Lakhs)', f"{amounts.sum():,.2f}"])
-                summary_data.append(['Average Sanctioned Amount (Lakhs)', f"{amounts.mean():,.2f}"])
-                summary_data.append(['Max Sanctioned Amount (Lakhs)', f"{amounts.max():,.2f}"])
-                summary_data.append(['Min Sanctioned Amount (Lakhs)', f"{amounts.min():,.2f}"])
+                summary_data.append(['Total Sanctioned Amount (Lakhs)', summary_number(amounts.sum())])
+                summary_data.append(['Average Sanctioned Amount (Lakhs)', summary_number(amounts.mean())])
+                summary_data.append(['Max Sanctioned Amount (Lakhs)', summary_number(amounts.max())])
+                summary_data.append(['Min Sanctioned Amount (Lakhs)', summary_number(amounts.min())])
         
         # Progress summary
         if 'physical_progress' in df.columns:
             progress = pd.to_numeric(df['physical_progress'], errors='coerce')
             progress = progress[progress.notna()]
             if len(progress) > 0:
-                summary_data.append(['Average Physical Progress (%)', f"{progress.mean():,.2f}"])
+                summary_data.append(['Average Physical Progress (%)', summary_number(progress.mean())])
                 summary_data.append(['Projects 100% Complete', len(progress[progress == 100])])
                 summary_data.append(['Projects In Progress', len(progress[(progress > 0) & (progress < 100)])])
                 summary_data.append(['Projects Not Started', len(progress[progress == 0])])
         
-        return pd.DataFrame(summary_data, columns=['Metric', 'Value'])
+        return pd.DataFrame(summary_data, columns=['Metric', 'Value'], dtype=object)
     
     def create_sheet_summary(self):
         """
@@ -853,8 +1090,8 @@ class ExcelProcessor:
                 summary_data.append({
                     'Sheet Name': sheet,
                     'Record Count': record_count,
-                    'Total Sanctioned Amount': f"{total_amount:,.2f}",
-                    'Avg Physical Progress': f"{avg_progress:,.2f}"
+                    'Total Sanctioned Amount': summary_number(total_amount),
+                    'Avg Physical Progress': summary_number(avg_progress)
                 })
         
         return pd.DataFrame(summary_data)
@@ -911,6 +1148,101 @@ class ExcelProcessor:
         
         print("\n" + "=" * 70)
     
+    def build_pipeline(self):
+        """
+        The conversion as a DAG of memoized stages (see pipeline_dag.py):
+        read -> header -> map -> clean -> consolidate -> derive -> write
+        """
+        def read():
+            sheets = self.read_sheets()
+            if sheets is None:
+                raise RuntimeError("Failed to read Excel file")
+            return sheets
+        
+        def header(sheets):
+            return [self.detect_header(data) if kind == 'rows' else None for _, kind, data in sheets]
+        
+        def map_columns(sheets, headers):
+            mapped = []
+            for (sheet_name, kind, data), detected in zip(sheets, headers):
+                if kind == 'rows':
+                    header_idx, columns = detected
+                    rows = self.filter_junk_rows(data[header_idx + 1:], columns, sheet_name)
+                    if not rows:
+                        continue
+                    df = pd.DataFrame(rows, columns=columns)
+                else:
+                    df = self.filter_junk_rows(data, data.columns, sheet_name).copy()
+                df['source_sheet'] = sheet_name
+                mapped.append((sheet_name, kind, self.standardize_column_names(df)))
+            return mapped
+        
+        def clean(mapped):
+            frames = []
+            for sheet_name, kind, df in mapped:
+                df = self.clean_sheet_frame(df) if kind == 'rows' else self.process_dataframe(df)
+                if df is not None and len(df) > 0:
+                    frames.append(df)
+                    print(f"  {sheet_name}: {len(df)} valid rows")
+            return frames
+        
+        def consolidate(frames):
+            if not frames:
+                raise RuntimeError("No valid data to consolidate")
+            return self.consolidate_frames(frames)
+        
+        def derive(consolidated_df):
+            self.consolidated_df = consolidated_df
+            return {'Summary': self.create_summary(), 'Sheet_Summary': self.create_sheet_summary()}
+        
+        def write(consolidated_df, summaries):
+            self.consolidated_df = consolidated_df
+            if not self.write_outputs(summaries if 'xlsx' in self.output_formats else {}):
+                raise RuntimeError("Failed to save output files")
+            if self.precompress:
+                self.publish_outputs()
+            return {path: file_state(path) for path in self.get_output_paths().values()}
+        
+        def outputs_intact(states):
+            return all(os.path.exists(path) and file_state(path) == state for path, state in states.items())
+        
+        writer_modules = [sys.modules[name] for name in
+                          ('multi_format_writer', 'columnar_export', 'sqlite_export', 'streaming_xlsx_writer', 'precompress')
+                          if name in sys.modules]
+        
+        pipeline = Pipeline(self.cache_dir)
+        pipeline.add('read', read, code=[self.read_sheets, self.extract_sheet_rows],
+                     params={'input': os.path.abspath(self.input_file), 'sha256': hash_file(self.input_file),
+                             'backend': self.backend})
+        pipeline.add('header', header, ['read'], code=[self.detect_header])
+        pipeline.add('map', map_columns, ['read', 'header'],
+                     code=[self.filter_junk_rows, sys.modules['junk_rows'], self.standardize_column_names])
+        pipeline.add('clean', clean, ['map'],
+                     code=[self.clean_sheet_frame, self.process_dataframe, self.clean_columns, self.filter_valid_rows,
+                           self.parse_date, self.clean_numeric, self.clean_text])
+        pipeline.add('consolidate', consolidate, ['clean'], code=[self.consolidate_frames])
+        pipeline.add('derive', derive, ['consolidate'], code=[self.create_summary, self.create_sheet_summary])
+        pipeline.add('write', write, ['consolidate', 'derive'],
+                     code=[self.save_output, self.write_outputs, self.publish_outputs] + writer_modules,
+                     params={'outputs': self.get_output_paths(), 'precompress': self.precompress},
+                     validate=outputs_intact)
+        return pipeline
+    
+    def run_pipeline(self):
+        """
+        Run the staged conversion, recomputing only stages whose inputs or code changed
+        """
+        pipeline = self.build_pipeline()
+        try:
+            pipeline.run('write')
+            self.consolidated_df = pipeline.value('consolidate')
+        except Exception as e:
+            pipeline.print_report()
+            print(f"❌ {e}")
+            return False
+        pipeline.print_report()
+        return True
+    
     def process(self):
         """
         Main processing function
@@ -923,27 +1255,47 @@ class ExcelProcessor:
             print(f"❌ Error: Input file not found: {self.input_file}")
             return False
         
-        # Read Excel file
-        if not self.read_excel_file():
-            print("❌ Failed to read Excel file")
-            return False
-        
-        # Consolidate data
-        if not self.consolidate_data():
-            print("❌ Failed to consolidate data")
-            return False
-        
-        # Save output
-        if not self.save_output():
-            print("❌ Failed to save output files")
-            return False
+        if self.cache_dir:
+            # Staged run: stage outputs are memoized under cache_dir
+            if not self.run_pipeline():
+                return False
+        else:
+            # Finished sheets are checkpointed so an interrupted run can --resume
+            if self.use_checkpoints:
+                self.checkpoints = SheetCheckpoints(default_checkpoint_dir(self.output_csv), self.input_file,
+                                                    'excel_to_csv_converter', resume=self.resume)
+                if self.checkpoints.resumed:
+                    print(f"   Resuming: {self.checkpoints.resumed} sheet(s) already converted")
+            
+            # Read Excel file (pipelined: decoding overlaps with cleaning)
+            read = self.read_excel_file_pipelined if self.pipelined else self.read_excel_file
+            if not read():
+                print("❌ Failed to read Excel file")
+                return False
+            
+            # Consolidate data
+            if not self.consolidate_data():
+                print("❌ Failed to consolidate data")
+                return False
+            
+            # Save output
+            if not self.save_output():
+                print("❌ Failed to save output files")
+                return False
+            
+            # Publish precompressed copies for static serving
+            if self.precompress:
+                self.publish_outputs()
+            
+            if self.checkpoints is not None:
+                self.checkpoints.clear()
         
         # Print analysis
         self.print_analysis()
         
         print(f"\n✅ Conversion completed successfully!")
-        print(f"   CSV Output: {self.output_csv}")
-        print(f"   Excel Output: {self.output_excel}")
+        for fmt, path in self.get_output_paths().items():
+            print(f"   {fmt.upper()} Output: {path}")
         
         return True
 
@@ -957,17 +1309,86 @@ def main():
     output_csv = './engineering_consolidated.csv'
     output_excel = './engineering_consolidated.xlsx'
     
+    # --incremental skips the conversion when the build manifest says the outputs
+    # are up to date (and records the build); --force rebuilds anyway
+    incremental = '--incremental' in sys.argv
+    force = '--force' in sys.argv
+    args = [arg for arg in sys.argv if arg not in ('--incremental', '--force')]
+    
+    # --precompress publishes .gz/.br copies and ETags; --checkpoints saves each
+    # finished sheet so an interrupted run can --resume
+    precompress = '--precompress' in args
+    checkpoints = '--checkpoints' in args
+    args = [arg for arg in args if arg not in ('--precompress', '--checkpoints')]
+    
+    # --pipelined [--workers N] overlaps sheet decoding with cleaning on N workers
+    pipelined = '--pipelined' in args
+    args = [arg for arg in args if arg != '--pipelined']
+    clean_workers = 1
+    if '--workers' in args:
+        clean_workers = int(args.pop(args.index('--workers') + 1))
+        args.remove('--workers')
+    
+    # --chunk-workers N cleans very large sheets in row chunks on N processes
+    chunk_workers = 1
+    if '--chunk-workers' in args:
+        chunk_workers = int(args.pop(args.index('--chunk-workers') + 1))
+        args.remove('--chunk-workers')
+    
+    # --resume continues an interrupted run from its per-sheet checkpoints
+    resume = '--resume' in args
+    args = [arg for arg in args if arg != '--resume']
+    
+    # --cache DIR runs the staged pipeline, memoizing each stage's output in DIR
+    cache_dir = None
+    if '--cache' in args:
+        cache_dir = args.pop(args.index('--cache') + 1)
+        args.remove('--cache')
+    
+    # --backend NAME reads the workbook with that reader_backends backend
+    # (e.g. calamine, which is never picked by default)
+    backend = None
+    if '--backend' in args:
+        backend = args.pop(args.index('--backend') + 1)
+        args.remove('--backend')
+    
     # Allow command-line arguments
-    if len(sys.argv) > 1:
-        input_file = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_csv = sys.argv[2]
-    if len(sys.argv) > 3:
-        output_excel = sys.argv[3]
+    if len(args) > 1:
+        input_file = args[1]
+    if len(args) > 2:
+        output_csv = args[2]
+    if len(args) > 3:
+        output_excel = args[3]
+    
+    # Optional comma-separated list of output formats (see SUPPORTED_FORMATS)
+    output_formats = None
+    if len(args) > 4:
+        output_formats = [fmt.strip().lower() for fmt in args[4].split(',') if fmt.strip()]
+        unknown = [fmt for fmt in output_formats if fmt not in SUPPORTED_FORMATS]
+        if unknown:
+            print(f"❌ Error: Unsupported output format(s): {', '.join(unknown)}")
+            sys.exit(1)
     
     # Create processor and run
-    processor = ExcelProcessor(input_file, output_csv, output_excel)
+    processor = ExcelProcessor(input_file, output_csv, output_excel, output_formats,
+                               precompress=precompress, cache_dir=cache_dir, checkpoints=checkpoints,
+                               resume=resume, pipelined=pipelined, clean_workers=clean_workers,
+                               chunk_workers=chunk_workers, backend=backend)
+    output_paths = list(processor.get_output_paths().values())
+    build_options = {'formats': output_formats or 'default'}
+    if backend:
+        build_options['backend'] = backend
+    
+    if incremental and not force:
+        up_to_date, reason = check_up_to_date('excel_to_csv_converter', input_file, output_paths, build_options)
+        if up_to_date:
+            print(f"✅ Outputs are up to date with {input_file} (use --force to rebuild)")
+            sys.exit(0)
+        print(f"   Rebuilding: {reason}")
+    
     success = processor.process()
+    if success and incremental:
+        record_build('excel_to_csv_converter', input_file, output_paths, build_options)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shared Manifest Files
+Helpers for JSON files that several converter processes update in the same
+output directory (etags.json, .build_manifest.json):
+
+  - locked(path): an exclusive fcntl.flock held around the read / merge /
+    write of the file so concurrent jobs (batch_convert, watch_daemon) don't
+    overwrite each other's entries; the lock file lives under the system temp
+    directory (LOCK_DIR), not next to the published file
+  - write_json_atomic(path, data): write through a unique temp file in the
+    same directory and os.replace it into place, so readers never see a
+    partial file and concurrent writers never share a temp path
+
+Only the standard library is used (build_manifest checks run before pandas is
+imported). Where fcntl is unavailable (Windows) the lock is a no-op.
+
+Usage: import only
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LOCK_DIR = os.path.join(tempfile.gettempdir(), 'bsf_converter_locks')
+
+
+def lock_path(path):
+    """
+    Lock file for path: one per real path, outside the (served) output directory
+    """
+    real_path = os.path.realpath(path)
+    name = hashlib.sha256(real_path.encode('utf-8', 'surrogateescape')).hexdigest()[:32]
+    return os.path.join(LOCK_DIR, f"{os.path.basename(real_path)}.{name}.lock")
+
+
+@contextmanager
+def locked(path):
+    """
+    Hold an exclusive lock for updating path (blocks until it is free)
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    with open(lock_path(path), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def write_bytes_atomic(path, content):
+    """
+    Replace path with content through a unique temp file next to it
+    """
+    # Created with mode 0o666 so the umask gives it the mode open() would have
+    # (mkstemp would make it owner-only)
+    while True:
+        tmp_path = f"{path}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data):
+    write_bytes_atomic(path, json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8'))
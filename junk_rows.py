@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Junk Row Filtering
+Drops rows that can't be data right after a sheet is extracted, before column
+mapping and the per-cell cleaners see them. The checks run on the raw grid as
+a whole (numpy over every cell at once):
+
+  - blank: no cell holds anything (missing, empty or whitespace-only text)
+  - repeated header: the row repeats the sheet's header line (same text,
+    ignoring case and surrounding spaces, in at least half of the header's
+    labelled columns), as left behind when tables are pasted one under another
+  - totals: a cell reads just 'Total', 'Grand Total', 'Sub-total', ... (a
+    label on its own, not a description that mentions a total)
+
+The number of rows dropped for each reason is returned so converters can
+report it per sheet.
+
+Usage: python junk_rows.py <file.xls|xlsx>     (counts junk rows per sheet)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+REASONS = ['blank', 'repeated header', 'totals']
+
+TOTAL_LABELS = [
+    'total', 'totals', 'total:', 'grand total', 'grand total:', 'g. total', 'g.total',
+    'sub total', 'sub-total', 'subtotal', 'sub total:', 'sub-total:', 'subtotal:',
+]
+
+# A repeated header must match at least this many labelled header cells
+MIN_HEADER_MATCHES = 2
+
+
+def normalized_text(grid):
+    """
+    The grid's cells as lower-case, stripped text; '' for missing cells
+    """
+    missing = pd.isna(grid)
+    text = np.where(missing, '', grid).astype(str)
+    return np.char.lower(np.char.strip(text))
+
+
+def junk_row_mask(rows, header):
+    """
+    Which rows to keep: rows is a sheet's data rows (list of equal-length rows,
+    2-D array or DataFrame), header its header line
+    Returns (keep, counts): a boolean array over the rows and the number of
+    rows dropped per reason (a row is counted under the first reason it meets)
+    """
+    counts = dict.fromkeys(REASONS, 0)
+    grid = rows.to_numpy(dtype=object) if isinstance(rows, pd.DataFrame) else np.array(rows, dtype=object)
+    if grid.size == 0 or grid.ndim != 2:
+        return np.ones(len(grid), dtype=bool), counts
+
+    cells = normalized_text(grid)
+    blank = ~(cells != '').any(axis=1)
+
+    labels = normalized_text(np.array([list(header)[:grid.shape[1]]], dtype=object))[0]
+    labels = np.concatenate([labels, np.full(grid.shape[1] - len(labels), '')])
+    # Blank header cells read by pandas are named 'Unnamed: i'
+    labels[np.char.startswith(labels, 'unnamed: ')] = ''
+    labelled = labels != ''
+    needed = max(MIN_HEADER_MATCHES, (int(labelled.sum()) + 1) // 2)
+    repeated_header = ((cells == labels) & labelled).sum(axis=1) >= needed
+    repeated_header &= ~blank
+
+    totals = np.isin(cells, TOTAL_LABELS).any(axis=1) & ~blank & ~repeated_header
+
+    counts['blank'] = int(blank.sum())
+    counts['repeated header'] = int(repeated_header.sum())
+    counts['totals'] = int(totals.sum())
+    return ~(blank | repeated_header | totals), counts
+
+
+def drop_junk_rows(rows, header):
+    """
+    rows without its junk rows (same type: list of rows or DataFrame, which
+    keeps its index), and the counts per reason
+    """
+    keep, counts = junk_row_mask(rows, header)
+    if keep.all():
+        return rows, counts
+    if isinstance(rows, pd.DataFrame):
+        return rows[keep], counts
+    return [row for row, kept in zip(rows, keep) if kept], counts
+
+
+def describe_counts(counts):
+    """
+    e.g. '3 blank, 1 totals'; '' when nothing was dropped
+    """
+    return ', '.join(f"{counts[reason]} {reason}" for reason in REASONS if counts.get(reason))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    if not os.path.exists(path):
+        print(f"❌ Error: File not found: {path}")
+        sys.exit(1)
+
+    from sheet_grid import SheetGrid, RawWorkbook
+
+    with RawWorkbook(path) as workbook:
+        for _, sheet_name, rows in workbook.iter_sheets():
+            grid = SheetGrid(rows)
+            data = [row + [None] * (grid.width - len(row)) for row in grid.rows]
+            _, counts = drop_junk_rows(data, grid.header)
+            print(f"  • {sheet_name}: {len(data)} rows, dropped {describe_counts(counts) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Lazy .xls Reading
+Opens an .xls workbook through a read-only memory map and parses its sheets
+one at a time:
+
+  - the file is mapped, not read: xlrd works on the mapped pages (for a
+    contiguous workbook stream nothing is copied) and only the pages that are
+    touched get loaded
+  - on_demand=True: the workbook globals are parsed up front, each sheet only
+    when it is reached, and it is unloaded again once processed
+  - a sheet's size is read from its DIMENSIONS record without parsing it, so
+    sheets too small to hold data are skipped without ever being decoded
+
+Usage: python lazy_xls.py <file.xls>     (lists sheet sizes from DIMENSIONS)
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+import xlrd
+
+DIMENSIONS = 0x0200
+EOF = 0x000A
+# DIMENSIONS comes right after the sheet's first few bookkeeping records; give up
+# (and parse the sheet normally) if it hasn't shown up by then
+MAX_RECORDS_SCANNED = 200
+
+
+class LazyWorkbook:
+    """xlrd workbook over a memory-mapped file, with sheets loaded on demand"""
+
+    def __init__(self, source):
+        """
+        source: a path (memory-mapped) or the workbook's bytes
+        """
+        self.file = self.mapping = None
+        if isinstance(source, bytes):
+            self.book = xlrd.open_workbook(file_contents=source, formatting_info=False, on_demand=True)
+            return
+        self.file = open(source, 'rb')
+        try:
+            self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.book = xlrd.open_workbook(file_contents=self.mapping, formatting_info=False, on_demand=True)
+        except Exception:
+            self.file.close()
+            raise
+
+    @property
+    def nsheets(self):
+        return self.book.nsheets
+
+    @property
+    def datemode(self):
+        return self.book.datemode
+
+    def sheet_names(self):
+        return self.book.sheet_names()
+
+    def dimensions(self, sheet_idx):
+        """
+        (nrows, ncols) of a sheet from its DIMENSIONS record, without parsing
+        it; an upper bound on what xlrd reports once the sheet is loaded.
+        None when the record can't be found
+        """
+        book = self.book
+        if not book.on_demand or book.biff_version < 50:
+            return None
+        mem, pos = book.mem, book._sh_abs_posn[sheet_idx]
+        for _ in range(MAX_RECORDS_SCANNED):
+            if pos + 4 > len(mem):
+                return None
+            code, length = struct.unpack('<HH', mem[pos:pos + 4])
+            if code == DIMENSIONS:
+                if book.biff_version >= 80:
+                    _, last_row, _, last_col = struct.unpack('<IIHH', mem[pos + 4:pos + 16])
+                else:
+                    _, last_row, _, last_col = struct.unpack('<HHHH', mem[pos + 4:pos + 12])
+                return last_row, last_col
+            if code == EOF:
+                return None
+            pos += 4 + length
+        return None
+
+    def too_small(self, sheet_idx, min_rows, min_cols):
+        """
+        True when the sheet can't have min_rows × min_cols cells (checked
+        without parsing it)
+        """
+        dims = self.dimensions(sheet_idx)
+        return dims is not None and (dims[0] < min_rows or dims[1] < min_cols)
+
+    def sheet(self, sheet_idx):
+        return self.book.sheet_by_index(sheet_idx)
+
+    def unload(self, sheet_idx):
+        self.book.unload_sheet(sheet_idx)
+
+    def close(self):
+        self.book.release_resources()
+        if self.mapping is not None:
+            self.mapping.close()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    if not os.path.exists(path):
+        print(f"❌ Error: File not found: {path}")
+        sys.exit(1)
+
+    with LazyWorkbook(path) as workbook:
+        for sheet_idx, name in enumerate(workbook.sheet_names()):
+            dims = workbook.dimensions(sheet_idx)
+            size = f"{dims[0]} rows × {dims[1]} columns" if dims else 'unknown size'
+            print(f"  • {name}: {size}")
+
+
+if __name__ == "__main__":
+    main()
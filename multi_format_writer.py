@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Multi-Format Output Writer
+Writes one consolidated table to CSV, Excel, Parquet, JSON, the columnar
+dashboard payloads (Arrow IPC, column-major JSON) and a SQLite store concurrently
+Date columns are formatted once and the same frame is shared by the text formats;
+the Excel output is streamed with real date and number cells
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from streaming_xlsx_writer import write_sheets_streaming
+from columnar_export import write_arrow_ipc, write_columnar_json
+from sqlite_export import build_sqlite
+
+SUPPORTED_FORMATS = ['csv', 'xlsx', 'parquet', 'json', 'arrow', 'columnar_json', 'sqlite']
+
+# File extension used for each format
+FORMAT_EXTENSIONS = {
+    'csv': 'csv',
+    'xlsx': 'xlsx',
+    'parquet': 'parquet',
+    'json': 'json',
+    'arrow': 'arrow',
+    'columnar_json': 'columns.json',
+    'sqlite': 'db',
+}
+
+# Formats that receive the string-formatted copy of the date columns
+TEXT_FORMATS = ['csv', 'parquet', 'json']
+
+DEFAULT_DATE_COLUMNS = [
+    'date_ts', 'date_tender', 'date_acceptance', 'date_award',
+    'pdc_agreement', 'revised_pdc', 'actual_completion_date'
+]
+
+
+def format_date_columns(df, date_columns=None, date_format='%d-%m-%Y'):
+    """
+    Format date columns as strings in a single vectorized pass
+    Missing or unparseable dates become empty strings
+    """
+    date_columns = DEFAULT_DATE_COLUMNS if date_columns is None else date_columns
+    formatted = df.copy()
+
+    for col in date_columns:
+        if col in formatted.columns:
+            dates = pd.to_datetime(formatted[col], errors='coerce')
+            formatted[col] = dates.dt.strftime(date_format).fillna('')
+
+    return formatted
+
+
+def output_paths_for(base_path, formats):
+    """
+    Build output file paths for each format from a common base path
+    """
+    root, _ = os.path.splitext(base_path)
+    return {fmt: f"{root}.{FORMAT_EXTENSIONS[fmt]}" for fmt in formats}
+
+
+class MultiFormatWriter:
+    """Fan-out writer that produces several output formats from one table"""
+
+    def __init__(self, output_paths, max_workers=None, date_columns=None,
+                 date_format='%d-%m-%Y', streaming_xlsx=True, number_columns=None):
+        """
+        output_paths maps a format name (see SUPPORTED_FORMATS) to its file path
+        Only the formats present in the mapping are written
+        streaming_xlsx=False falls back to pandas' in-memory openpyxl writer
+        number_columns maps an Excel sheet name to columns shown as #,##0.00
+        """
+        unknown = [fmt for fmt in output_paths if fmt not in SUPPORTED_FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported output format(s): {', '.join(unknown)}")
+
+        self.output_paths = dict(output_paths)
+        self.max_workers = max_workers or len(self.output_paths) or 1
+        self.date_columns = DEFAULT_DATE_COLUMNS if date_columns is None else date_columns
+        self.date_format = date_format
+        self.streaming_xlsx = streaming_xlsx
+        self.number_columns = number_columns
+        self.formatted_df = None
+        self.timings = {}
+        self.errors = {}
+
+    def write_csv(self, df, path, extra_sheets=None):
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+    def write_xlsx(self, df, path, extra_sheets=None):
+        sheets = {'Consolidated_Data': df}
+        sheets.update(extra_sheets or {})
+
+        if self.streaming_xlsx:
+            write_sheets_streaming(path, sheets, date_columns=self.date_columns,
+                                   number_columns=self.number_columns)
+            return
+
+        df = self.formatted_df if self.formatted_df is not None else df
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='Consolidated_Data', index=False)
+            for sheet_name, sheet_df in (extra_sheets or {}).items():
+                sheet_df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    def write_parquet(self, df, path, extra_sheets=None):
+        # Parquet needs one type per column, so mixed object columns become strings
+        typed = df.copy()
+        for col in typed.columns:
+            if typed[col].dtype == 'object':
+                typed[col] = typed[col].where(typed[col].isna(), typed[col].astype(str))
+        typed.to_parquet(path, index=False)
+
+    def write_json(self, df, path, extra_sheets=None):
+        df.to_json(path, orient='records', force_ascii=False)
+
+    def write_arrow(self, df, path, extra_sheets=None):
+        write_arrow_ipc(df, path, date_columns=self.date_columns)
+
+    def write_columnar_json(self, df, path, extra_sheets=None):
+        write_columnar_json(df, path, date_columns=self.date_columns)
+
+    def write_sqlite(self, df, path, extra_sheets=None):
+        build_sqlite(df, path)
+
+    def _write_one(self, fmt, df, extra_sheets):
+        if fmt in TEXT_FORMATS:
+            df = self.formatted_df
+        path = self.output_paths[fmt]
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+        start = time.perf_counter()
+        getattr(self, f'write_{fmt}')(df, path, extra_sheets)
+        return time.perf_counter() - start
+
+    def write(self, df, extra_sheets=None):
+        """
+        Write df to every configured format on a thread pool
+        df keeps its typed date columns; they are formatted once for the text formats
+        Returns True only if every format was written (failures are in self.errors)
+        """
+        self.timings = {}
+        self.errors = {}
+
+        needs_text = any(fmt in TEXT_FORMATS for fmt in self.output_paths)
+        needs_text = needs_text or ('xlsx' in self.output_paths and not self.streaming_xlsx)
+        if needs_text:
+            self.formatted_df = format_date_columns(df, self.date_columns, self.date_format)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                fmt: executor.submit(self._write_one, fmt, df, extra_sheets)
+                for fmt in self.output_paths
+            }
+            for fmt, future in futures.items():
+                try:
+                    self.timings[fmt] = future.result()
+                except Exception as e:
+                    self.errors[fmt] = e
+        self.timings['total'] = time.perf_counter() - start
+
+        return not self.errors
+
+    def print_report(self):
+        """
+        Print per-format write times and any failures
+        """
+        for fmt, path in self.output_paths.items():
+            if fmt in self.errors:
+                print(f"  • {fmt.upper():14s}: failed - {self.errors[fmt]}")
+            else:
+                print(f"  • {fmt.upper():14s}: {self.timings[fmt]:6.2f}s  {path}")
+        print(f"  • {'TOTAL':14s}: {self.timings.get('total', 0):6.2f}s (wall clock)")
+
+
+def write_outputs(df, base_path, formats=None, date_columns=None,
+                  date_format='%d-%m-%Y', extra_sheets=None):
+    """
+    Convenience wrapper: write all requested formats from one typed table
+    """
+    formats = formats or SUPPORTED_FORMATS
+    writer = MultiFormatWriter(output_paths_for(base_path, formats),
+                               date_columns=date_columns, date_format=date_format)
+    writer.write(df, extra_sheets)
+    writer.print_report()
+    return writer
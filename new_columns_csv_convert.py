@@ -4,9 +4,12 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-def merge_excel_to_csv(input_file, output_csv='merged_output.csv'):
+from workbook_session import WorkbookSession
+
+def merge_excel_to_csv(input_file, output_csv='merged_output.csv', session=None):
     """
     Merge all Excel sheets into a single CSV file using exact column names
+    Sheets are read from session (a shared WorkbookSession) when given
     """
     print(f"Reading Excel file: {input_file}")
     
@@ -41,36 +44,34 @@ def merge_excel_to_csv(input_file, output_csv='merged_output.csv'):
         'remarks'
     ]
     
-    # Read the Excel file
+    # Read the Excel file (as raw rows, so columns past the output layout are never built)
     try:
-        excel_file = pd.ExcelFile(input_file, engine='openpyxl')
-    except:
-        try:
-            excel_file = pd.ExcelFile(input_file, engine='xlrd')
-        except Exception as e:
-            print(f"Error reading Excel file: {e}")
-            return None
+        workbook = session or WorkbookSession(input_file, cache=False)
+    except Exception as e:
+        print(f"Error reading Excel file: {e}")
+        return None
     
-    print(f"Found {len(excel_file.sheet_names)} sheets: {excel_file.sheet_names}")
+    print(f"Found {len(workbook.sheet_names)} sheets: {workbook.sheet_names}")
     
     # List to store all dataframes
     all_sheets_data = []
     
     # Process each sheet
-    for sheet_name in excel_file.sheet_names:
+    for sheet_name in workbook.sheet_names:
         print(f"Processing sheet: {sheet_name}")
         
         try:
             # Read the sheet
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            grid = workbook.grid(sheet_name)
             
             # Skip empty sheets
-            if df.empty or len(df) == 0:
+            if grid.shape[0] == 0 or grid.shape[1] == 0:
                 print(f"  Skipping {sheet_name} - empty sheet")
                 continue
             
-            # Remove completely empty rows
-            df = df.dropna(how='all')
+            # Only the first len(column_names) columns are kept; completely
+            # empty rows are left out by the reader
+            df = grid.frame(range(min(grid.width, len(column_names))))
             
             # If the sheet has different column names, try to map them
             # This assumes your sheets might have these exact column names or similar ones
@@ -99,6 +100,9 @@ def merge_excel_to_csv(input_file, output_csv='merged_output.csv'):
             print(f"  Error processing sheet {sheet_name}: {str(e)}")
             continue
     
+    if session is None:
+        workbook.close()
+    
     # Check if we have any data
     if not all_sheets_data:
         print("No data found in any sheet!")
@@ -142,19 +146,20 @@ def merge_excel_to_csv(input_file, output_csv='merged_output.csv'):
     return merged_df
 
 # Simple function to merge with automatic column mapping
-def simple_merge(input_file, output_csv='merged_output.csv'):
+def simple_merge(input_file, output_csv='merged_output.csv', session=None):
     """
     Even simpler version - just read all sheets and merge them as-is
+    Sheets are read from session (a shared WorkbookSession) when given
     """
     print(f"Reading Excel file: {input_file}")
     
     # Read all sheets
-    excel_file = pd.ExcelFile(input_file)
+    excel_file = session or pd.ExcelFile(input_file)
     
     all_data = []
     
     for sheet_name in excel_file.sheet_names:
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
+        df = excel_file.parse(sheet_name)
         df['source_sheet'] = sheet_name  # Add sheet name as a column
         all_data.append(df)
         print(f"Read {len(df)} rows from sheet: {sheet_name}")
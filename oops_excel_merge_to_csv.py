@@ -16,14 +16,16 @@ def clean_text_remove_commas(text):
     text = text.strip()
     return text
 
-def process_excel_to_csv(excel_file_path, output_csv_path):
-    excel_file = pd.ExcelFile(excel_file_path)
+def process_excel_to_csv(excel_file_path, output_csv_path, session=None):
+    # Each sheet is parsed from the one open workbook (or a shared
+    # workbook_session.WorkbookSession), not by reopening the file
+    excel_file = session or pd.ExcelFile(excel_file_path)
     sheet_names = excel_file.sheet_names
     
     all_dataframes = []
     
     for sheet_name in sheet_names:
-        df = pd.read_excel(excel_file_path, sheet_name=sheet_name)
+        df = excel_file.parse(sheet_name)
         
         if df.empty:
             continue
@@ -88,20 +90,22 @@ def process_excel_to_csv(excel_file_path, output_csv_path):
             merged_df[col] = pd.to_numeric(merged_df[col], errors='coerce')
     
     merged_df.to_csv(output_csv_path, index=False, encoding='utf-8')
+    return merged_df
 
 # Input file: oops.xlsx or oops.xls
 # Output file: oops.csv
 
 import os
 
-if os.path.exists('oops.xlsx'):
-    input_file = 'oops.xlsx'
-elif os.path.exists('oops.xls'):
-    input_file = 'oops.xls'
-else:
-    print("Input file not found. Please ensure oops.xlsx or oops.xls exists.")
-    exit()
+if __name__ == "__main__":
+    if os.path.exists('oops.xlsx'):
+        input_file = 'oops.xlsx'
+    elif os.path.exists('oops.xls'):
+        input_file = 'oops.xls'
+    else:
+        print("Input file not found. Please ensure oops.xlsx or oops.xls exists.")
+        exit()
 
-output_file = 'oops.csv'
+    output_file = 'oops.csv'
 
-process_excel_to_csv(input_file, output_file)
\ No newline at end of file
+    process_excel_to_csv(input_file, output_file)
\ No newline at end of file
@@ -2,9 +2,16 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import re
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+from streaming_xlsx_writer import write_sheets_streaming
+from build_manifest import check_up_to_date, record_build
+from precompress import publish_precompressed
+from sheet_checkpoints import SheetCheckpoints, default_checkpoint_dir
+from workbook_session import WorkbookSession
+
 def parse_date(date_value):
     """
     Parse various date formats into a standard format
@@ -348,21 +355,25 @@ def standardize_column_names(df):
     df.columns = new_columns
     return df
 
-def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
+def process_excel_file(file_path, output_path='consolidated_data.xlsx', session=None):
     """
     Main function to process all sheets from Excel file
+    Sheets are read from session (a shared WorkbookSession) when given
     """
     print(f"Reading Excel file: {file_path}")
     
     # Read all sheets
-    try:
-        excel_file = pd.ExcelFile(file_path, engine='openpyxl')
-    except:
+    if session is not None:
+        excel_file = session
+    else:
         try:
-            excel_file = pd.ExcelFile(file_path, engine='xlrd')
-        except Exception as e:
-            print(f"Error reading Excel file: {e}")
-            return None
+            excel_file = pd.ExcelFile(file_path, engine='openpyxl')
+        except:
+            try:
+                excel_file = pd.ExcelFile(file_path, engine='xlrd')
+            except Exception as e:
+                print(f"Error reading Excel file: {e}")
+                return None
     
     all_data = []
     
@@ -373,7 +384,7 @@ def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
         
         try:
             # First, read without header to detect the actual header row
-            df_temp = pd.read_excel(excel_file, sheet_name=sheet_name, header=None)
+            df_temp = excel_file.parse(sheet_name, header=None)
             
             # Skip if empty or too small
             if df_temp.shape[0] < 2 or df_temp.shape[1] < 5:
@@ -384,7 +395,7 @@ def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
             header_row = detect_header_row(df_temp)
             
             # Now read with the correct header
-            df = pd.read_excel(excel_file, sheet_name=sheet_name, header=header_row)
+            df = excel_file.parse(sheet_name, header=header_row)
             
             # Skip rows that are all NaN (which might have been incorrectly identified as data)
             df = df.dropna(how='all')
@@ -529,17 +540,13 @@ def process_excel_file(file_path, output_path='consolidated_data.xlsx'):
     print(f"\nSaving consolidated data...")
     
     try:
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # Main consolidated sheet
-            consolidated_df.to_excel(writer, sheet_name='Consolidated_Data', index=False)
-            
-            # Summary statistics sheet
-            summary_stats = create_summary_stats(consolidated_df)
-            summary_stats.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Sheet-wise summary
-            sheet_summary = create_sheet_summary(consolidated_df)
-            sheet_summary.to_excel(writer, sheet_name='Sheet_Summary')
+        # Stream the workbook row by row with real date cells instead of
+        # building the whole workbook in memory
+        write_sheets_streaming(output_path, {
+            'Consolidated_Data': consolidated_df,
+            'Summary': create_summary_stats(consolidated_df),
+            'Sheet_Summary': create_sheet_summary(consolidated_df).reset_index(),
+        }, date_columns=date_columns, date_format='%Y-%m-%d')
         
         print(f"Data successfully consolidated and saved to {output_path}")
         print(f"Total records: {len(consolidated_df)}")
@@ -655,25 +662,12 @@ def analyze_consolidated_data(df):
     
     print("\n" + "="*50)
 
-# Example usage
-if __name__ == "__main__":
-    # Specify your input file path
-    input_file = "engineering.xls"
-    output_file = "engineering_consolidated.xlsx"
-    
-    # Process the file
-    consolidated_data = process_excel_file(input_file, output_file)
-    
-    if consolidated_data is not None:
-        # Perform analysis
-        analyze_consolidated_data(consolidated_data)
-        
-        # Optional: Save as CSV for easier viewing
-        try:
-            consolidated_data.to_csv("engineering.csv", index=False)
-            print(f"\nAlso saved as CSV: engineering.csv")
-        except Exception as e:
-            print(f"Could not save CSV: {e}")import pandas as pd
+# The CSV pipeline below redefines these; main() runs both pipelines
+process_excel_file_workbook = process_excel_file
+analyze_workbook_data = analyze_consolidated_data
+
+
+import pandas as pd
 import numpy as np
 from datetime import datetime
 import re
@@ -817,135 +811,198 @@ def handle_duplicate_columns(df):
     df.columns = cols
     return df
 
-def process_excel_file(file_path, output_path='consolidated_data.csv'):
+# Fixed output schema of the dashboard CSV
+EXPECTED_COLUMNS = [
+    's_no', 'budget_head', 'name_of_scheme', 'sub_scheme_name',
+    'ftr_hq_name', 'shq_name', 'location', 'work_description',
+    'executive_agency', 'aa_es_reference', 'sd_amount_lakh',
+    'ts_date', 'tender_date', 'acceptance_date', 'award_date',
+    'time_allowed_days', 'pdc_agreement', 'pdc_revised',
+    'completion_date_actual', 'firm_name', 'physical_progress_percent',
+    'expenditure_previous_fy', 'expenditure_current_fy',
+    'expenditure_total', 'expenditure_percent', 'current_status', 'remarks'
+]
+
+OUTPUT_DATE_COLUMNS = ['ts_date', 'tender_date', 'acceptance_date', 'award_date',
+                       'pdc_agreement', 'pdc_revised', 'completion_date_actual']
+
+def map_column_names(columns, expected_columns=EXPECTED_COLUMNS):
+    """
+    The names clean_sheet gives a sheet's columns, in order: duplicates made
+    unique, whitespace cleaned, matched onto expected_columns where possible
+    """
+    # (no columns at all: still an empty list of names, not an empty RangeIndex)
+    df = handle_duplicate_columns(pd.DataFrame(columns=columns if len(columns) else pd.Index([], dtype=object)))
+    
+    # Clean column names - remove extra spaces, newlines, etc.
+    df.columns = df.columns.str.strip().str.replace('\n', ' ').str.replace('\r', ' ')
+    df.columns = df.columns.str.replace(r'\s+', ' ', regex=True)
+    
+    # Check if columns match expected structure
+    # Create a mapping for any columns that need to be renamed
+    column_mapping = {}
+    for col in df.columns:
+        col_lower = col.lower().strip()
+        # Try to match with expected columns
+        for expected_col in expected_columns:
+            if expected_col in col_lower or col_lower in expected_col:
+                column_mapping[col] = expected_col
+                break
+    
+    return [column_mapping.get(col, col) for col in df.columns]
+
+def expected_column_positions(header, expected_columns=EXPECTED_COLUMNS):
+    """
+    Positions of the header's columns that clean_sheet keeps, so a sheet can
+    be read without its other columns (all positions when the kept columns
+    alone would be named differently)
+    """
+    names = map_column_names(header, expected_columns)
+    positions = [i for i, name in enumerate(names) if name in expected_columns]
+    if map_column_names([header[i] for i in positions], expected_columns) != [names[i] for i in positions]:
+        return list(range(len(header)))
+    return positions
+
+def clean_sheet(df, sheet_name, expected_columns=EXPECTED_COLUMNS, verbose=True, drop_empty_rows=True):
+    """
+    Map one sheet's (or one row batch's) columns onto expected_columns and clean its values
+    drop_empty_rows=False when the reader already left out completely empty rows
+    (a projected read has to: a row may be empty in the kept columns only)
+    """
+    # Remove completely empty rows
+    if drop_empty_rows:
+        df = df.dropna(how='all')
+    
+    df = df.set_axis(map_column_names(df.columns, expected_columns), axis=1)
+    
+    # Add missing expected columns with empty values
+    for col in expected_columns:
+        if col not in df.columns:
+            df[col] = ''
+    
+    # Keep only expected columns in the correct order
+    df = df[expected_columns]
+    
+    # Add sheet name as a column
+    df['source_sheet'] = sheet_name
+    
+    # Process date columns
+    date_columns = ['ts_date', 'tender_date', 'acceptance_date', 'award_date',
+                  'pdc_agreement', 'pdc_revised', 'completion_date_actual']
+    
+    for col in date_columns:
+        if col in df.columns:
+            if verbose:
+                print(f"  Processing date column: {col}")
+            df[col] = df[col].apply(parse_date)
+            # Convert to standard format
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    # Process numeric columns
+    numeric_columns = ['sd_amount_lakh', 'time_allowed_days', 'physical_progress_percent',
+                     'expenditure_previous_fy', 'expenditure_current_fy', 
+                     'expenditure_total', 'expenditure_percent']
+    
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = df[col].apply(clean_numeric)
+    
+    # Process text columns
+    text_columns = ['s_no', 'budget_head', 'name_of_scheme', 'sub_scheme_name',
+                  'ftr_hq_name', 'shq_name', 'location', 'work_description',
+                  'executive_agency', 'aa_es_reference', 'firm_name', 
+                  'current_status', 'remarks']
+    
+    for col in text_columns:
+        if col in df.columns:
+            df[col] = df[col].apply(clean_text)
+    
+    # Remove rows where all important columns are empty
+    important_cols = ['name_of_scheme', 'work_description', 'sd_amount_lakh']
+    mask = pd.Series([False] * len(df))
+    for col in important_cols:
+        if col in df.columns:
+            mask = mask | df[col].notna()
+    df = df[mask]
+    
+    return df
+
+def format_output_dates(df):
+    """
+    Format date columns for output (as strings in consistent format)
+    """
+    for col in OUTPUT_DATE_COLUMNS:
+        if col in df.columns:
+            # Handle NaT values
+            df[col] = df[col].apply(
+                lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else ''
+            )
+    return df
+
+def process_excel_file(file_path, output_path='consolidated_data.csv', resume=False, session=None,
+                       precompress=False):
     """
     Main function to process all sheets from Excel file using new column structure
+    Each cleaned sheet is checkpointed; with resume=True the sheets finished by
+    an interrupted run are reloaded instead of processed again
+    Sheets are read from session (a shared WorkbookSession) when given
+    With precompress=True the CSV also gets .gz/.br copies and an etags.json entry
     """
     print(f"Reading Excel file: {file_path}")
     
-    # Define expected column names
-    expected_columns = [
-        's_no', 'budget_head', 'name_of_scheme', 'sub_scheme_name',
-        'ftr_hq_name', 'shq_name', 'location', 'work_description',
-        'executive_agency', 'aa_es_reference', 'sd_amount_lakh',
-        'ts_date', 'tender_date', 'acceptance_date', 'award_date',
-        'time_allowed_days', 'pdc_agreement', 'pdc_revised',
-        'completion_date_actual', 'firm_name', 'physical_progress_percent',
-        'expenditure_previous_fy', 'expenditure_current_fy',
-        'expenditure_total', 'expenditure_percent', 'current_status', 'remarks'
-    ]
+    expected_columns = EXPECTED_COLUMNS
     
-    # Read all sheets
+    # Read all sheets (as raw rows, so only the expected columns become a DataFrame)
     try:
-        excel_file = pd.ExcelFile(file_path, engine='openpyxl')
-    except:
-        try:
-            excel_file = pd.ExcelFile(file_path, engine='xlrd')
-        except Exception as e:
-            print(f"Error reading Excel file: {e}")
-            return None
+        workbook = session or WorkbookSession(file_path, cache=False)
+    except Exception as e:
+        print(f"Error reading Excel file: {e}")
+        return None
     
-    all_data = []
+    checkpoints = SheetCheckpoints(default_checkpoint_dir(output_path), file_path,
+                                   'perfect_engineering_sheets_to_csv', resume=resume)
+    if checkpoints.resumed:
+        print(f"Resuming: {checkpoints.resumed} sheet(s) already processed")
     
-    print(f"Found {len(excel_file.sheet_names)} sheets")
+    print(f"Found {len(workbook.sheet_names)} sheets")
     
-    for sheet_name in excel_file.sheet_names:
+    for sheet_index, sheet_name in enumerate(workbook.sheet_names):
         print(f"\nProcessing sheet: {sheet_name}")
         
+        if checkpoints.completed(sheet_name):
+            print(f"  Already processed - loaded from checkpoint")
+            continue
+        
         try:
             # Read the sheet
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+            grid = workbook.grid(sheet_index)
             
             # Skip if empty or too small
-            if df.shape[0] < 1 or df.shape[1] < 5:
+            if grid.shape[0] < 1 or grid.shape[1] < 5:
                 print(f"  Skipping {sheet_name} - insufficient data")
                 continue
             
-            # Remove completely empty rows
-            df = df.dropna(how='all')
-            
-            # Handle duplicate columns
-            df = handle_duplicate_columns(df)
-            
-            # Clean column names - remove extra spaces, newlines, etc.
-            df.columns = df.columns.str.strip().str.replace('\n', ' ').str.replace('\r', ' ')
-            df.columns = df.columns.str.replace(r'\s+', ' ', regex=True)
-            
-            # Check if columns match expected structure
-            # Create a mapping for any columns that need to be renamed
-            column_mapping = {}
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                # Try to match with expected columns
-                for expected_col in expected_columns:
-                    if expected_col in col_lower or col_lower in expected_col:
-                        column_mapping[col] = expected_col
-                        break
-            
-            # Apply column mapping if any matches found
-            if column_mapping:
-                df = df.rename(columns=column_mapping)
-            
-            # Add missing expected columns with empty values
-            for col in expected_columns:
-                if col not in df.columns:
-                    df[col] = ''
-            
-            # Keep only expected columns in the correct order
-            df = df[expected_columns]
-            
-            # Add sheet name as a column
-            df['source_sheet'] = sheet_name
-            
-            # Process date columns
-            date_columns = ['ts_date', 'tender_date', 'acceptance_date', 'award_date',
-                          'pdc_agreement', 'pdc_revised', 'completion_date_actual']
-            
-            for col in date_columns:
-                if col in df.columns:
-                    print(f"  Processing date column: {col}")
-                    df[col] = df[col].apply(parse_date)
-                    # Convert to standard format
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-            
-            # Process numeric columns
-            numeric_columns = ['sd_amount_lakh', 'time_allowed_days', 'physical_progress_percent',
-                             'expenditure_previous_fy', 'expenditure_current_fy', 
-                             'expenditure_total', 'expenditure_percent']
-            
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = df[col].apply(clean_numeric)
-            
-            # Process text columns
-            text_columns = ['s_no', 'budget_head', 'name_of_scheme', 'sub_scheme_name',
-                          'ftr_hq_name', 'shq_name', 'location', 'work_description',
-                          'executive_agency', 'aa_es_reference', 'firm_name', 
-                          'current_status', 'remarks']
-            
-            for col in text_columns:
-                if col in df.columns:
-                    df[col] = df[col].apply(clean_text)
-            
-            # Remove rows where all important columns are empty
-            important_cols = ['name_of_scheme', 'work_description', 'sd_amount_lakh']
-            mask = pd.Series([False] * len(df))
-            for col in important_cols:
-                if col in df.columns:
-                    mask = mask | df[col].notna()
-            df = df[mask]
+            # Build only the columns that map onto the expected ones
+            df = grid.frame(expected_column_positions(grid.header, expected_columns))
+            df = clean_sheet(df, sheet_name, expected_columns, drop_empty_rows=False)
             
             print(f"  Retained {len(df)} rows after cleaning")
             
             if len(df) > 0:
-                # Reset index before appending
+                # Reset index before checkpointing
                 df = df.reset_index(drop=True)
-                all_data.append(df)
+                checkpoints.save(sheet_index, sheet_name, df)
                 
         except Exception as e:
             print(f"  Error processing sheet {sheet_name}: {str(e)}")
             continue
     
+    if session is None:
+        workbook.close()
+    
+    # Consolidate from the (memory-mapped) checkpoints of every finished sheet
+    all_data = checkpoints.load_all()
+    
     if not all_data:
         print("\nNo valid data found in any sheet!")
         return None
@@ -963,16 +1020,7 @@ def process_excel_file(file_path, output_path='consolidated_data.csv'):
     column_order = ['source_sheet'] + expected_columns
     consolidated_df = consolidated_df[column_order]
     
-    # Format dates for output (as strings in consistent format)
-    date_columns = ['ts_date', 'tender_date', 'acceptance_date', 'award_date',
-                   'pdc_agreement', 'pdc_revised', 'completion_date_actual']
-    
-    for col in date_columns:
-        if col in consolidated_df.columns:
-            # Handle NaT values
-            consolidated_df[col] = consolidated_df[col].apply(
-                lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else ''
-            )
+    consolidated_df = format_output_dates(consolidated_df)
     
     # Save to CSV
     print(f"\nSaving consolidated data to CSV...")
@@ -987,6 +1035,10 @@ def process_excel_file(file_path, output_path='consolidated_data.csv'):
         print(f"Error saving CSV file: {e}")
         return None
     
+    if precompress:
+        publish_precompressed([output_path])
+    
+    checkpoints.clear()
     return consolidated_df
 
 def create_summary_stats(df):
@@ -1082,25 +1134,62 @@ def analyze_consolidated_data(df):
     
     print("\n" + "="*50)
 
-# Main execution
-if __name__ == "__main__":
-    # Specify your input and output file paths
+def main():
+    """
+    Build every output from engineering.xls: the workbook pipeline's
+    engineering_consolidated.xlsx and engineering.csv, then the CSV pipeline's
+    engineering_consolidated.csv and engineering_summary.csv
+    --force rebuilds when the build manifest says nothing changed, --resume
+    continues an interrupted CSV run, --precompress publishes .gz/.br copies
+    and ETags for both CSVs
+    """
     input_file = "engineering.xls"
+    output_file = "engineering_consolidated.xlsx"
+    workbook_csv = "engineering.csv"
     output_csv = "engineering_consolidated.csv"
-    
-    # Process the file and save as CSV
-    consolidated_data = process_excel_file(input_file, output_csv)
-    
-    if consolidated_data is not None:
-        # Perform analysis
-        analyze_consolidated_data(consolidated_data)
-        
-        # Create and save summary statistics
-        summary_stats = create_summary_stats(consolidated_data)
-        summary_csv = "engineering_summary.csv"
-        summary_stats.to_csv(summary_csv, index=False)
-        print(f"\nSummary statistics saved to: {summary_csv}")
+    summary_csv = "engineering_summary.csv"
+    outputs = [output_csv, summary_csv, output_file, workbook_csv]
+    precompress = '--precompress' in sys.argv
+    
+    up_to_date, reason = check_up_to_date('perfect_engineering_sheets_to_csv', input_file, outputs)
+    if up_to_date and '--force' not in sys.argv:
+        print(f"✓ {output_csv} is up to date with {input_file} (use --force to rebuild)")
+        return 0
+    
+    # Workbook pipeline
+    workbook_data = process_excel_file_workbook(input_file, output_file)
+    if workbook_data is not None:
+        analyze_workbook_data(workbook_data)
         
-        print("\n✓ Processing complete!")
-    else:
-        print("\n✗ Processing failed. Please check the input file and try again.")
\ No newline at end of file
+        # Optional: Save as CSV for easier viewing
+        try:
+            workbook_data.to_csv(workbook_csv, index=False)
+            print(f"\nAlso saved as CSV: {workbook_csv}")
+            if precompress:
+                publish_precompressed([workbook_csv])
+        except Exception as e:
+            print(f"Could not save CSV: {e}")
+    
+    # CSV pipeline
+    consolidated_data = process_excel_file(input_file, output_csv, resume='--resume' in sys.argv,
+                                           precompress=precompress)
+    if consolidated_data is None:
+        print("\n✗ Processing failed. Please check the input file and try again.")
+        return 1
+    
+    analyze_consolidated_data(consolidated_data)
+    
+    # Create and save summary statistics
+    summary_stats = create_summary_stats(consolidated_data)
+    summary_stats.to_csv(summary_csv, index=False)
+    print(f"\nSummary statistics saved to: {summary_csv}")
+    
+    # One manifest entry for the whole build; outputs that were not written are
+    # left out of it, so the next run rebuilds instead of skipping
+    record_build('perfect_engineering_sheets_to_csv', input_file, outputs)
+    print("\n✓ Processing complete!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Pipeline DAG
+Runs a conversion as a DAG of named stages and memoizes each stage's output
+on disk. A stage's cache key is built from:
+  - its code version (hash of the source of the functions it uses)
+  - its parameters (input file hash, output paths, formats, ...)
+  - the content digests of its upstream stages' outputs
+
+so on a rerun only the stages downstream of whatever changed are recomputed.
+Because keys use upstream *content* digests, a recomputed stage whose output
+comes out identical does not invalidate the stages after it. Cached outputs are
+only loaded when a downstream stage actually needs them.
+
+Usage: python pipeline_dag.py <cache_dir>     (prints what is cached)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import time
+
+KEEP_ENTRIES = 3
+
+
+def code_version(*objects):
+    """
+    Hash of the source code of the given functions/classes
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            source = inspect.getsource(obj)
+        except (OSError, TypeError):
+            source = repr(obj)
+        digest.update(source.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class Stage:
+    """One node of the pipeline"""
+
+    def __init__(self, name, func, deps=(), code=(), params=None, validate=None):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.version = code_version(func, *code)
+        self.params = params or {}
+        self.validate = validate    # optional check that a cached result is still usable
+
+
+class Pipeline:
+    """DAG of stages with an on-disk memo cache"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.stages = {}
+        self.report = []
+        self._digests = {}
+        self._values = {}
+        self._paths = {}
+
+    def add(self, name, func, deps=(), code=(), params=None, validate=None):
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stage(s): {', '.join(missing)}")
+        self.stages[name] = Stage(name, func, deps, code, params, validate)
+
+    def stage_key(self, stage):
+        payload = json.dumps({
+            'stage': stage.name,
+            'version': stage.version,
+            'params': stage.params,
+            'deps': [self._digests[dep] for dep in stage.deps],
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]
+
+    def entry_paths(self, stage_name, key):
+        directory = os.path.join(self.cache_dir, stage_name)
+        return os.path.join(directory, f"{key}.pkl"), os.path.join(directory, f"{key}.json")
+
+    def resolve(self, name):
+        """
+        Make sure the stage's output digest is known, recomputing it if needed
+        """
+        if name in self._digests:
+            return
+        stage = self.stages[name]
+        for dep in stage.deps:
+            self.resolve(dep)
+
+        key = self.stage_key(stage)
+        data_path, meta_path = self.entry_paths(name, key)
+        if os.path.exists(data_path) and os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self._paths[name] = data_path
+            if stage.validate is None or stage.validate(self.value(name)):
+                self._digests[name] = meta['digest']
+                self.report.append((name, 'cached', 0.0))
+                return
+            self._values.pop(name, None)
+
+        started = time.perf_counter()
+        result = stage.func(*[self.value(dep) for dep in stage.deps])
+        seconds = time.perf_counter() - started
+
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(data).hexdigest()[:24]
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        with open(data_path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(data_path + '.tmp', data_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'stage': name, 'digest': digest, 'seconds': round(seconds, 3),
+                       'created': time.time()}, f)
+        self.prune(name)
+
+        self._digests[name] = digest
+        self._values[name] = result
+        self._paths[name] = data_path
+        self.report.append((name, 'ran', seconds))
+
+    def value(self, name):
+        """
+        Output of a resolved stage, loaded from the cache on first use
+        """
+        if name not in self._values:
+            with open(self._paths[name], 'rb') as f:
+                self._values[name] = pickle.load(f)
+        return self._values[name]
+
+    def run(self, *targets):
+        """
+        Resolve the target stages (all stages by default); returns their outputs
+        """
+        targets = targets or tuple(self.stages)
+        for name in targets:
+            self.resolve(name)
+        return {name: self.value(name) for name in targets}
+
+    def prune(self, stage_name):
+        """
+        Keep only the most recent cache entries of a stage
+        """
+        directory = os.path.join(self.cache_dir, stage_name)
+        metas = sorted((os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.json')),
+                       key=os.path.getmtime, reverse=True)
+        for meta_path in metas[KEEP_ENTRIES:]:
+            for path in (meta_path, meta_path[:-len('.json')] + '.pkl'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def print_report(self):
+        print("\nPipeline stages:")
+        for name, status, seconds in self.report:
+            if status == 'cached':
+                print(f"  ⚡ {name:12s} cached")
+            else:
+                print(f"  🔄 {name:12s} {seconds:6.2f}s")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    cache_dir = sys.argv[1]
+    if not os.path.isdir(cache_dir):
+        print(f"❌ Error: Cache directory not found: {cache_dir}")
+        sys.exit(1)
+
+    for stage_name in sorted(os.listdir(cache_dir)):
+        directory = os.path.join(cache_dir, stage_name)
+        if not os.path.isdir(directory):
+            continue
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith('.json'):
+                with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                    entries.append(json.load(f))
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"{stage_name:12s} {len(entries)} entr{'y' if len(entries) == 1 else 'ies'}, {size / 1024:,.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Precompressed Static Artifacts
+Writes .gz and .br siblings next to published data files at maximum compression
+and records a content-hash ETag for each file in etags.json in the same directory.
+
+Static servers can send the precompressed bytes directly and use the ETag (or
+the sha256) for long-lived caching and If-None-Match checks.
+
+Usage: python precompress.py file1.csv [file2.json ...]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from file_lock import locked, write_bytes_atomic, write_json_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ETAG_MANIFEST_NAME = 'etags.json'
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Outputs that are already compressed gain nothing from gzip/brotli
+COMPRESSIBLE_EXTENSIONS = ('.csv', '.json', '.arrow', '.txt', '.ndjson')
+
+
+def is_compressible(path):
+    return path.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def read_etag_manifest(directory):
+    manifest_path = os.path.join(directory, ETAG_MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_etag_manifest(directory, entries):
+    write_json_atomic(os.path.join(directory, ETAG_MANIFEST_NAME), entries)
+
+
+def update_etag_manifest(directory, updates=None, removed=()):
+    """
+    Merge entries into (and drop names from) a directory's etags.json under
+    its lock: other jobs writing to the same directory keep their entries
+    """
+    manifest_path = os.path.join(directory, ETAG_MANIFEST_NAME)
+    with locked(manifest_path):
+        entries = read_etag_manifest(directory)
+        entries.update(updates or {})
+        for name in removed:
+            entries.pop(name, None)
+        write_etag_manifest(directory, entries)
+    return entries
+
+
+def _write_atomic(path, content):
+    write_bytes_atomic(path, content)
+
+
+def compress_file(path, previous=None):
+    """
+    Write path.gz and path.br for one file and return its manifest entry
+    Files whose hash matches the previous entry (and whose siblings exist) are skipped
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    entry = {
+        'sha256': sha256,
+        'etag': f'"{sha256[:16]}"',
+        'bytes': len(content),
+    }
+
+    gz_path = path + '.gz'
+    br_path = path + '.br'
+    unchanged = (
+        previous is not None and previous.get('sha256') == sha256
+        and os.path.exists(gz_path)
+        and (brotli is None or os.path.exists(br_path))
+    )
+    if unchanged:
+        entry.update({key: previous[key] for key in ('gzip_bytes', 'br_bytes') if key in previous})
+        entry['skipped'] = True
+        return entry
+
+    # mtime=0 keeps the gzip bytes identical for identical content
+    gz_content = gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+    _write_atomic(gz_path, gz_content)
+    entry['gzip_bytes'] = len(gz_content)
+
+    if brotli is not None:
+        br_content = brotli.compress(content, quality=BROTLI_QUALITY)
+        _write_atomic(br_path, br_content)
+        entry['br_bytes'] = len(br_content)
+
+    return entry
+
+
+def precompress_files(paths, max_workers=None):
+    """
+    Precompress files on a thread pool and update each directory's etags.json
+    Returns {path: manifest entry}
+    """
+    paths = [path for path in paths if os.path.isfile(path)]
+    if not paths:
+        return {}
+
+    # Group by directory so each manifest is read and updated once
+    manifests = {}
+    for path in paths:
+        directory = os.path.dirname(os.path.abspath(path))
+        if directory not in manifests:
+            manifests[directory] = read_etag_manifest(directory)
+
+    results = {}
+    updates = {directory: {} for directory in manifests}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for path in paths:
+            directory = os.path.dirname(os.path.abspath(path))
+            previous = manifests[directory].get(os.path.basename(path))
+            futures[path] = executor.submit(compress_file, path, previous)
+
+        for path, future in futures.items():
+            entry = future.result()
+            results[path] = entry
+            directory = os.path.dirname(os.path.abspath(path))
+            updates[directory][os.path.basename(path)] = {
+                key: value for key, value in entry.items() if key != 'skipped'
+            }
+
+    # Re-read under the lock: concurrent jobs may have added entries meanwhile
+    for directory, entries in updates.items():
+        update_etag_manifest(directory, entries)
+
+    return results
+
+
+def print_report(results):
+    """
+    Print original and compressed sizes for each file
+    """
+    for path, entry in results.items():
+        if entry.get('skipped'):
+            print(f"  • {os.path.basename(path):40s} unchanged {entry['etag']}")
+            continue
+        line = f"  • {os.path.basename(path):40s} {entry['bytes'] / 1024:9.1f} KB"
+        line += f"  gz {entry['gzip_bytes'] / 1024:8.1f} KB"
+        if 'br_bytes' in entry:
+            line += f"  br {entry['br_bytes'] / 1024:8.1f} KB"
+        print(line)
+
+
+def publish_precompressed(paths):
+    """
+    Precompress the compressible files among paths and print the report
+    Used by the converters for their published outputs; returns False on failure
+    """
+    paths = [path for path in paths if is_compressible(path)]
+    if not paths:
+        return True
+
+    print(f"\nPrecompressing {len(paths)} output(s)...")
+    try:
+        print_report(precompress_files(paths))
+    except Exception as e:
+        print(f"Could not precompress outputs: {e}")
+        return False
+    return True
+
+
+def main():
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python precompress.py file1.csv [file2.json ...]")
+        sys.exit(1)
+
+    if brotli is None:
+        print("brotli is not installed - writing .gz files only")
+
+    print_report(precompress_files(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Workbook Reader Backends
+Detects what an input file really is from its first bytes (not its extension)
+and opens it with the backend for that format, instead of trying one engine
+after another:
+
+  - OLE2 compound file (D0 CF 11 E0 A1 B1 1A E1): legacy .xls
+  - zip archive (PK 03 04): .xlsx
+  - HTML (a page or table saved with an .xls/.csv name)
+  - anything else: delimited text (CSV), separator and encoding sniffed
+
+Backends are registered per format in order of preference: xlrd for .xls,
+openpyxl for .xlsx, and lxml for HTML with a standard-library table parser as
+the fallback. A backend that fails to open the file hands over to the next one
+for the same format. python-calamine (Rust, faster) is only used when named
+(open_workbook(..., backend='calamine'), convert_cli --backend calamine): its
+cell types differ from xlrd's and openpyxl's in places, so by default the
+output does not depend on whether it happens to be installed.
+
+Every backend returns a workbook with sheet_names and parse(sheet_name) giving
+a DataFrame with the first row as header (pd.ExcelFile's interface).
+
+Usage: python reader_backends.py <file>     (detected format and available backends)
+"""
+
+import csv
+import importlib.util
+import io
+import os
+import sys
+from html.parser import HTMLParser
+
+import pandas as pd
+
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ZIP_MAGICS = (b'PK\x03\x04', b'PK\x05\x06')
+HTML_MARKERS = (b'<!doctype html', b'<html', b'<table', b'<head', b'<body')
+
+# Bytes read to detect the format / sniff a CSV's separator
+SNIFF_BYTES = 4096
+
+CSV_SEPARATORS = ',;\t|'
+CSV_ENCODINGS = ['utf-8-sig', 'cp1252', 'latin-1']
+
+
+def read_head(source, size=SNIFF_BYTES):
+    if isinstance(source, bytes):
+        return source[:size]
+    with open(source, 'rb') as f:
+        return f.read(size)
+
+
+def read_bytes(source):
+    """
+    All bytes of a path or an open binary file
+    """
+    if hasattr(source, 'read'):
+        return source.read()
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def detect_format(source):
+    """
+    'xls', 'xlsx', 'html' or 'csv' for a path or the file's bytes
+    """
+    head = read_head(source)
+    if head.startswith(OLE2_MAGIC):
+        return 'xls'
+    if head.startswith(ZIP_MAGICS):
+        return 'xlsx'
+
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        text = head.decode('utf-16', errors='ignore').encode('ascii', errors='ignore')
+    else:
+        text = head
+    text = text.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if any(marker in text for marker in HTML_MARKERS):
+        return 'html'
+    return 'csv'
+
+
+class ReaderBackend:
+    """One way of reading one file format"""
+
+    def __init__(self, name, file_format, requires, open_workbook, explicit=False):
+        self.name = name
+        self.file_format = file_format
+        self.requires = requires
+        self.open_workbook = open_workbook
+        # Used only when asked for by name
+        self.explicit = explicit
+
+    def available(self):
+        return all(importlib.util.find_spec(module) is not None for module in self.requires)
+
+    def open(self, source):
+        return self.open_workbook(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+# file format -> backends, preferred first
+BACKENDS = {'xls': [], 'xlsx': [], 'html': [], 'csv': []}
+
+
+def register(name, file_format, requires=(), explicit=False):
+    """
+    Decorator adding a backend (a function opening a path or file object) for
+    file_format, after the ones already registered. An explicit backend is
+    never picked by default
+    """
+    def decorator(open_workbook):
+        BACKENDS[file_format].append(ReaderBackend(name, file_format, tuple(requires), open_workbook, explicit))
+        return open_workbook
+    return decorator
+
+
+def available_backends(file_format, backend=None):
+    """
+    Installed backends for file_format: the one named backend, else the
+    default (non-explicit) ones in order
+    """
+    return [candidate for candidate in BACKENDS[file_format] if candidate.available()
+            and (candidate.name == backend if backend is not None else not candidate.explicit)]
+
+
+class FrameWorkbook:
+    """Already parsed tables behind pd.ExcelFile's interface"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.sheet_names = list(frames)
+
+    def parse(self, sheet_name=0, header=0, **kwargs):
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        return self.frames[sheet_name].copy()
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def frame_from_rows(rows):
+    """
+    DataFrame from text rows, first row as header, typed like read_excel
+    """
+    from sheet_grid import cell_value, header_names, infer_column
+
+    rows = [[cell_value(value) for value in row] for row in rows]
+    width = max((len(row) for row in rows), default=0)
+    if not rows or width == 0:
+        return pd.DataFrame()
+    header = header_names(rows[0] + [None] * (width - len(rows[0])))
+    data = [row + [None] * (width - len(row)) for row in rows[1:]]
+    return pd.DataFrame({name: infer_column([row[i] for row in data]) for i, name in enumerate(header)},
+                        index=pd.RangeIndex(len(data)))
+
+
+@register('xlrd', 'xls', requires=['xlrd'])
+def open_xlrd(source):
+    return pd.ExcelFile(source, engine='xlrd')
+
+
+@register('openpyxl', 'xlsx', requires=['openpyxl'])
+def open_openpyxl(source):
+    return pd.ExcelFile(source, engine='openpyxl')
+
+
+@register('calamine', 'xlsx', requires=['python_calamine'], explicit=True)
+@register('calamine', 'xls', requires=['python_calamine'], explicit=True)
+def open_calamine(source):
+    return pd.ExcelFile(source, engine='calamine')
+
+
+@register('lxml', 'html', requires=['lxml'])
+def open_html_lxml(source):
+    tables = pd.read_html(source, flavor='lxml')
+    return FrameWorkbook({f"Table {i + 1}": table for i, table in enumerate(tables)})
+
+
+class _TableParser(HTMLParser):
+    """Collects the text of every <table>'s cells, row by row"""
+
+    def __init__(self):
+        super().__init__()
+        self.tables = []
+        self.row = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.tables.append([])
+        elif tag == 'tr' and self.tables:
+            self.row = []
+            self.tables[-1].append(self.row)
+        elif tag in ('td', 'th') and self.row is not None:
+            self.cell = []
+        elif tag == 'br' and self.cell is not None:
+            self.cell.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th') and self.cell is not None:
+            self.row.append(' '.join(''.join(self.cell).split()))
+            self.cell = None
+        elif tag == 'tr':
+            self.row = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+@register('html.parser', 'html')
+def open_html_stdlib(source):
+    raw = read_bytes(source)
+    parser = _TableParser()
+    parser.feed(decode_text(raw))
+    parser.close()
+    tables = [table for table in parser.tables if table]
+    if not tables:
+        raise ValueError("no <table> found in the HTML file")
+    return FrameWorkbook({f"Table {i + 1}": frame_from_rows(table) for i, table in enumerate(tables)})
+
+
+def decode_text(raw):
+    """
+    Text of a file's bytes: UTF-16 when it has a BOM, else the first encoding
+    in CSV_ENCODINGS that decodes it
+    """
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return raw.decode('utf-16')
+    for encoding in CSV_ENCODINGS:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode('latin-1')
+
+
+def sniff_separator(sample):
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=CSV_SEPARATORS).delimiter
+    except csv.Error:
+        return ','
+
+
+@register('pandas-csv', 'csv')
+def open_csv(source):
+    raw = read_bytes(source)
+    text = decode_text(raw)
+    separator = sniff_separator(text[:SNIFF_BYTES])
+    df = pd.read_csv(io.StringIO(text), sep=separator, on_bad_lines='skip', low_memory=False)
+    return FrameWorkbook({'Sheet1': df})
+
+
+def open_workbook(source, backend=None):
+    """
+    Open a path (or the file's bytes) with the first available default backend
+    for its detected format (or the named one); returns (workbook, backend)
+    """
+    file_format = detect_format(source)
+    candidates = available_backends(file_format, backend)
+    errors = []
+    for candidate in candidates:
+        try:
+            return candidate.open(source), candidate
+        except Exception as e:
+            errors.append(f"{candidate.name}: {e}")
+    if not candidates:
+        errors.append(f"no backend named {backend} installed" if backend else "no backend installed")
+    raise ValueError(f"Cannot read {file_format} file ({'; '.join(errors)})")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    if not os.path.exists(path):
+        print(f"❌ Error: File not found: {path}")
+        sys.exit(1)
+
+    file_format = detect_format(path)
+    print(f"📊 {path}: {file_format}")
+    for backend in BACKENDS[file_format]:
+        status = '✅ available' if backend.available() else f"❌ needs {', '.join(backend.requires)}"
+        print(f"  • {backend.name}: {status}{' (only when named)' if backend.explicit else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Frontier Shard Exporter
+Splits the consolidated works data into one CSV per frontier (optionally per
+frontier and budget head) and writes a manifest.json describing every shard:
+row count, byte size, SHA-256 content hash and precomputed totals.
+
+Clients fetch only the shards they need; top-level totals can be answered from
+the manifest alone.
+
+Usage: python shard_export.py [input.csv] [output_dir] [--by-budget-head] [--precompress]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+from amount_parsing import to_amounts
+from file_lock import write_bytes_atomic
+from precompress import ETAG_MANIFEST_NAME, precompress_files, update_etag_manifest
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Frontier column in the dashboard schema, then in the ExcelProcessor schema
+FRONTIER_COLUMNS = ['ftr_hq_name', 'ftr_hq']
+BUDGET_HEAD_COLUMN = 'budget_head'
+
+# Amount columns summed into each shard's totals (whichever are present)
+TOTAL_COLUMNS = [
+    'sd_amount_lakh', 'expenditure_previous_fy', 'expenditure_current_fy', 'expenditure_total',
+    'sanctioned_amount', 'expdr_upto_31mar25', 'expdr_cfy', 'total_expdr'
+]
+
+UNASSIGNED = '_unassigned'
+
+
+def slugify(value):
+    """
+    Turn a partition value into a safe file name component
+    """
+    slug = re.sub(r'[^\w]+', '_', str(value).strip().lower()).strip('_')
+    return slug or UNASSIGNED
+
+
+def compute_totals(df):
+    """
+    Sum every known amount column present in df
+    """
+    totals = {}
+    for col in TOTAL_COLUMNS:
+        if col in df.columns:
+            totals[col] = round(float(to_amounts(df[col], loose=True).sum()), 2)
+    return totals
+
+
+def resolve_partition_columns(df, by_budget_head=False):
+    frontier_col = next((col for col in FRONTIER_COLUMNS if col in df.columns), None)
+    if frontier_col is None:
+        raise ValueError(f"No frontier column found (expected one of {FRONTIER_COLUMNS})")
+
+    columns = [frontier_col]
+    if by_budget_head and BUDGET_HEAD_COLUMN in df.columns:
+        columns.append(BUDGET_HEAD_COLUMN)
+    return columns
+
+
+def export_shards(df, output_dir, by_budget_head=False, source=None, precompress=False):
+    """
+    Write one CSV shard per partition plus manifest.json into output_dir
+    With precompress=True, .gz/.br siblings and etags.json are written as well
+    Returns the manifest dict
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    partition_columns = resolve_partition_columns(df, by_budget_head)
+
+    # Blank partition values get their own shard instead of being dropped
+    keys = df[partition_columns].fillna('').astype(str).apply(lambda col: col.str.strip())
+
+    shards = []
+    used_names = set()
+    for key_values, shard_df in df.groupby([keys[col] for col in partition_columns], sort=True):
+        if not isinstance(key_values, tuple):
+            key_values = (key_values,)
+
+        base_name = '__'.join(slugify(value) for value in key_values)
+        file_name = f"{base_name}.csv"
+        counter = 1
+        while file_name in used_names:
+            file_name = f"{base_name}_{counter}.csv"
+            counter += 1
+        used_names.add(file_name)
+        content = shard_df.to_csv(index=False).encode('utf-8')
+
+        # Readers (and the precompressor) never see a half-written shard
+        write_bytes_atomic(os.path.join(output_dir, file_name), content)
+
+        shards.append({
+            'file': file_name,
+            'keys': dict(zip(partition_columns, key_values)),
+            'rows': len(shard_df),
+            'bytes': len(content),
+            'sha256': hashlib.sha256(content).hexdigest(),
+            'totals': compute_totals(shard_df),
+        })
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'partition_by': partition_columns,
+        'columns': [str(col) for col in df.columns],
+        'rows': len(df),
+        'totals': compute_totals(df),
+        'shards': shards,
+    }
+
+    # Remove shards from a previous export that no longer exist, along with
+    # their precompressed siblings and etags.json entries
+    previous = read_manifest(output_dir)
+    if previous:
+        current_files = {shard['file'] for shard in shards}
+        stale_files = [shard['file'] for shard in previous.get('shards', [])
+                       if shard['file'] not in current_files]
+        for file_name in stale_files:
+            stale_path = os.path.join(output_dir, file_name)
+            for path in (stale_path, stale_path + '.gz', stale_path + '.br'):
+                if os.path.exists(path):
+                    os.remove(path)
+        if stale_files and os.path.exists(os.path.join(output_dir, ETAG_MANIFEST_NAME)):
+            update_etag_manifest(output_dir, removed=stale_files)
+
+    if precompress:
+        precompress_files([os.path.join(output_dir, shard['file']) for shard in shards])
+
+    # Write the manifest last so readers never see it point at missing shards
+    write_bytes_atomic(os.path.join(output_dir, MANIFEST_NAME),
+                       json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    return manifest
+
+
+def read_manifest(shard_dir):
+    """
+    Load manifest.json from shard_dir (None if missing)
+    """
+    manifest_path = os.path.join(shard_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def select_shards(manifest, **filters):
+    """
+    Return the manifest entries matching all filters, e.g.
+    select_shards(manifest, ftr_hq_name=['FTR PB', 'Jammu'])
+    """
+    selected = []
+    for shard in manifest['shards']:
+        matches = True
+        for col, wanted in filters.items():
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            if shard['keys'].get(col) not in wanted:
+                matches = False
+                break
+        if matches:
+            selected.append(shard)
+    return selected
+
+
+def load_shards(shard_dir, verify=False, **filters):
+    """
+    Load only the shards matching filters into one DataFrame
+    With verify=True each shard's SHA-256 is checked against the manifest
+    """
+    manifest = read_manifest(shard_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {shard_dir}")
+
+    frames = []
+    for shard in select_shards(manifest, **filters):
+        path = os.path.join(shard_dir, shard['file'])
+        if verify:
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != shard['sha256']:
+                    raise ValueError(f"Content hash mismatch for shard {shard['file']}")
+        frames.append(pd.read_csv(path, dtype=str, keep_default_na=False))
+
+    if not frames:
+        return pd.DataFrame(columns=manifest['columns'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def manifest_totals(shard_dir, **filters):
+    """
+    Answer row counts and amount totals from the manifest alone
+    """
+    manifest = read_manifest(shard_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {shard_dir}")
+
+    if not filters:
+        return {'rows': manifest['rows'], **manifest['totals']}
+
+    totals = {'rows': 0}
+    for shard in select_shards(manifest, **filters):
+        totals['rows'] += shard['rows']
+        for col, value in shard['totals'].items():
+            totals[col] = round(totals.get(col, 0) + value, 2)
+    return totals
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    by_budget_head = '--by-budget-head' in sys.argv
+    precompress = '--precompress' in sys.argv
+
+    input_file = args[0] if len(args) > 0 else 'engineering.csv'
+    output_dir = args[1] if len(args) > 1 else 'shards'
+
+    if not os.path.exists(input_file):
+        print(f"❌ Error: Input file not found: {input_file}")
+        sys.exit(1)
+
+    df = pd.read_csv(input_file, dtype=str, keep_default_na=False)
+    manifest = export_shards(df, output_dir, by_budget_head=by_budget_head,
+                             source=input_file, precompress=precompress)
+
+    print(f"Exported {len(manifest['shards'])} shards ({manifest['rows']:,} rows) to {output_dir}")
+    for shard in manifest['shards']:
+        label = ' / '.join(value or UNASSIGNED for value in shard['keys'].values())
+        print(f"  • {label:40s} {shard['rows']:6,} rows  {shard['bytes'] / 1024:8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Per-Sheet Checkpoints
+Saves each sheet's cleaned DataFrame to a scratch directory as soon as it is
+processed, so a conversion that crashes on a later sheet (or is interrupted)
+can resume with only the remaining sheets.
+
+  - sheets are stored as uncompressed Arrow IPC files, read back through a
+    memory map at consolidation time; object columns Arrow would change (any
+    value that isn't a string: ints or bools that come back as floats once
+    a value is missing, None that comes back as NaN/NaT, mixed types) are
+    kept in a pickled side file so the round trip is exact
+  - without pyarrow, sheets are pickled
+  - a checkpoint is only resumed for the same input content and converter
+    version; otherwise the scratch directory is cleared
+
+Usage: python sheet_checkpoints.py <checkpoint_dir>     (lists finished sheets)
+"""
+
+import json
+import os
+import pickle
+import shutil
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from build_manifest import TARGETS, converter_version, hash_file
+
+MANIFEST_NAME = 'checkpoint.json'
+
+
+def default_checkpoint_dir(output_path):
+    """
+    Scratch directory next to the output, so checkpoints survive a restart
+    """
+    directory = os.path.dirname(os.path.abspath(output_path))
+    return os.path.join(directory, '.checkpoints', os.path.basename(output_path))
+
+
+def split_arrow_columns(df):
+    """
+    Split columns into those Arrow stores exactly and the object columns it
+    would change: only object columns holding nothing but strings (no missing
+    values, which Arrow can't tell apart) go to Arrow
+    """
+    arrow_columns, other_columns = [], []
+    for col in df.columns:
+        if df[col].dtype == object and not all(type(value) is str for value in df[col]):
+            other_columns.append(col)
+        else:
+            arrow_columns.append(col)
+    return arrow_columns, other_columns
+
+
+class SheetCheckpoints:
+    """Finished sheets of one conversion, keyed by sheet name"""
+
+    def __init__(self, directory, input_path, converter, resume=False):
+        self.directory = directory
+        self.signature = {
+            'input': os.path.abspath(input_path),
+            'input_sha256': hash_file(input_path),
+            'converter': converter,
+            'converter_version': converter_version(converter) if converter in TARGETS else None,
+        }
+        self.sheets = {}
+        self.resumed = 0
+
+        manifest = self.read_manifest()
+        if resume and manifest is not None and manifest.get('signature') == self.signature:
+            self.sheets = manifest['sheets']
+            self.resumed = len(self.sheets)
+        else:
+            if resume and manifest is not None:
+                print("  Checkpoints are from a different input or converter version - starting over")
+            self.clear()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def read_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write_manifest(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'signature': self.signature, 'sheets': self.sheets}, f, ensure_ascii=False, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def completed(self, sheet_name):
+        return sheet_name in self.sheets
+
+    def save(self, index, sheet_name, df):
+        """
+        Checkpoint one processed sheet (index = its position in the workbook)
+        """
+        base = os.path.join(self.directory, f"sheet_{index:03d}")
+        entry = {
+            'index': index,
+            'rows': len(df),
+            'columns': [str(col) for col in df.columns],
+            'dtypes': {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+            'arrow': None,
+            'pickle': None,
+        }
+
+        arrow_columns, other_columns = (split_arrow_columns(df) if pa is not None
+                                        else ([], list(df.columns)))
+        try:
+            if arrow_columns:
+                table = pa.Table.from_pandas(df[arrow_columns], preserve_index=False)
+                with pa.OSFile(base + '.arrow.tmp', 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(base + '.arrow.tmp', base + '.arrow')
+                entry['arrow'] = os.path.basename(base) + '.arrow'
+        except (pa.ArrowException, TypeError, ValueError):
+            other_columns = list(df.columns)
+
+        if other_columns:
+            with open(base + '.pkl.tmp', 'wb') as f:
+                pickle.dump(df[other_columns], f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(base + '.pkl.tmp', base + '.pkl')
+            entry['pickle'] = os.path.basename(base) + '.pkl'
+
+        self.sheets[sheet_name] = entry
+        self.write_manifest()
+
+    def load(self, sheet_name):
+        """
+        Read a checkpointed sheet; the Arrow part is memory-mapped
+        """
+        entry = self.sheets[sheet_name]
+        parts = []
+        if entry['arrow']:
+            source = pa.memory_map(os.path.join(self.directory, entry['arrow']), 'r')
+            parts.append(pa.ipc.open_file(source).read_all().to_pandas())
+        if entry['pickle']:
+            with open(os.path.join(self.directory, entry['pickle']), 'rb') as f:
+                parts.append(pickle.load(f).reset_index(drop=True))
+
+        df = pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+        df = df[entry['columns']]
+
+        # A string column may come back as pandas' string dtype; restore the
+        # original so outputs are unchanged
+        for col, dtype in entry['dtypes'].items():
+            if dtype == 'object' and str(df[col].dtype) != 'object':
+                df[col] = df[col].astype(object)
+        return df
+
+    def load_all(self):
+        """
+        All checkpointed sheets in workbook order
+        """
+        names = sorted(self.sheets, key=lambda name: self.sheets[name]['index'])
+        return [self.load(name) for name in names]
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        # Drop the shared .checkpoints directory once nothing is left in it
+        parent = os.path.dirname(self.directory)
+        if os.path.isdir(parent) and not os.listdir(parent):
+            os.rmdir(parent)
+        self.sheets = {}
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    path = os.path.join(sys.argv[1], MANIFEST_NAME)
+    if not os.path.exists(path):
+        print(f"❌ Error: No checkpoint found in {sys.argv[1]}")
+        sys.exit(1)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    print(f"Input: {manifest['signature']['input']}")
+    for name, entry in sorted(manifest['sheets'].items(), key=lambda item: item[1]['index']):
+        print(f"  • {name}: {entry['rows']} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Raw Sheet Grids
+Reads workbook sheets as plain rows of cell values, the way pandas.read_excel
+sees them, so converters can look at a sheet's header before deciding which
+columns to build a DataFrame from:
+
+  - cells are normalized like read_excel's readers (pandas' NA strings become
+    missing, whole floats become int, Excel errors become missing)
+  - the first row is the header: blank cells become 'Unnamed: i' and repeated
+    names get '.1', '.2', ...
+  - SheetGrid.frame builds the DataFrame of only the selected columns and
+    applies read_excel's per-column type inference to them, so a projected
+    frame holds exactly the values read_excel would have returned for those
+    columns; rows blank across the whole sheet row are dropped (as
+    dropna(how='all') on the full frame would)
+  - .xls goes through lazy_xls (memory-mapped, one sheet at a time), .xlsx
+    through openpyxl read-only mode
+
+Usage: python sheet_grid.py <file.xls|xlsx>     (lists sheets with their headers)
+"""
+
+import io
+import math
+import os
+import sys
+
+import pandas as pd
+
+from reader_backends import detect_format
+
+# Strings pandas.read_excel reads as missing by default
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+}
+
+
+def cell_value(value):
+    """
+    Normalize one cell like pandas' Excel readers: NA strings become None,
+    whole floats become int
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return None if value in NA_STRINGS else value
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None if math.isnan(value) else value
+        if value == int(value):
+            return int(value)
+    return value
+
+
+def is_blank(row):
+    return all(value is None for value in row)
+
+
+def header_names(row):
+    """
+    Column names from the header row: blank cells become 'Unnamed: i' and
+    repeated names get '.1', '.2', ... (as in pandas)
+    """
+    names = [f"Unnamed: {i}" if value is None else value for i, value in enumerate(row)]
+    counts = {}
+    for i, name in enumerate(names):
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def infer_column(values):
+    """
+    read_excel's type inference for one column of cell values: numeric when
+    every value converts, otherwise the usual object inference (str,
+    datetime64, ...); missing cells are NaN, as read_excel leaves them
+    """
+    series = pd.Series([math.nan if value is None else value for value in values], dtype=object)
+    try:
+        return pd.to_numeric(series)
+    except (ValueError, TypeError):
+        return series.infer_objects()
+
+
+class RawWorkbook:
+    """A workbook (path or bytes) read sheet by sheet as rows of cell values"""
+
+    def __init__(self, source):
+        if detect_format(source) == 'xlsx':
+            from openpyxl import load_workbook
+
+            self.xlsx = load_workbook(io.BytesIO(source) if isinstance(source, bytes) else source,
+                                      read_only=True, data_only=True)
+            self.xls = None
+            self.sheet_names = self.xlsx.sheetnames
+        else:
+            from lazy_xls import LazyWorkbook
+
+            self.xls = LazyWorkbook(source)
+            self.xlsx = None
+            self.sheet_names = self.xls.sheet_names()
+
+    def iter_sheets(self):
+        """
+        Yield (sheet_index, sheet_name, row iterator); a sheet is only read
+        while its rows are being consumed
+        """
+        for sheet_idx, sheet_name in enumerate(self.sheet_names):
+            yield sheet_idx, sheet_name, self.rows(sheet_idx)
+            if self.xls is not None:
+                self.xls.unload(sheet_idx)
+
+    def rows(self, sheet_idx):
+        """
+        Row iterator over one sheet (an .xls sheet stays loaded until unloaded)
+        """
+        if self.xlsx is not None:
+            return self._xlsx_rows(self.xlsx.worksheets[sheet_idx])
+        return self._xls_rows(sheet_idx)
+
+    @staticmethod
+    def _xlsx_rows(sheet):
+        # Like read_excel, ignore the stored dimensions: when a sheet has
+        # none, openpyxl would scan the whole sheet to compute them
+        sheet.reset_dimensions()
+        for cells in sheet.iter_rows():
+            row = [None if getattr(cell, 'data_type', None) == 'e' else cell_value(cell.value)
+                   for cell in cells]
+            while row and row[-1] is None:
+                row.pop()
+            yield row
+
+    def _xls_rows(self, sheet_idx):
+        import xlrd
+
+        sheet = self.xls.sheet(sheet_idx)
+        datemode = self.xls.datemode
+        for r in range(sheet.nrows):
+            row = []
+            for ctype, value in zip(sheet.row_types(r), sheet.row_values(r)):
+                if ctype == xlrd.XL_CELL_DATE:
+                    try:
+                        value = xlrd.xldate.xldate_as_datetime(value, datemode)
+                    except (OverflowError, ValueError, xlrd.xldate.XLDateError):
+                        pass
+                elif ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                    value = None
+                elif ctype == xlrd.XL_CELL_BOOLEAN:
+                    value = bool(value)
+                row.append(cell_value(value))
+            yield row
+
+    def close(self):
+        if self.xlsx is not None:
+            self.xlsx.close()
+        else:
+            self.xls.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SheetGrid:
+    """
+    One sheet's rows as read_excel would size them: trailing blank rows
+    dropped, every row as wide as the widest one
+    """
+
+    def __init__(self, rows):
+        rows = list(rows)
+        while rows and is_blank(rows[-1]):
+            rows.pop()
+        self.width = max((len(row) for row in rows), default=0)
+        self.first_row = rows[0] if rows else []
+        self.header = header_names(self.first_row + [None] * (self.width - len(self.first_row))) if rows else []
+        self.rows = rows[1:]
+
+    @property
+    def shape(self):
+        """The shape of the DataFrame read_excel returns for the sheet"""
+        return len(self.rows), self.width
+
+    def frame(self, positions=None, drop_blank_rows=True):
+        """
+        DataFrame of the columns at positions (all columns when None), with
+        read_excel's per-column types; rows blank across the whole sheet row
+        are left out (as dropna(how='all') on the full frame would), the rest
+        keep their row position as index
+        With drop_blank_rows=False every row is kept: exactly what read_excel
+        returns for the sheet
+        """
+        if positions is None:
+            positions = range(self.width)
+        columns = {}
+        for i in positions:
+            columns[self.header[i]] = infer_column([row[i] if i < len(row) else None for row in self.rows])
+        df = pd.DataFrame(columns, index=pd.RangeIndex(len(self.rows)))
+
+        if not drop_blank_rows:
+            return df
+        keep = [not is_blank(row) for row in self.rows]
+        if not all(keep):
+            df = df[keep]
+        return df
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    if not os.path.exists(path):
+        print(f"❌ Error: File not found: {path}")
+        sys.exit(1)
+
+    with RawWorkbook(path) as workbook:
+        for _, sheet_name, rows in workbook.iter_sheets():
+            header = next(rows, [])
+            names = [name for name in header_names(header) if not str(name).startswith('Unnamed: ')]
+            print(f"  • {sheet_name}: {len(header)} columns {names[:6]}")
+
+
+if __name__ == "__main__":
+    main()
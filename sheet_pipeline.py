@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Pipelined Sheet Processing
+Overlaps reading with cleaning: a reader thread decodes sheets (or row batches)
+into a bounded queue while cleaning workers consume from it.
+
+  - the queue holds at most max_queued items; when it is full the reader
+    blocks (backpressure), so at most max_queued + workers + 1 decoded items
+    are in memory at once
+  - results are returned in the order the reader produced them
+  - the first error in the reader or any worker stops the pipeline and is re-raised
+  - busy and idle time are recorded per stage to show which one is the bottleneck
+"""
+
+import queue
+import threading
+import time
+
+POLL_SECONDS = 0.1
+
+
+class PipelineStats:
+    """Busy/idle time of the reader and each cleaning worker"""
+
+    def __init__(self, workers, max_queued):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.items = 0
+        self.max_depth = 0
+        self.reader_busy = 0.0
+        self.reader_blocked = 0.0
+        self.worker_busy = [0.0] * workers
+        self.worker_idle = [0.0] * workers
+        self.wall = 0.0
+
+    def bottleneck(self):
+        """
+        The stage with more busy time per thread: 'reading' or 'cleaning'
+        """
+        return 'reading' if self.reader_busy > sum(self.worker_busy) / self.workers else 'cleaning'
+
+    def print_report(self):
+        print(f"\nPipeline: reader -> queue ({self.max_queued}) -> {self.workers} cleaning worker(s), "
+              f"{self.items} item(s) in {self.wall:.2f}s")
+        print(f"  • Reader:   busy {self.reader_busy:6.2f}s   blocked on full queue {self.reader_blocked:6.2f}s")
+        for i in range(self.workers):
+            print(f"  • Worker {i + 1}: busy {self.worker_busy[i]:6.2f}s   idle on empty queue {self.worker_idle[i]:8.2f}s")
+        print(f"  • Peak queue depth: {self.max_depth}/{self.max_queued}")
+        print(f"  • Bottleneck: {self.bottleneck()}")
+
+
+def run_pipelined(items, consume, workers=1, max_queued=2):
+    """
+    Feed items (an iterable, consumed on the reader thread) through consume
+    on the worker threads; returns ([results in item order], stats)
+    """
+    work = queue.Queue(maxsize=max_queued)
+    stats = PipelineStats(workers, max_queued)
+    results = {}
+    errors = []
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                work.put(entry, timeout=POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        iterator = iter(items)
+        seq = 0
+        try:
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.reader_busy += time.perf_counter() - started
+
+                started = time.perf_counter()
+                if not put((seq, item)):
+                    return
+                stats.reader_blocked += time.perf_counter() - started
+                stats.max_depth = max(stats.max_depth, work.qsize())
+                stats.items += 1
+                seq += 1
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            for _ in range(workers):
+                put(None)
+
+    def worker(index):
+        while True:
+            started = time.perf_counter()
+            try:
+                entry = work.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                stats.worker_idle[index] += time.perf_counter() - started
+                if stop.is_set():
+                    return
+                continue
+            stats.worker_idle[index] += time.perf_counter() - started
+            if entry is None:
+                return
+
+            seq, item = entry
+            started = time.perf_counter()
+            try:
+                results[seq] = consume(item)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+                return
+            stats.worker_busy[index] += time.perf_counter() - started
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=reader, name='sheet-reader', daemon=True)]
+    threads += [threading.Thread(target=worker, args=(i,), name=f'sheet-cleaner-{i + 1}', daemon=True)
+                for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.wall = time.perf_counter() - started
+
+    if errors:
+        raise errors[0]
+    return [results[seq] for seq in sorted(results)], stats
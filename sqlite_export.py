@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+SQLite Export Store
+Loads the consolidated works data into a SQLite database so paging, filtering
+and aggregate queries become indexed lookups instead of full CSV re-parses.
+
+  - typed columns (REAL for amounts, ISO-8601 TEXT for dates, TEXT otherwise);
+    REAL only for numeric columns and known amount columns (AMOUNT_COLUMNS)
+    whose every value is a well-formed amount, so codes like '001' stay TEXT
+  - one bulk executemany in a single transaction
+  - B-tree indexes on frontier, budget head, status and date columns
+  - an FTS5 full-text table over the work description and remarks
+  - built in a temporary file and atomically swapped into place
+
+Usage: python sqlite_export.py [input.csv] [output.db]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import pandas as pd
+
+from amount_parsing import AMOUNT_COLUMNS, to_amounts
+
+warnings.filterwarnings('ignore')
+
+TABLE_NAME = 'works'
+FTS_TABLE_NAME = 'works_fts'
+META_TABLE_NAME = 'meta'
+
+# Date columns in the dashboard schema and the ExcelProcessor schema
+DATE_COLUMNS = [
+    'ts_date', 'tender_date', 'acceptance_date', 'award_date',
+    'pdc_agreement', 'pdc_revised', 'completion_date_actual',
+    'date_ts', 'date_tender', 'date_acceptance', 'date_award',
+    'revised_pdc', 'actual_completion_date'
+]
+
+# Columns that get a B-tree index (whichever are present), plus every date column
+INDEX_COLUMNS = [
+    'ftr_hq_name', 'ftr_hq', 'budget_head', 'current_status', 'progress_status'
+]
+
+# Columns covered by the full-text index (whichever are present)
+FTS_COLUMNS = ['work_description', 'work_site', 'remarks']
+
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def to_iso_dates(series):
+    """
+    Convert a date column to 'YYYY-MM-DD' strings (None when missing)
+    Accepts datetimes, ISO strings and dd-mm-YYYY strings
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        dates = series
+    else:
+        values = series.where(series.notna(), None).astype(object)
+        dates = pd.to_datetime(values, format='%Y-%m-%d', errors='coerce')
+        dates = dates.fillna(pd.to_datetime(values, format='%d-%m-%Y', errors='coerce'))
+        dates = dates.fillna(pd.to_datetime(values, dayfirst=True, errors='coerce'))
+    return dates.dt.strftime('%Y-%m-%d').where(dates.notna(), None)
+
+
+def infer_column_types(df):
+    """
+    Map each column to its SQLite type: DATE (stored as TEXT), REAL or TEXT
+    """
+    types = {}
+    for col in df.columns:
+        series = df[col]
+        if col in DATE_COLUMNS or pd.api.types.is_datetime64_any_dtype(series):
+            types[col] = 'DATE'
+            continue
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            types[col] = 'REAL'
+            continue
+
+        types[col] = 'TEXT'
+        if col in AMOUNT_COLUMNS:
+            non_empty = series[series.notna() & (series.astype(str).str.strip() != '')]
+            if len(non_empty) > 0 and to_amounts(non_empty, loose=True).notna().all():
+                types[col] = 'REAL'
+    return types
+
+
+def prepare_columns(df, types):
+    """
+    Convert every column to a list of SQLite-ready Python values
+    """
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if types[col] == 'DATE':
+            values = to_iso_dates(series)
+        elif types[col] == 'REAL':
+            numbers = to_amounts(series, loose=True)
+            values = numbers.astype(object).where(numbers.notna(), None)
+        else:
+            values = series.astype(object).where(series.notna(), None)
+            values = values.map(lambda x: x if x is None else str(x))
+        columns.append(values.tolist())
+    return columns
+
+
+def build_sqlite(df, db_path, source=None):
+    """
+    Build the SQLite store for df in a temp file, then atomically replace db_path
+    Returns a dict with row count, indexes created, FTS availability and build time
+    """
+    start = time.perf_counter()
+    types = infer_column_types(df)
+    columns = [str(col) for col in df.columns]
+
+    db_dir = os.path.dirname(os.path.abspath(db_path))
+    os.makedirs(db_dir, exist_ok=True)
+    tmp_path = f"{db_path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # The temp file is discarded on failure, so durability is not needed here
+        conn.execute('PRAGMA journal_mode=OFF')
+        conn.execute('PRAGMA synchronous=OFF')
+
+        column_defs = ', '.join(
+            f"{quote_identifier(col)} {'TEXT' if types[col] == 'DATE' else types[col]}"
+            for col in columns
+        )
+        conn.execute(f"CREATE TABLE {TABLE_NAME} (row_id INTEGER PRIMARY KEY, {column_defs})")
+
+        placeholders = ', '.join(['?'] * (len(columns) + 1))
+        column_list = ', '.join(['row_id'] + [quote_identifier(col) for col in columns])
+        rows = zip(range(1, len(df) + 1), *prepare_columns(df, types))
+
+        with conn:
+            conn.executemany(
+                f"INSERT INTO {TABLE_NAME} ({column_list}) VALUES ({placeholders})", rows
+            )
+
+        # Indexes are created after the bulk load, which is much faster than
+        # maintaining them row by row
+        index_columns = [col for col in INDEX_COLUMNS if col in types]
+        index_columns += [col for col in columns if types[col] == 'DATE' and col not in index_columns]
+        with conn:
+            for col in index_columns:
+                conn.execute(
+                    f"CREATE INDEX {quote_identifier('idx_' + TABLE_NAME + '_' + col)} "
+                    f"ON {TABLE_NAME} ({quote_identifier(col)})"
+                )
+
+        fts_columns = [col for col in FTS_COLUMNS if col in types]
+        fts_enabled = False
+        if fts_columns:
+            try:
+                with conn:
+                    conn.execute(
+                        f"CREATE VIRTUAL TABLE {FTS_TABLE_NAME} USING fts5("
+                        f"{', '.join(quote_identifier(col) for col in fts_columns)}, "
+                        f"content='{TABLE_NAME}', content_rowid='row_id')"
+                    )
+                    conn.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES('rebuild')")
+                fts_enabled = True
+            except sqlite3.OperationalError as e:
+                print(f"  FTS5 unavailable, skipping full-text index: {e}")
+
+        with conn:
+            conn.execute(f"CREATE TABLE {META_TABLE_NAME} (key TEXT PRIMARY KEY, value TEXT)")
+            conn.executemany(f"INSERT INTO {META_TABLE_NAME} VALUES (?, ?)", [
+                ('source', source or ''),
+                ('built_at', datetime.now().isoformat(timespec='seconds')),
+                ('rows', str(len(df))),
+                ('fts_columns', ','.join(fts_columns) if fts_enabled else ''),
+            ])
+
+        conn.execute('ANALYZE')
+    except Exception:
+        conn.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    conn.close()
+
+    os.replace(tmp_path, db_path)
+
+    return {
+        'rows': len(df),
+        'indexes': index_columns,
+        'fts': fts_enabled,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def open_store(db_path):
+    """
+    Open the store read-only
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _where_clause(filters):
+    clauses = []
+    params = []
+    for col, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{quote_identifier(col)} IN ({', '.join(['?'] * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{quote_identifier(col)} = ?")
+            params.append(value)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def page_rows(conn, filters=None, limit=100, offset=0):
+    """
+    Return one page of rows (as dicts) matching equality filters, plus the total count
+    """
+    where, params = _where_clause(filters)
+    total = conn.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}{where}", params).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT * FROM {TABLE_NAME}{where} ORDER BY row_id LIMIT ? OFFSET ?",
+        params + [limit, offset]
+    ).fetchall()
+    return [dict(row) for row in rows], total
+
+
+def search_works(conn, text, limit=100):
+    """
+    Full-text search over the FTS columns, best matches first
+    """
+    rows = conn.execute(
+        f"SELECT {TABLE_NAME}.* FROM {FTS_TABLE_NAME} "
+        f"JOIN {TABLE_NAME} ON {TABLE_NAME}.row_id = {FTS_TABLE_NAME}.rowid "
+        f"WHERE {FTS_TABLE_NAME} MATCH ? ORDER BY rank LIMIT ?",
+        (text, limit)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def totals_by(conn, group_column, sum_columns, filters=None):
+    """
+    Row counts and sums of sum_columns grouped by group_column
+    """
+    where, params = _where_clause(filters)
+    sums = ', '.join(
+        f"ROUND(COALESCE(SUM({quote_identifier(col)}), 0), 2) AS {quote_identifier(col)}"
+        for col in sum_columns
+    )
+    group = quote_identifier(group_column)
+    rows = conn.execute(
+        f"SELECT {group} AS {group}, COUNT(*) AS \"rows\"{', ' + sums if sums else ''} "
+        f"FROM {TABLE_NAME}{where} GROUP BY {group} ORDER BY {group}",
+        params
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def main():
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'engineering.csv'
+    output_db = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(input_file)[0] + '.db'
+
+    if not os.path.exists(input_file):
+        print(f"❌ Error: Input file not found: {input_file}")
+        sys.exit(1)
+
+    df = pd.read_csv(input_file, dtype=str, keep_default_na=False)
+    result = build_sqlite(df, output_db, source=input_file)
+
+    print(f"Built {output_db}: {result['rows']:,} rows in {result['seconds']:.2f}s")
+    print(f"  Indexed columns: {', '.join(result['indexes'])}")
+    print(f"  Full-text search: {'enabled' if result['fts'] else 'unavailable'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,10 @@ import pandas as pd
 import csv
 import sys
 import os
-import chardet
 
-def detect_file_encoding(file_path):
-    """Detect the encoding of a file"""
-    with open(file_path, 'rb') as f:
-        result = chardet.detect(f.read())
-    return result['encoding']
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from reader_backends import detect_format, open_workbook
 
 def fix_engineering_csv(input_file='public/enggcurrentyear.csv', 
                         output_file='public/enggcurrentyear_fixed.csv'):
@@ -17,59 +14,35 @@ def fix_engineering_csv(input_file='public/enggcurrentyear.csv',
     """
     print(f"Processing: {input_file}")
     
-    # First check what we're dealing with
+    # First check what we're dealing with (from the file's first bytes)
     try:
-        # Detect encoding
-        encoding = detect_file_encoding(input_file)
-        print(f"Detected encoding: {encoding}")
+        file_format = detect_format(input_file)
+        print(f"Detected format: {file_format}")
         
-        with open(input_file, 'r', encoding=encoding or 'utf-8', errors='ignore') as f:
-            content = f.read()
-            
-            # Check if it's HTML
-            if '<!DOCTYPE' in content or '<html' in content.lower():
-                print("\nERROR: The file is HTML, not CSV!")
-                print("This appears to be a webpage saved as .csv")
-                print("\nTo fix this:")
-                print("1. Open the original data source")
-                print("2. Export/Download as actual CSV (not 'Save Page As')")
-                print("3. Make sure to select 'CSV' or 'Excel' format when downloading")
-                return False
+        # Check if it's HTML
+        if file_format == 'html':
+            print("\nERROR: The file is HTML, not CSV!")
+            print("This appears to be a webpage saved as .csv")
+            print("\nTo fix this:")
+            print("1. Open the original data source")
+            print("2. Export/Download as actual CSV (not 'Save Page As')")
+            print("3. Make sure to select 'CSV' or 'Excel' format when downloading")
+            return False
     except Exception as e:
         print(f"Error reading file: {e}")
     
-    # Try multiple methods to read the CSV
     df = None
     
-    # Method 1: Standard pandas read_csv with various options
-    for sep in [',', ';', '\t', '|']:
-        for enc in ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'utf-16']:
-            try:
-                df = pd.read_csv(input_file, 
-                               sep=sep, 
-                               encoding=enc,
-                               on_bad_lines='skip',
-                               engine='python')
-                
-                # Check if we got meaningful data
-                if len(df.columns) > 1 and len(df) > 0:
-                    print(f"Successfully read with separator='{sep}' and encoding='{enc}'")
-                    break
-            except:
-                continue
-        if df is not None and len(df.columns) > 1:
-            break
-    
-    # Method 2: If standard reading failed, try reading as Excel
-    if df is None or len(df.columns) <= 1:
-        try:
-            # Sometimes CSV files are actually Excel files with wrong extension
-            df = pd.read_excel(input_file, engine='openpyxl')
-            print("Read as Excel file")
-        except:
-            pass
+    # Method 1: Read with the backend for the detected format - text CSV with
+    # its separator and encoding sniffed, or an Excel file with a .csv name
+    try:
+        workbook, backend = open_workbook(input_file)
+        df = workbook.parse(workbook.sheet_names[0])
+        print(f"Successfully read with {backend.name}")
+    except Exception as e:
+        print(f"Reading failed: {e}")
     
-    # Method 3: Manual parsing if all else fails
+    # Method 2: Manual parsing if all else fails
     if df is None or len(df.columns) <= 1:
         try:
             with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Streaming Excel -> CSV / NDJSON Conversion
+Converts a workbook to the dashboard's fixed column layout (the perfect
+converter's EXPECTED_COLUMNS) without holding the workbook, a whole sheet's
+DataFrame or the consolidated result in memory:
+
+  - the output schema is known up front, so the CSV header is written before
+    any sheet is read and every row batch is appended as soon as it is cleaned
+  - .xlsx is read row by row (openpyxl read-only mode; only its shared-strings
+    table is loaded up front); .xls sheets are loaded one at a time from the
+    memory-mapped file and released once streamed (see sheet_grid)
+  - each batch of rows goes through the perfect converter's own per-sheet
+    cleaning (clean_sheet), then straight to the output file
+  - time to the first rows on disk and peak RSS are reported at the end
+
+Cells are read the way pandas.read_excel reads them (first row is the header,
+pandas' NA strings), but without whole-column type inference: whole numbers
+are always written without a trailing '.0' and text cells that look numeric
+('007') are kept as typed.
+
+Pipe mode: '-' as the input reads the workbook bytes from stdin into memory
+(xlrd file_contents / openpyxl BytesIO), '-' as the output writes the rows to
+stdout as they are produced; progress messages then go to stderr, so a server
+can pipe an upload through without temp files. CSV written to stdout has no
+UTF-8 BOM (files get one, as the other converters write), so it can be fed
+straight to another program or appended to.
+
+Usage: python streaming_convert.py <input.xls|xlsx|-> <output.csv|ndjson|-> [--format csv|ndjson] [--batch-rows N]
+"""
+
+import contextlib
+import io
+import json
+import math
+import os
+import resource
+import sys
+import time
+
+import pandas as pd
+
+from perfect_engineering_sheets_to_csv import EXPECTED_COLUMNS, clean_sheet, format_output_dates
+from sheet_grid import RawWorkbook, header_names
+
+DEFAULT_BATCH_ROWS = 500
+# Each sheet starts with a small batch so its first rows reach the output quickly
+FIRST_BATCH_ROWS = 50
+
+MIN_SHEET_COLUMNS = 5
+
+
+def read_input(input_path):
+    """
+    The workbook to read: its path, or its bytes when input_path is '-' (stdin)
+    """
+    if input_path == '-':
+        return sys.stdin.buffer.read()
+    return input_path
+
+
+def iter_sheet_rows(source):
+    """
+    Yield (sheet_name, row iterator) for every sheet of a workbook (path or
+    bytes); only the current sheet is loaded
+    """
+    with RawWorkbook(source) as workbook:
+        for _, sheet_name, rows in workbook.iter_sheets():
+            yield sheet_name, rows
+
+
+def iter_row_batches(rows, batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Split one sheet's rows into DataFrames of at most batch_rows rows (the
+    first one at most FIRST_BATCH_ROWS), using the first row as the header
+    (even when it is blank, as read_excel does); batches narrower than
+    MIN_SHEET_COLUMNS columns are skipped
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    header = header_names(first)
+
+    def frame(batch):
+        return pd.DataFrame([row + [None] * (len(header) - len(row)) for row in batch],
+                            columns=header, dtype=object)
+
+    batch = []
+    limit = min(FIRST_BATCH_ROWS, batch_rows)
+    for row in rows:
+        # Blank rows are dropped by clean_sheet anyway
+        if all(value is None for value in row):
+            continue
+        if len(row) > len(header):
+            # read_excel pads the header to the widest row; the extra columns
+            # are unnamed and never map onto the expected ones
+            header = header_names(first + [None] * (len(row) - len(first)))
+        batch.append(row)
+        if len(batch) >= limit:
+            if len(header) >= MIN_SHEET_COLUMNS:
+                yield frame(batch)
+            batch = []
+            limit = batch_rows
+    if batch and len(header) >= MIN_SHEET_COLUMNS:
+        yield frame(batch)
+
+
+def open_output(path, encoding):
+    """
+    Text stream for the output: the file, or stdout when path is '-'
+    """
+    if path == '-':
+        return io.TextIOWrapper(sys.stdout.buffer, encoding=encoding, newline='')
+    return open(path, 'w', encoding=encoding, newline='')
+
+
+def close_output(file):
+    if file.buffer is getattr(sys.stdout, 'buffer', None):
+        # Leave stdout itself open
+        file.flush()
+        file.detach()
+    else:
+        file.close()
+
+
+class CsvAppender:
+    """Appends cleaned batches to a CSV (header written up front)"""
+
+    def __init__(self, path, columns):
+        # BOM for Excel only in real files; a pipe consumer would read it as data
+        self.file = open_output(path, 'utf-8' if path == '-' else 'utf-8-sig')
+        self.columns = columns
+        pd.DataFrame(columns=columns).to_csv(self.file, index=False)
+        self.file.flush()
+
+    def write(self, df):
+        df.to_csv(self.file, header=False, index=False, columns=self.columns)
+        self.file.flush()
+
+    def close(self):
+        close_output(self.file)
+
+
+class NdjsonAppender:
+    """Appends cleaned batches to a newline-delimited JSON file"""
+
+    def __init__(self, path, columns):
+        self.file = open_output(path, 'utf-8')
+        self.columns = columns
+
+    def write(self, df):
+        for record in df[self.columns].itertuples(index=False, name=None):
+            self.file.write(json.dumps(
+                {col: (None if isinstance(value, float) and math.isnan(value) else value)
+                 for col, value in zip(self.columns, record)}, ensure_ascii=False))
+            self.file.write('\n')
+        self.file.flush()
+
+    def close(self):
+        close_output(self.file)
+
+
+WRITERS = {'csv': CsvAppender, 'ndjson': NdjsonAppender}
+
+
+def output_format_for(output_path):
+    extension = os.path.splitext(output_path)[1].lower()
+    return 'ndjson' if extension in ('.ndjson', '.jsonl') else 'csv'
+
+
+def log_stream(output_path):
+    """
+    Where progress messages go: stderr when the rows themselves go to stdout
+    """
+    return sys.stderr if output_path == '-' else sys.stdout
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def stream_convert(input_path, output_path, output_format=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """
+    Convert input_path to output_path batch by batch ('-' for stdin/stdout);
+    returns a stats dict (rows, sheets, seconds, first_rows_seconds, peak_rss_mb)
+    """
+    output_format = output_format or output_format_for(output_path)
+    columns = ['source_sheet'] + EXPECTED_COLUMNS
+    started = time.perf_counter()
+    stats = {'rows': 0, 'sheets': 0, 'first_rows_seconds': None}
+
+    source = read_input(input_path)
+    writer = WRITERS[output_format](output_path, columns)
+    try:
+        with contextlib.redirect_stdout(log_stream(output_path)):
+            stream_sheets(source, writer, batch_rows, stats, started)
+    finally:
+        writer.close()
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['peak_rss_mb'] = peak_rss_mb()
+    return stats
+
+
+def stream_sheets(source, writer, batch_rows, stats, started):
+    """
+    Clean every sheet of the workbook batch by batch into writer, updating stats
+    """
+    for sheet_name, rows in iter_sheet_rows(source):
+        print(f"Streaming sheet: {sheet_name}")
+        sheet_rows = 0
+        try:
+            for batch in iter_row_batches(rows, batch_rows):
+                cleaned = format_output_dates(clean_sheet(batch, sheet_name, EXPECTED_COLUMNS, verbose=False))
+                if len(cleaned) == 0:
+                    continue
+                writer.write(cleaned)
+                if stats['first_rows_seconds'] is None:
+                    stats['first_rows_seconds'] = time.perf_counter() - started
+                sheet_rows += len(cleaned)
+        except BrokenPipeError:
+            raise
+        except Exception as e:
+            # Batches already written stay in the output
+            print(f"  Error processing sheet {sheet_name}: {str(e)}")
+            continue
+        if sheet_rows:
+            stats['sheets'] += 1
+            stats['rows'] += sheet_rows
+            print(f"  Wrote {sheet_rows} rows")
+        else:
+            print(f"  Skipping {sheet_name} - insufficient data")
+
+
+def print_stats(stats, output_path):
+    log = log_stream(output_path)
+    target = 'stdout' if output_path == '-' else output_path
+    print(f"\n✅ Streamed {stats['rows']} rows from {stats['sheets']} sheet(s) to {target}", file=log)
+    if stats['first_rows_seconds'] is not None:
+        print(f"   • First rows written after {stats['first_rows_seconds']:.3f}s", file=log)
+    print(f"   • Total time: {stats['seconds']:.2f}s", file=log)
+    print(f"   • Peak RSS: {stats['peak_rss_mb']:.0f} MB", file=log)
+
+
+def exit_on_broken_pipe():
+    """
+    The reader of our stdout went away (e.g. `| head`): stop quietly
+    """
+    # Python would flush stdout again on exit and print a second error
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(1)
+
+
+def main():
+    args = sys.argv[1:]
+    batch_rows = DEFAULT_BATCH_ROWS
+    if '--batch-rows' in args:
+        batch_rows = int(args.pop(args.index('--batch-rows') + 1))
+        args.remove('--batch-rows')
+    output_format = None
+    if '--format' in args:
+        output_format = args.pop(args.index('--format') + 1)
+        args.remove('--format')
+
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    input_path, output_path = args[0], args[1]
+    if input_path != '-' and not os.path.exists(input_path):
+        print(f"❌ Error: Input file not found: {input_path}", file=sys.stderr)
+        sys.exit(1)
+    if output_format not in (None, *WRITERS):
+        print(f"❌ Error: Unsupported format: {output_format}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        stats = stream_convert(input_path, output_path, output_format, batch_rows)
+    except BrokenPipeError:
+        exit_on_broken_pipe()
+    print_stats(stats, output_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Streaming (Constant-Memory) Excel Writer
+Writes DataFrames to .xlsx row by row instead of building the whole workbook in memory
+Uses xlsxwriter in constant_memory mode, falling back to openpyxl write_only mode
+Numbers stay numeric cells; selected columns get a display format (e.g. #,##0.00)
+"""
+
+from datetime import date
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+NUMBER_FORMAT = '#,##0.00'
+
+# Rows converted to Python values at a time; only one chunk is held as objects
+ROW_CHUNK = 10000
+
+
+def coerce_date_columns(df, date_columns=None, date_format=None):
+    """
+    Convert the given columns to real datetimes (vectorized)
+    Accepts columns holding Timestamps, datetimes or formatted date strings
+    """
+    if not date_columns:
+        return df
+
+    typed = df.copy()
+    for col in date_columns:
+        if col in typed.columns:
+            typed[col] = pd.to_datetime(typed[col], format=date_format, errors='coerce')
+    return typed
+
+
+def iter_typed_rows(df, chunk_rows=ROW_CHUNK):
+    """
+    Yield rows as lists of plain Python values, converting chunk_rows rows at a time
+    Missing values (NaN, NaT, None) become None so they are written as blank cells
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        columns = []
+        for col in range(chunk.shape[1]):
+            series = chunk.iloc[:, col]
+            values = series.astype(object).where(series.notna(), None)
+            columns.append(values.tolist())
+
+        for row in zip(*columns):
+            yield list(row)
+
+
+def number_column_flags(df, columns):
+    """
+    Per column of df: True when its float cells get the number format
+    """
+    columns = set(columns or ())
+    return [col in columns for col in df.columns]
+
+
+def _write_sheets_xlsxwriter(path, sheets, date_format, number_columns, number_format):
+    workbook = xlsxwriter.Workbook(path, {
+        'constant_memory': True,
+        'default_date_format': date_format,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        'nan_inf_to_errors': True,
+    })
+    try:
+        number_cell = workbook.add_format({'num_format': number_format})
+        for sheet_name, df in sheets.items():
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, [str(col) for col in df.columns])
+            flags = number_column_flags(df, number_columns.get(sheet_name))
+            for row_idx, row in enumerate(iter_typed_rows(df), start=1):
+                if not any(flags):
+                    worksheet.write_row(row_idx, 0, row)
+                    continue
+                for col_idx, (value, numeric) in enumerate(zip(row, flags)):
+                    if numeric and isinstance(value, float):
+                        worksheet.write_number(row_idx, col_idx, value, number_cell)
+                    else:
+                        worksheet.write(row_idx, col_idx, value)
+    finally:
+        workbook.close()
+
+
+def _write_sheets_openpyxl(path, sheets, date_format, number_columns, number_format):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        worksheet.append([str(col) for col in df.columns])
+        flags = number_column_flags(df, number_columns.get(sheet_name))
+        for row in iter_typed_rows(df):
+            cells = []
+            for value, numeric in zip(row, flags):
+                if isinstance(value, date):
+                    cell = WriteOnlyCell(worksheet, value=value)
+                    cell.number_format = date_format
+                    cells.append(cell)
+                elif numeric and isinstance(value, float):
+                    cell = WriteOnlyCell(worksheet, value=value)
+                    cell.number_format = number_format
+                    cells.append(cell)
+                else:
+                    cells.append(value)
+            worksheet.append(cells)
+    workbook.save(path)
+
+
+def write_sheets_streaming(path, sheets, date_columns=None, date_format=None,
+                           excel_date_format='dd-mm-yyyy', number_columns=None, number_format=NUMBER_FORMAT):
+    """
+    Stream one or more DataFrames into an .xlsx file
+
+    sheets maps sheet name -> DataFrame (written in order, without the index)
+    date_columns are converted to real dates first; date_format is the strftime
+    format of any string dates in those columns (None lets pandas infer it)
+    excel_date_format is the display format applied to date cells in Excel
+    number_columns maps sheet name -> columns whose float cells are shown with
+    number_format (the cells stay numbers)
+    """
+    typed_sheets = {
+        name: coerce_date_columns(df, date_columns, date_format)
+        for name, df in sheets.items()
+    }
+
+    if xlsxwriter is not None:
+        _write_sheets_xlsxwriter(path, typed_sheets, excel_date_format, number_columns or {}, number_format)
+    else:
+        _write_sheets_openpyxl(path, typed_sheets, excel_date_format, number_columns or {}, number_format)
+
+    return path
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Watch-Folder Daemon
+Watches input directories for new or changed workbooks and reconverts only the
+workbook that changed, using the converter for its kind:
+
+  oops.xls / oops.xlsx               -> oops_excel_merge_to_csv   -> oops.csv
+  CURRENT YEAR EXPENDITURE*.xlsx     -> currentyearexpenditure    -> CURRENT_YEAR_EXPENDITURE.csv
+  any other .xls / .xlsx             -> excel_to_csv_converter    -> <name>_consolidated.*
+  (the converters' own workbook outputs are ignored: by name, e.g. engineering.xlsx,
+   and by provenance, i.e. any .xlsx whose first sheet is Consolidated_Data)
+
+  - inotify on Linux, polling elsewhere (or with --poll)
+  - a workbook is converted only after it has stopped changing for the debounce period
+  - converters are imported once and run in-process, so each run starts warm
+  - runs for the same output are serialized; changes arriving during a run
+    trigger exactly one follow-up run
+  - queue, run counts and latency stats are written to a status JSON file
+
+Usage: python watch_daemon.py [dir ...] [--poll] [--debounce SECONDS] [--status watch_status.json]
+"""
+
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+DEBOUNCE_SECONDS = 2.0
+POLL_SECONDS = 1.0
+MAX_WORKERS = 2
+STATUS_FILE = 'watch_status.json'
+LATENCY_SAMPLES = 200
+
+WORKBOOK_EXTENSIONS = ('.xls', '.xlsx')
+
+# Excel lock files, partial downloads and the converters' own workbook outputs
+# (engineering_mergesheets / convert_cli, perfect_engineering_sheets_to_csv);
+# matched case-insensitively on the file name
+IGNORED_PATTERNS = ['~$*', '.~lock.*', '*.tmp', '*.crdownload', '*.part', '*_consolidated.xls*',
+                    'engineering.xlsx', 'consolidated_data.xlsx', 'consolidated_progress_report.xlsx']
+
+# Every workbook the converters write starts with this sheet, so outputs saved
+# under any other name are recognized as well
+OUTPUT_SHEET = 'Consolidated_Data'
+FIRST_SHEET_PATTERN = re.compile(rb'<(?:\w+:)?sheet\b[^>]*?\bname="([^"]*)"')
+
+# First matching pattern (case-insensitive, on the file name) wins
+WATCH_RULES = [
+    ('oops.xls', 'oops'),
+    ('oops.xlsx', 'oops'),
+    ('current year expenditure*.xlsx', 'current_year'),
+    ('*.xls', 'engineering'),
+    ('*.xlsx', 'engineering'),
+]
+
+
+def run_engineering(path):
+    from excel_to_csv_converter import ExcelProcessor
+    root = os.path.splitext(path)[0]
+    processor = ExcelProcessor(path, f"{root}_consolidated.csv", f"{root}_consolidated.xlsx")
+    if not processor.process():
+        raise RuntimeError(f"Conversion failed for {path}")
+
+
+def run_oops(path):
+    from oops_excel_merge_to_csv import process_excel_to_csv
+    process_excel_to_csv(path, output_for('oops', path))
+
+
+def run_current_year(path):
+    from currentyearexpenditure import convert_current_year_expenditure
+    convert_current_year_expenditure(path, output_for('current_year', path))
+
+
+CONVERTERS = {
+    'engineering': run_engineering,
+    'oops': run_oops,
+    'current_year': run_current_year,
+}
+
+
+def output_for(converter, path):
+    """
+    Primary output file of a conversion; runs writing the same output are serialized
+    """
+    directory = os.path.dirname(path)
+    if converter == 'oops':
+        return os.path.join(directory, 'oops.csv')
+    if converter == 'current_year':
+        return os.path.join(directory, 'CURRENT_YEAR_EXPENDITURE.csv')
+    return f"{os.path.splitext(path)[0]}_consolidated.csv"
+
+
+def is_converter_output(path):
+    """
+    True if path is an .xlsx whose first sheet is OUTPUT_SHEET. Reads only
+    xl/workbook.xml; unreadable or partially written files count as inputs
+    """
+    if not path.lower().endswith('.xlsx'):
+        return False
+    try:
+        with zipfile.ZipFile(path) as workbook:
+            match = FIRST_SHEET_PATTERN.search(workbook.read('xl/workbook.xml'))
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+    return match is not None and match.group(1).decode('utf-8') == OUTPUT_SHEET
+
+
+def converter_for(path):
+    """
+    Converter name for a workbook, or None if the file is not watched
+    """
+    name = os.path.basename(path).lower()
+    if any(fnmatch.fnmatchcase(name, pattern.lower()) for pattern in IGNORED_PATTERNS):
+        return None
+    if not name.endswith(WORKBOOK_EXTENSIONS):
+        return None
+    if is_converter_output(path):
+        return None
+    for pattern, converter in WATCH_RULES:
+        if fnmatch.fnmatchcase(name, pattern):
+            return converter
+    return None
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class InotifyWatcher:
+    """Minimal inotify binding over ctypes (Linux only)"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0x00000800
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, directories):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError("inotify is not available on this platform")
+
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.watches = {}
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for directory in directories:
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self.watches[wd] = directory
+
+    def read_events(self, timeout):
+        """
+        Wait up to timeout seconds; returns the paths that changed
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths = []
+        offset = 0
+        while offset < len(buffer):
+            wd, _, _, length = self.EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self.EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if name and wd in self.watches:
+                paths.append(os.path.join(self.watches[wd], os.fsdecode(name)))
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher comparing directory listings and file signatures"""
+
+    def __init__(self, directories):
+        self.directories = directories
+        self.signatures = self.scan()
+
+    def scan(self):
+        signatures = {}
+        for directory in self.directories:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(directory, name)
+                if converter_for(path):
+                    signatures[path] = file_signature(path)
+        return signatures
+
+    def read_events(self, timeout):
+        time.sleep(timeout)
+        current = self.scan()
+        changed = [path for path, signature in current.items() if self.signatures.get(path) != signature]
+        self.signatures = current
+        return changed
+
+    def close(self):
+        pass
+
+
+class WatchDaemon:
+    """Debounces file events and runs conversions, one at a time per output"""
+
+    def __init__(self, directories, use_polling=False, debounce=DEBOUNCE_SECONDS,
+                 status_file=STATUS_FILE, max_workers=MAX_WORKERS):
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self.debounce = debounce
+        self.status_file = status_file
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.lock = threading.Lock()
+
+        self.pending = {}      # path -> (first event time, last event time, signature)
+        self.running = {}      # output -> path being converted
+        self.rerun = {}        # output -> (path, first event time, converter) waiting for the running job
+        self.stats = {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'runs': 0,
+            'failures': 0,
+            'coalesced': 0,
+            'by_converter': {},
+            'last_runs': [],
+        }
+        self.latencies = []
+
+        self.watcher = None
+        if not use_polling:
+            try:
+                self.watcher = InotifyWatcher(self.directories)
+                self.mode = 'inotify'
+            except OSError as e:
+                print(f"inotify unavailable ({e}), falling back to polling")
+        if self.watcher is None:
+            self.watcher = PollingWatcher(self.directories)
+            self.mode = 'polling'
+
+    def record_event(self, path):
+        if converter_for(path) is None:
+            return
+        now = time.monotonic()
+        with self.lock:
+            first = self.pending.get(path, (now,))[0]
+            self.pending[path] = (first, now, file_signature(path))
+
+    def ready_paths(self):
+        """
+        Paths that have had no events for the debounce period and whose size and
+        mtime did not change since the last event (i.e. the writer has finished)
+        """
+        now = time.monotonic()
+        ready = []
+        with self.lock:
+            for path, (first, last, signature) in list(self.pending.items()):
+                if now - last < self.debounce:
+                    continue
+                current = file_signature(path)
+                if current is None:
+                    # Deleted or renamed away before it settled
+                    del self.pending[path]
+                elif current != signature:
+                    self.pending[path] = (first, now, current)
+                else:
+                    del self.pending[path]
+                    ready.append((path, first))
+        return ready
+
+    def schedule(self, path, first_event):
+        # Checked again once the file has settled: a workbook still being written
+        # when its first event arrived cannot be recognized as an output until now
+        converter = converter_for(path)
+        if converter is None:
+            return
+        output = output_for(converter, path)
+        with self.lock:
+            if output in self.running:
+                # One follow-up run picks up every change made during this run
+                if output in self.rerun:
+                    self.stats['coalesced'] += 1
+                    first_event = min(first_event, self.rerun[output][1])
+                self.rerun[output] = (path, first_event, converter)
+                return
+            self.running[output] = path
+        self.executor.submit(self.convert, converter, path, output, first_event)
+
+    def convert(self, converter, path, output, first_event):
+        started = time.monotonic()
+        error = None
+        print(f"\n🔄 [{converter}] Converting {path}")
+        try:
+            CONVERTERS[converter](path)
+        except Exception as e:
+            error = str(e)
+            print(f"❌ [{converter}] {path}: {e}")
+        finished = time.monotonic()
+        if not error:
+            print(f"✅ [{converter}] {path} converted in {finished - started:.2f}s")
+
+        with self.lock:
+            self.stats['runs'] += 1
+            if error:
+                self.stats['failures'] += 1
+            by_converter = self.stats['by_converter'].setdefault(converter, {'runs': 0, 'seconds': 0.0})
+            by_converter['runs'] += 1
+            by_converter['seconds'] = round(by_converter['seconds'] + finished - started, 3)
+
+            self.latencies = (self.latencies + [finished - first_event])[-LATENCY_SAMPLES:]
+            self.stats['last_runs'] = (self.stats['last_runs'] + [{
+                'path': path,
+                'converter': converter,
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                'run_seconds': round(finished - started, 3),
+                'latency_seconds': round(finished - first_event, 3),
+                'error': error,
+            }])[-20:]
+
+            follow_up = self.rerun.pop(output, None)
+            if follow_up is None:
+                del self.running[output]
+            else:
+                self.running[output] = follow_up[0]
+
+        if follow_up is not None:
+            self.executor.submit(self.convert, follow_up[2], follow_up[0], output, follow_up[1])
+
+        self.write_status()
+
+    def status(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            status = {
+                'mode': self.mode,
+                'directories': self.directories,
+                'pending': sorted(self.pending),
+                'running': dict(self.running),
+                'queued': {output: path for output, (path, _, _) in self.rerun.items()},
+                **self.stats,
+            }
+        if latencies:
+            status['latency_seconds'] = {
+                'avg': round(sum(latencies) / len(latencies), 3),
+                'p50': round(latencies[len(latencies) // 2], 3),
+                'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                'max': round(latencies[-1], 3),
+            }
+        return status
+
+    def write_status(self):
+        if not self.status_file:
+            return
+        tmp_path = self.status_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.status(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.status_file)
+
+    def warm_up(self):
+        """
+        Import every converter (and pandas) once so the first run starts warm
+        """
+        started = time.perf_counter()
+        import excel_to_csv_converter, oops_excel_merge_to_csv, currentyearexpenditure  # noqa: F401
+        print(f"   Converters loaded in {time.perf_counter() - started:.2f}s")
+
+    def run(self):
+        self.warm_up()
+        print(f"👀 Watching ({self.mode}): {', '.join(self.directories)}")
+        print(f"   Debounce: {self.debounce}s   Status file: {self.status_file}")
+        self.write_status()
+        try:
+            while True:
+                for path in self.watcher.read_events(POLL_SECONDS):
+                    self.record_event(path)
+                for path, first_event in self.ready_paths():
+                    self.schedule(path, first_event)
+        finally:
+            self.watcher.close()
+            self.executor.shutdown(wait=True)
+            self.write_status()
+
+
+def main():
+    args = sys.argv[1:]
+    debounce = DEBOUNCE_SECONDS
+    status_file = STATUS_FILE
+    if '--debounce' in args:
+        debounce = float(args.pop(args.index('--debounce') + 1))
+        args.remove('--debounce')
+    if '--status' in args:
+        status_file = args.pop(args.index('--status') + 1)
+        args.remove('--status')
+    use_polling = '--poll' in args
+    directories = [arg for arg in args if not arg.startswith('--')] or ['.']
+
+    missing = [directory for directory in directories if not os.path.isdir(directory)]
+    if missing:
+        print(f"❌ Error: Directory not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    daemon = WatchDaemon(directories, use_polling=use_polling, debounce=debounce, status_file=status_file)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        print("\nWatch daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Shared Workbook Session
+Parses each sheet of a workbook once and lets any number of converters read
+it from that cache, instead of every converter opening and parsing the file
+again:
+
+  - a sheet is decoded the first time a converter asks for it and kept as a
+    raw grid (sheet_grid.SheetGrid); .xls sheets also stay loaded in xlrd, for
+    converters that read xlrd cells directly (ExcelProcessor)
+  - parse(sheet_name) returns what pd.ExcelFile.parse / read_excel would, as a
+    fresh DataFrame per call, so converters can modify it freely
+  - converters take an optional session= argument and open a session of
+    their own (without caching) when they aren't given one
+
+run_profiles runs several converter profiles against one session, e.g. the
+mapped and the simple-merge CSVs of the same workbook for a single parse.
+
+Usage: python workbook_session.py <file.xls|xlsx> [--profiles perfect,merge-columns,...] [--output-dir DIR]
+"""
+
+import os
+import sys
+import time
+
+from sheet_grid import RawWorkbook, SheetGrid
+
+
+class WorkbookSession:
+    """One workbook, each sheet parsed at most once (with cache=True)"""
+
+    def __init__(self, source, cache=True):
+        self.workbook = RawWorkbook(source)
+        self.sheet_names = self.workbook.sheet_names
+        self.cache = cache
+        self.grids = {}
+        self.parsed = set()
+        self.parses = 0
+
+    def sheet_index(self, sheet):
+        return sheet if isinstance(sheet, int) else self.sheet_names.index(sheet)
+
+    def xls_sheet(self, sheet):
+        """
+        The loaded xlrd sheet of an .xls workbook (parsed on first use)
+        """
+        sheet_idx = self.sheet_index(sheet)
+        self.count_parse(sheet_idx)
+        return self.workbook.xls.sheet(sheet_idx)
+
+    def grid(self, sheet):
+        """
+        The sheet (name or index) as a SheetGrid
+        """
+        sheet_idx = self.sheet_index(sheet)
+        if sheet_idx in self.grids:
+            return self.grids[sheet_idx]
+
+        if self.workbook.xls is not None:
+            self.xls_sheet(sheet_idx)
+        else:
+            self.count_parse(sheet_idx)
+        grid = SheetGrid(self.workbook.rows(sheet_idx))
+        if self.cache:
+            self.grids[sheet_idx] = grid
+        else:
+            self.unload(sheet_idx)
+        return grid
+
+    def parse(self, sheet_name=0, header=0):
+        """
+        The sheet as read_excel returns it with header= a row number or None
+        (except that header cells holding an Excel error or an NA string like
+        'N/A' are named 'Unnamed: i', where read_excel keeps NaN / the text)
+        """
+        grid = self.grid(sheet_name)
+        if header == 0:
+            return grid.frame(drop_blank_rows=False)
+        rows = [grid.first_row] + grid.rows
+        if header is None:
+            return SheetGrid([list(range(grid.width))] + rows).frame(drop_blank_rows=False)
+        return SheetGrid(rows[header:]).frame(drop_blank_rows=False)
+
+    def count_parse(self, sheet_idx):
+        # A sheet dropped from the cache counts again when it is re-read
+        if sheet_idx not in self.parsed or not self.cache:
+            self.parses += 1
+            self.parsed.add(sheet_idx)
+
+    def unload(self, sheet_idx):
+        """
+        Release an .xls sheet once it has been read; kept loaded when caching
+        """
+        if not self.cache and self.workbook.xls is not None:
+            self.workbook.xls.unload(sheet_idx)
+            self.parsed.discard(sheet_idx)
+
+    def xls_view(self):
+        """
+        The session's .xls workbook behind lazy_xls.LazyWorkbook's interface,
+        for code written against it; None for other formats
+        """
+        return SharedXls(self) if self.workbook.xls is not None else None
+
+    def close(self):
+        self.grids.clear()
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedXls:
+    """
+    A session's LazyWorkbook as a converter sees it: sheets come from (and
+    stay in) the session, and closing it leaves the session open
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.xls = session.workbook.xls
+
+    @property
+    def nsheets(self):
+        return self.xls.nsheets
+
+    @property
+    def datemode(self):
+        return self.xls.datemode
+
+    def sheet_names(self):
+        return self.xls.sheet_names()
+
+    def dimensions(self, sheet_idx):
+        return self.xls.dimensions(sheet_idx)
+
+    def too_small(self, sheet_idx, min_rows, min_cols):
+        return self.xls.too_small(sheet_idx, min_rows, min_cols)
+
+    def sheet(self, sheet_idx):
+        return self.session.xls_sheet(sheet_idx)
+
+    def unload(self, sheet_idx):
+        self.session.unload(sheet_idx)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_perfect(session, input_file, output_dir):
+    from perfect_engineering_sheets_to_csv import process_excel_file
+
+    return process_excel_file(input_file, os.path.join(output_dir, 'engineering_consolidated.csv'),
+                              session=session)
+
+
+def run_merge_columns(session, input_file, output_dir):
+    from new_columns_csv_convert import merge_excel_to_csv
+
+    return merge_excel_to_csv(input_file, os.path.join(output_dir, 'engineering_merged.csv'), session=session)
+
+
+def run_simple_merge(session, input_file, output_dir):
+    from new_columns_csv_convert import simple_merge
+
+    return simple_merge(input_file, os.path.join(output_dir, 'engineering_simple_merge.csv'), session=session)
+
+
+def run_mergesheets(session, input_file, output_dir):
+    from engineering_mergesheets import process_excel_file
+
+    return process_excel_file(input_file, os.path.join(output_dir, 'engineering.xlsx'), session=session)
+
+
+def run_oops(session, input_file, output_dir):
+    from oops_excel_merge_to_csv import process_excel_to_csv
+
+    return process_excel_to_csv(input_file, os.path.join(output_dir, 'oops.csv'), session=session)
+
+
+def run_engineering(session, input_file, output_dir):
+    from excel_to_csv_converter import ExcelProcessor
+
+    root = os.path.join(output_dir, os.path.splitext(os.path.basename(input_file))[0])
+    processor = ExcelProcessor(input_file, f"{root}_consolidated.csv", f"{root}_consolidated.xlsx",
+                               session=session)
+    return processor.consolidated_df if processor.process() else None
+
+
+# profile name (as in convert_cli) -> converter run against a session
+PROFILES = {
+    'perfect': run_perfect,
+    'merge-columns': run_merge_columns,
+    'simple-merge': run_simple_merge,
+    'mergesheets': run_mergesheets,
+    'oops': run_oops,
+    'engineering': run_engineering,
+}
+
+DEFAULT_PROFILES = ['merge-columns', 'simple-merge']
+
+
+def run_profiles(input_file, profiles=None, output_dir='.'):
+    """
+    Run each named converter profile on input_file from a single parse
+    Returns {profile: seconds, or None if it failed}
+    """
+    profiles = profiles or DEFAULT_PROFILES
+    unknown = [name for name in profiles if name not in PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown profile(s): {', '.join(unknown)} (choose from {', '.join(PROFILES)})")
+    os.makedirs(output_dir, exist_ok=True)
+
+    timings = {}
+    with WorkbookSession(input_file) as session:
+        for name in profiles:
+            print(f"\n{'=' * 70}\n▶ {name}\n{'=' * 70}")
+            start = time.perf_counter()
+            try:
+                result = PROFILES[name](session, input_file, output_dir)
+            except Exception as e:
+                print(f"❌ {name} failed: {e}")
+                result = None
+            timings[name] = time.perf_counter() - start if result is not None else None
+
+        print(f"\n📊 {len(profiles)} profile(s) from {session.parses} sheet parse(s) "
+              f"({len(session.sheet_names)} sheets)")
+    for name, elapsed in timings.items():
+        print(f"  • {name}: {'failed' if elapsed is None else f'{elapsed:.2f}s'}")
+    return timings
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    profiles = None
+    output_dir = '.'
+    if '--profiles' in args:
+        profiles = [name.strip() for name in args.pop(args.index('--profiles') + 1).split(',')]
+        args.remove('--profiles')
+    if '--output-dir' in args:
+        output_dir = args.pop(args.index('--output-dir') + 1)
+        args.remove('--output-dir')
+
+    path = args[0]
+    if not os.path.exists(path):
+        print(f"❌ Error: File not found: {path}")
+        sys.exit(1)
+
+    try:
+        timings = run_profiles(path, profiles, output_dir)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    sys.exit(1 if None in timings.values() else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Warm Conversion Worker Pool
+Long-lived service that keeps pre-forked worker processes with pandas, xlrd,
+openpyxl and the converters already imported, and accepts conversion jobs over
+a Unix socket, so a small workbook converts without paying interpreter startup.
+
+  - workers are forked after the imports and warmed up before the first job
+  - identical jobs submitted while one is running share the same result
+  - jobs are served by priority (lower first), then in arrival order
+  - at most --concurrency jobs run at once
+  - uploads (and the outputs converted next to them) are removed once they are
+    UPLOAD_MAX_AGE_SECONDS old and no job is using them
+
+Protocol: one JSON object per line in each direction.
+  request   {"converter": "engineering" | "oops" | "current_year" (optional, by file name),
+             "path": "/abs/workbook.xls"   or   "data": "<base64>", "filename": "x.xls" (required),
+             "priority": 0}
+  response  {"ok": true, "outputs": [...], "seconds": 0.41, "queued_seconds": 0.0,
+             "deduplicated": false, "log": "..."}
+
+Usage:
+  python worker_pool.py serve [--socket /tmp/bsf_converter.sock] [--workers N] [--concurrency N]
+  python worker_pool.py submit <workbook> [converter] [--priority N] [--socket path] [--upload]
+"""
+
+import asyncio
+import base64
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from watch_daemon import CONVERTERS, converter_for, output_for
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'bsf_converter.sock')
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+UPLOAD_DIR = os.path.join(tempfile.gettempdir(), 'bsf_converter_uploads')
+UPLOAD_MAX_AGE_SECONDS = 3600
+UPLOAD_SWEEP_SECONDS = 300
+MAX_LOG_CHARS = 4000
+
+
+def warm_imports():
+    """
+    Import everything a conversion needs; runs in the parent before forking
+    """
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import xlrd  # noqa: F401
+    import openpyxl  # noqa: F401
+    import excel_to_csv_converter, oops_excel_merge_to_csv, currentyearexpenditure  # noqa: F401
+
+
+def warm_worker():
+    """
+    No-op job used to start the workers before the first real job
+    """
+    return os.getpid()
+
+
+def list_outputs(converter, path):
+    primary = output_for(converter, path)
+    if converter == 'engineering':
+        root = os.path.splitext(primary)[0]
+        return sorted(p for p in glob.glob(glob.escape(root) + '.*')
+                      if not p.endswith(('.gz', '.br', '.tmp')))
+    return [primary] if os.path.exists(primary) else []
+
+
+def run_job(converter, path):
+    """
+    Run one conversion in a worker; returns (outputs, seconds, log)
+    """
+    started = time.perf_counter()
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        CONVERTERS[converter](path)
+    return list_outputs(converter, path), time.perf_counter() - started, log.getvalue()[-MAX_LOG_CHARS:]
+
+
+def job_identity(converter, path):
+    """
+    Jobs with the same converter, path and file content are identical
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return (converter, os.path.abspath(path), digest.hexdigest())
+
+
+def store_upload(data, filename):
+    """
+    Save uploaded bytes under a content-addressed directory so identical uploads dedupe
+    Raises ValueError for a missing file name or one that is only a path
+    """
+    name = os.path.basename(str(filename or '').replace('\\', '/'))
+    if name in ('', '.', '..'):
+        raise ValueError(f"Upload needs a file name, got {filename!r}")
+
+    content = base64.b64decode(data)
+    directory = os.path.join(UPLOAD_DIR, hashlib.sha256(content).hexdigest()[:16])
+    os.makedirs(directory, exist_ok=True)
+    # A repeated upload restarts the directory's age
+    os.utime(directory)
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    return path
+
+
+def sweep_uploads(max_age=UPLOAD_MAX_AGE_SECONDS, in_use=()):
+    """
+    Remove upload directories older than max_age seconds, except those in in_use
+    Returns the number removed
+    """
+    if not os.path.isdir(UPLOAD_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(UPLOAD_DIR):
+        if entry.is_dir(follow_symlinks=False) and entry.path not in in_use:
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    shutil.rmtree(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+class WorkerPool:
+    """Priority queue of conversion jobs in front of a warm process pool"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, concurrency=None):
+        self.workers = workers
+        self.concurrency = min(concurrency or workers, workers)
+        self.executor = None
+        self.queue = None
+        self.inflight = {}       # job identity -> asyncio.Future
+        self.counter = 0
+        self.uploads_in_use = Counter()  # upload directory -> requests using it
+        self.stats = {'jobs': 0, 'deduplicated': 0, 'failures': 0, 'running': 0}
+
+    async def start(self):
+        started = time.perf_counter()
+        warm_imports()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('fork')
+        )
+        # With fork, the first submit starts every worker from the warm parent
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(self.executor, warm_worker) for _ in range(self.workers)
+        ])
+        print(f"🔥 {self.workers} warm workers ready in {time.perf_counter() - started:.2f}s")
+
+        self.queue = asyncio.PriorityQueue()
+        self.dispatchers = [asyncio.create_task(self.dispatch()) for _ in range(self.concurrency)]
+        self.sweeper = asyncio.create_task(self.sweep())
+
+    async def sweep(self):
+        # Runs on the event loop, so no upload can be stored or claimed mid-sweep
+        while True:
+            sweep_uploads(in_use=set(self.uploads_in_use))
+            await asyncio.sleep(UPLOAD_SWEEP_SECONDS)
+
+    async def dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, converter, path, identity, future, queued_at = await self.queue.get()
+            self.stats['running'] += 1
+            try:
+                outputs, seconds, log = await loop.run_in_executor(self.executor, run_job, converter, path)
+                future.set_result({
+                    'ok': True, 'outputs': outputs, 'seconds': round(seconds, 3),
+                    'queued_seconds': round(time.monotonic() - queued_at - seconds, 3), 'log': log,
+                })
+            except Exception as e:
+                self.stats['failures'] += 1
+                future.set_result({'ok': False, 'error': str(e)})
+            finally:
+                self.stats['running'] -= 1
+                self.inflight.pop(identity, None)
+
+    async def submit(self, converter, path, priority=0):
+        # Hashing a large workbook would stall every connection on the loop
+        loop = asyncio.get_running_loop()
+        identity = await loop.run_in_executor(None, job_identity, converter, path)
+        self.stats['jobs'] += 1
+
+        future = self.inflight.get(identity)
+        deduplicated = future is not None
+        if deduplicated:
+            self.stats['deduplicated'] += 1
+        else:
+            future = loop.create_future()
+            self.inflight[identity] = future
+            self.counter += 1
+            await self.queue.put((priority, self.counter, converter, path, identity, future, time.monotonic()))
+
+        result = dict(await asyncio.shield(future))
+        result['deduplicated'] = deduplicated
+        return result
+
+    async def handle_request(self, request):
+        if request.get('stats'):
+            return {'ok': True, 'queued': self.queue.qsize(), 'workers': self.workers,
+                    'concurrency': self.concurrency, **self.stats}
+
+        if 'data' not in request:
+            return await self.convert(request, request.get('path', ''))
+
+        try:
+            path = store_upload(request['data'], request.get('filename'))
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+        directory = os.path.dirname(path)
+        self.uploads_in_use[directory] += 1
+        try:
+            return await self.convert(request, path)
+        finally:
+            self.uploads_in_use[directory] -= 1
+            if not self.uploads_in_use[directory]:
+                del self.uploads_in_use[directory]
+
+    async def convert(self, request, path):
+        if not os.path.isfile(path):
+            return {'ok': False, 'error': f"Input file not found: {path}"}
+
+        converter = request.get('converter') or converter_for(path)
+        if converter not in CONVERTERS:
+            return {'ok': False, 'error': f"Unknown converter: {converter}"}
+
+        return await self.submit(converter, os.path.abspath(path), int(request.get('priority', 0)))
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def serve(socket_path=DEFAULT_SOCKET, workers=DEFAULT_WORKERS, concurrency=None):
+    pool = WorkerPool(workers, concurrency)
+    await pool.start()
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = await asyncio.start_unix_server(pool.handle_connection, path=socket_path, limit=2 ** 28)
+    print(f"Worker pool listening on {socket_path} (workers: {pool.workers}, concurrency: {pool.concurrency})")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.shutdown()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def submit_job(path, converter=None, priority=0, socket_path=DEFAULT_SOCKET, upload=False):
+    """
+    Client helper: send one job and wait for its result
+    With upload=True the workbook bytes are sent instead of the path
+    """
+    request = {'converter': converter, 'priority': priority}
+    if upload:
+        with open(path, 'rb') as f:
+            request['data'] = base64.b64encode(f.read()).decode('ascii')
+        request['filename'] = os.path.basename(path)
+    else:
+        request['path'] = os.path.abspath(path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as f:
+            return json.loads(f.readline())
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(name, default):
+        if name in args:
+            value = args.pop(args.index(name) + 1)
+            args.remove(name)
+            return value
+        return default
+
+    socket_path = option('--socket', DEFAULT_SOCKET)
+    workers = int(option('--workers', DEFAULT_WORKERS))
+    concurrency = option('--concurrency', None)
+    priority = int(option('--priority', 0))
+    upload = '--upload' in args
+    args = [arg for arg in args if not arg.startswith('--')]
+
+    if not args or args[0] not in ('serve', 'submit'):
+        print(__doc__)
+        sys.exit(1)
+
+    if args[0] == 'serve':
+        try:
+            asyncio.run(serve(socket_path, workers, int(concurrency) if concurrency else None))
+        except KeyboardInterrupt:
+            print("\nWorker pool stopped")
+        return
+
+    if len(args) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    result = submit_job(args[1], args[2] if len(args) > 2 else None, priority, socket_path, upload)
+    elapsed = time.perf_counter() - started
+
+    if not result.get('ok'):
+        print(f"❌ Error: {result.get('error')}")
+        sys.exit(1)
+    print(f"✅ Converted in {result['seconds']:.2f}s (end to end {elapsed:.2f}s"
+          f"{', shared with an identical job' if result['deduplicated'] else ''})")
+    for output in result['outputs']:
+        print(f"   • {output}")
+
+
+if __name__ == "__main__":
+    main()